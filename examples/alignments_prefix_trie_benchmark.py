@@ -0,0 +1,37 @@
+import os
+import sys
+import time
+
+from pm4py.algo.conformance.alignments.versions import dijkstra_no_heuristics, dijkstra_prefix_trie
+from pm4py.algo.discovery.inductive import algorithm as inductive_miner
+from pm4py.objects.log.importer.xes import importer as xes_importer
+from pm4py.statistics.variants.log import get as variants_get
+
+
+def execute_script(path=None):
+    if path is None:
+        path = os.path.join("..", "tests", "input_data", "roadtraffic100traces.xes")
+    log = xes_importer.apply(path)
+    net, im, fm = inductive_miner.apply(log)
+    var_list = [(variant, len(traces)) for variant, traces in variants_get.get_variants(log).items()]
+    print("variants:", len(var_list))
+
+    aa = time.time()
+    separate = dijkstra_no_heuristics.apply_from_variants_list(var_list, net, im, fm)
+    bb = time.time()
+    # the states of the separate searches are summed
+    print("separate searches: visited states:", sum(al["visited_states"] for al in separate.values()),
+          "queued states:", sum(al["queued_states"] for al in separate.values()), "wall time (s):", bb - aa)
+
+    aa = time.time()
+    trie = dijkstra_prefix_trie.apply_from_variants_list(var_list, net, im, fm)
+    bb = time.time()
+    # the search is shared: the counters of the last alignment that is found are the overall ones
+    print("prefix trie search: visited states:", max(al["visited_states"] for al in trie.values()),
+          "queued states:", max(al["queued_states"] for al in trie.values()), "wall time (s):", bb - aa)
+
+    print("same costs:", all(separate[variant]["cost"] == trie[variant]["cost"] for variant in separate))
+
+
+if __name__ == "__main__":
+    execute_script(sys.argv[1] if len(sys.argv) > 1 else None)
@@ -0,0 +1,36 @@
+import os
+import sys
+import time
+
+from pm4py.algo.conformance.alignments import algorithm as align_alg
+from pm4py.algo.discovery.inductive import algorithm as inductive_miner
+from pm4py.objects.log.importer.xes import importer as xes_importer
+
+
+def measure(log, net, im, fm, variant):
+    """
+    Aligns the log with the given variant, returning the number of states visited by the searches,
+    the wall time (seconds) and the cost of the alignments
+    """
+    aa = time.time()
+    alignments = align_alg.apply(log, net, im, fm, variant=variant)
+    bb = time.time()
+    visited = sum(al["visited_states"] for al in alignments)
+    cost = sum(al["cost"] for al in alignments)
+    return visited, bb - aa, cost
+
+
+def execute_script(path=None):
+    if path is None:
+        path = os.path.join("..", "tests", "input_data", "roadtraffic100traces.xes")
+    log = xes_importer.apply(path)
+    net, im, fm = inductive_miner.apply(log)
+    for variant in [align_alg.Variants.VERSION_STATE_EQUATION_A_STAR, align_alg.Variants.VERSION_DIJKSTRA_NO_HEURISTICS,
+                    align_alg.Variants.VERSION_DIJKSTRA_LESS_MEMORY]:
+        visited, wall_time, cost = measure(log, net, im, fm, variant)
+        print(variant.name, "visited states:", visited, "wall time (s):", wall_time, "states per second:",
+              visited / wall_time, "cost:", cost)
+
+
+if __name__ == "__main__":
+    execute_script(sys.argv[1] if len(sys.argv) > 1 else None)
@@ -0,0 +1,40 @@
+import os
+import sys
+import time
+
+from pm4py.evaluation.earth_mover_distance import evaluator as earth_mover_distance
+from pm4py.evaluation.earth_mover_distance.versions import fast_pyemd
+from pm4py.objects.log.importer.xes import importer as xes_importer
+from pm4py.objects.log.log import EventLog
+from pm4py.statistics.variants.log import get as variants_get
+
+
+def execute_script(path=None):
+    if path is None:
+        path = os.path.join("..", "tests", "input_data", "reviewing.xes")
+    log = xes_importer.apply(path)
+    # compares the languages of the two halves of the log
+    lang1 = variants_get.get_language(EventLog(log[:len(log) // 2]))
+    lang2 = variants_get.get_language(EventLog(log[len(log) // 2:]))
+    print("variants:", len(lang1), len(lang2))
+
+    aa = time.time()
+    emd = earth_mover_distance.apply(lang1, lang2, variant=earth_mover_distance.Variants.PYEMD)
+    bb = time.time()
+    print("PYEMD emd distance:", emd, "wall time (s):", bb - aa)
+
+    aa = time.time()
+    emd = earth_mover_distance.apply(lang1, lang2, variant=earth_mover_distance.Variants.FAST_PYEMD)
+    bb = time.time()
+    print("FAST_PYEMD emd distance:", emd, "wall time (s):", bb - aa)
+
+    for top_k in [10, 50]:
+        aa = time.time()
+        emd, error_bound = fast_pyemd.apply_with_error_bound(lang1, lang2,
+                                                             parameters={fast_pyemd.Parameters.TOP_K: top_k})
+        bb = time.time()
+        print("FAST_PYEMD top", top_k, "emd distance:", emd, "error bound:", error_bound, "wall time (s):", bb - aa)
+
+
+if __name__ == "__main__":
+    execute_script(sys.argv[1] if len(sys.argv) > 1 else None)
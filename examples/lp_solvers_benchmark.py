@@ -0,0 +1,76 @@
+import os
+import time
+
+import numpy as np
+from scipy import sparse
+
+from pm4py.algo.discovery.inductive import algorithm as inductive_miner
+from pm4py.objects import petri
+from pm4py.objects.log.importer.xes import importer as xes_importer
+from pm4py.objects.petri import align_utils, synchronous_product
+from pm4py.objects.petri.utils import construct_trace_net
+from pm4py.util.lp import solver as lp_solver
+
+
+def get_problems(log, net, im, fm):
+    """
+    Gets, for each trace of the log, the LP problem that is solved to compute the heuristics
+    of the initial state of the alignment (on the synchronous product net)
+    """
+    problems = []
+    for trace in log:
+        trace_net, trace_im, trace_fm = construct_trace_net(trace)
+        sync_net, sync_im, sync_fm = synchronous_product.construct(trace_net, trace_im, trace_fm, net, im, fm,
+                                                                   align_utils.SKIP)
+        cost_function = align_utils.construct_standard_cost_function(sync_net, align_utils.SKIP)
+        incidence_matrix = petri.incidence_matrix.construct(sync_net)
+        ini_vec = incidence_matrix.encode_marking(sync_im)
+        fin_vec = incidence_matrix.encode_marking(sync_fm)
+        cost_vec = [0.0] * len(cost_function)
+        for t in cost_function.keys():
+            cost_vec[incidence_matrix.transitions[t]] = cost_function[t] * 1.0
+        a_matrix = np.asmatrix(incidence_matrix.a_matrix).astype(np.float64)
+        g_matrix = -np.eye(len(sync_net.transitions))
+        h_cvx = np.matrix(np.zeros(len(sync_net.transitions))).transpose()
+        b_term = np.matrix([(i - j) * 1.0 for i, j in zip(fin_vec, ini_vec)]).transpose()
+        problems.append((cost_vec, g_matrix, h_cvx, a_matrix, b_term))
+    return problems
+
+
+def measure(problems, variant):
+    """
+    Solves the problems with the given variant of the LP solver, returning the number of solves per second
+    and the objective values
+    """
+    values = []
+    aa = time.time()
+    for c, Aub, bub, Aeq, beq in problems:
+        sol = lp_solver.apply(c, Aub, bub, Aeq, beq, variant=variant)
+        values.append(lp_solver.get_prim_obj_from_sol(sol, variant=variant))
+    bb = time.time()
+    return len(problems) / (bb - aa), values
+
+
+def execute_script():
+    log = xes_importer.apply(os.path.join("..", "tests", "input_data", "roadtraffic100traces.xes"))
+    net, im, fm = inductive_miner.apply(log)
+    problems = get_problems(log, net, im, fm)
+    print("problems:", len(problems), "average number of variables:",
+          sum(len(problem[0]) for problem in problems) / len(problems))
+    reference_values = None
+    for variant in lp_solver.VERSIONS_APPLY:
+        solves_per_second, values = measure(problems, variant)
+        if reference_values is None:
+            reference_values = values
+        same_values = all(abs(x - y) < 10 ** -6 for x, y in zip(values, reference_values))
+        print(variant, "solves per second:", solves_per_second, "same objective values:", same_values)
+    if lp_solver.SCIPY_SOLVER in lp_solver.VERSIONS_APPLY:
+        # the problems are provided directly as sparse matrices
+        sparse_problems = [(c, sparse.csr_matrix(Aub), bub, sparse.csr_matrix(Aeq), beq)
+                           for c, Aub, bub, Aeq, beq in problems]
+        solves_per_second, values = measure(sparse_problems, lp_solver.SCIPY_SOLVER)
+        print(lp_solver.SCIPY_SOLVER, "(sparse input) solves per second:", solves_per_second)
+
+
+if __name__ == "__main__":
+    execute_script()
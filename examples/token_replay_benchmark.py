@@ -0,0 +1,36 @@
+import os
+import sys
+import time
+
+from pm4py.algo.conformance.tokenreplay import algorithm as token_replay
+from pm4py.algo.discovery.inductive import algorithm as inductive_miner
+from pm4py.objects.log.importer.xes import importer as xes_importer
+
+
+def measure(log, net, im, fm, variant):
+    """
+    Replays the log with the given variant of the token-based replay, returning the number of traces
+    replayed per second and the fitness of the traces
+    """
+    aa = time.time()
+    replayed_traces = token_replay.apply(log, net, im, fm, variant=variant)
+    bb = time.time()
+    return len(log) / (bb - aa), [x["trace_fitness"] for x in replayed_traces]
+
+
+def execute_script(path=None):
+    if path is None:
+        path = os.path.join("..", "tests", "input_data", "reviewing.xes")
+    log = xes_importer.apply(path)
+    net, im, fm = inductive_miner.apply(log)
+    print("traces:", len(log), "places:", len(net.places), "transitions:", len(net.transitions))
+    reference_fitness = None
+    for variant in [token_replay.Variants.TOKEN_REPLAY, token_replay.Variants.COMPILED_TOKEN_REPLAY]:
+        traces_per_second, fitness = measure(log, net, im, fm, variant)
+        if reference_fitness is None:
+            reference_fitness = fitness
+        print(variant.name, "traces per second:", traces_per_second, "same fitness:", fitness == reference_fitness)
+
+
+if __name__ == "__main__":
+    execute_script(sys.argv[1] if len(sys.argv) > 1 else None)
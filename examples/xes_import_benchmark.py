@@ -0,0 +1,41 @@
+import multiprocessing
+import os
+import resource
+import sys
+import time
+
+from pm4py.objects.log.importer.xes import importer as xes_importer
+
+
+def __import_and_measure(path, variant, queue):
+    aa = time.time()
+    log = xes_importer.apply(path, variant=variant)
+    bb = time.time()
+    # ru_maxrss is expressed in kilobytes on Linux
+    queue.put((len(log), bb - aa, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0))
+
+
+def measure(path, variant):
+    """
+    Imports the log in a fresh process, returning the number of traces,
+    the wall time (seconds) and the peak resident set size (MB) of the import
+    """
+    queue = multiprocessing.Queue()
+    process = multiprocessing.Process(target=__import_and_measure, args=(path, variant, queue))
+    process.start()
+    result = queue.get()
+    process.join()
+    return result
+
+
+def execute_script(path=None):
+    if path is None:
+        path = os.path.join("..", "tests", "input_data", "roadtraffic100traces.xes")
+    for variant in [xes_importer.Variants.ITERPARSE, xes_importer.Variants.ITERPARSE_SINGLE_PASS,
+                    xes_importer.Variants.ITERPARSE_PARALLEL]:
+        no_traces, wall_time, peak_rss = measure(path, variant)
+        print(variant.name, "traces:", no_traces, "wall time (s):", wall_time, "peak RSS (MB):", peak_rss)
+
+
+if __name__ == "__main__":
+    execute_script(sys.argv[1] if len(sys.argv) > 1 else None)
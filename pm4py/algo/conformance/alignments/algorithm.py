@@ -1,7 +1,10 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
 from copy import copy
 
 import pm4py
 from pm4py.algo.conformance.alignments import versions
+from pm4py.algo.conformance.alignments import cache as alignments_cache_module
 from pm4py.objects.petri import align_utils
 from pm4py.statistics.variants.log import get as variants_module
 from pm4py.objects.conversion.log import converter as log_converter
@@ -19,6 +22,7 @@ class Variants(Enum):
     VERSION_DIJKSTRA_NO_HEURISTICS = versions.dijkstra_no_heuristics
     VERSION_DIJKSTRA_LESS_MEMORY = versions.dijkstra_less_memory
     VERSION_STATE_EQUATION_LESS_MEMORY = versions.state_equation_less_memory
+    VERSION_DIJKSTRA_PREFIX_TRIE = versions.dijkstra_prefix_trie
 
 
 class Parameters(Enum):
@@ -34,6 +38,8 @@ class Parameters(Enum):
     PARAMETER_VARIANT_DELIMITER = "variant_delimiter"
     ACTIVITY_KEY = PARAMETER_CONSTANT_ACTIVITY_KEY
     VARIANTS_IDX = "variants_idx"
+    NUM_WORKERS = "num_workers"
+    ALIGNMENTS_CACHE = "alignments_cache"
 
 
 DEFAULT_VARIANT = Variants.VERSION_STATE_EQUATION_LESS_MEMORY
@@ -44,6 +50,11 @@ VERSION_DIJKSTRA_LESS_MEMORY = Variants.VERSION_DIJKSTRA_LESS_MEMORY
 VERSIONS = {Variants.VERSION_DIJKSTRA_NO_HEURISTICS, Variants.VERSION_DIJKSTRA_NO_HEURISTICS,
             Variants.VERSION_DIJKSTRA_LESS_MEMORY}
 
+# parameter of the variants working on the synchronous product with standard costs
+STD_SYNC_COST_PARAMETER = "std_sync_cost"
+# suffix of the key (in the alignments cache) of the cost of the best worst alignment of the model
+BEST_WORST_COST_SUFFIX = "#best_worst_cost"
+
 
 def apply(obj, petri_net, initial_marking, final_marking, parameters=None, variant=DEFAULT_VARIANT):
     if parameters is None:
@@ -110,7 +121,12 @@ def apply_log(log, petri_net, initial_marking, final_marking, parameters=None, v
     variant
         selected variant of the algorithm, possible values: {\'Variants.VERSION_STATE_EQUATION_A_STAR, Variants.VERSION_DIJKSTRA_NO_HEURISTICS \'}
     parameters
-        :class:`dict` parameters of the algorithm,
+        :class:`dict` parameters of the algorithm, including:
+            Parameters.NUM_WORKERS -> number of processes aligning the variants (default: 1, sequential)
+            Parameters.ALIGNMENTS_CACHE -> (optional) path of the SQLite database of the alignments cache
+            (or :class:`pm4py.algo.conformance.alignments.cache.AlignmentsCache` object). The alignments of the
+            variants that are in the cache (for the same model, costs and variant of the algorithm) are
+            not computed again; the alignments that are computed are stored in the cache
 
     Returns
     -----------
@@ -127,15 +143,70 @@ def apply_log(log, petri_net, initial_marking, final_marking, parameters=None, v
         raise Exception("trying to apply alignments on a Petri net that is not a relaxed sound net!!")
 
     start_time = time.time()
+
+    alignments_cache = exec_utils.get_param_value(Parameters.ALIGNMENTS_CACHE, parameters, None)
+    opened_cache = False
+    model_key, variant_key = None, None
+    if alignments_cache is not None:
+        alignments_cache, opened_cache = alignments_cache_module.get_cache(alignments_cache)
+        # the cache is not provided to the variants (and to the worker processes)
+        parameters = {k: v for k, v in parameters.items() if
+                      exec_utils.unroll(k) != Parameters.ALIGNMENTS_CACHE.value}
+        model_key = alignments_cache_module.get_model_fingerprint(petri_net, initial_marking, final_marking,
+                                                                  properties=__get_cache_properties(parameters))
+        variant_key = exec_utils.get_variant(variant).__name__
+        if model_key is None:
+            # the net cannot be identified (repeated names): the cache is not used
+            if opened_cache:
+                alignments_cache.close()
+            alignments_cache, opened_cache = None, False
+
+    try:
+        alignments = __apply_log(log, petri_net, initial_marking, final_marking, parameters, variant,
+                                 start_time, alignments_cache, model_key, variant_key)
+    finally:
+        if opened_cache:
+            alignments_cache.close()
+    return alignments
+
+
+def __get_cache_properties(parameters):
+    """
+    Gets the parameters that affect the results of the alignments (to be included in the fingerprint
+    of the model in the alignments cache)
+    """
+    properties = {}
+    for param in [Parameters.PARAM_TRACE_COST_FUNCTION, Parameters.PARAM_MODEL_COST_FUNCTION,
+                  Parameters.PARAM_SYNC_COST_FUNCTION, Parameters.PARAM_ALIGNMENT_RESULT_IS_SYNC_PROD_AWARE,
+                  Parameters.PARAM_TRACE_NET_COSTS, STD_SYNC_COST_PARAMETER]:
+        value = exec_utils.get_param_value(param, parameters, None)
+        if value is not None:
+            properties[exec_utils.unroll(param)] = value
+    return properties
+
+
+def __apply_log(log, petri_net, initial_marking, final_marking, parameters, variant, start_time, alignments_cache,
+                model_key, variant_key):
+    """
+    Applies the alignments to a log (looking up the alignments of the variants in the alignments cache,
+    if provided, and storing there the alignments that are computed)
+    """
     max_align_time = exec_utils.get_param_value(Parameters.PARAM_MAX_ALIGN_TIME, parameters,
                                                 sys.maxsize)
     max_align_time_case = exec_utils.get_param_value(Parameters.PARAM_MAX_ALIGN_TIME_TRACE, parameters,
                                                      sys.maxsize)
+    activity_key = exec_utils.get_param_value(Parameters.ACTIVITY_KEY, parameters, DEFAULT_NAME_KEY)
 
-    parameters_best_worst = copy(parameters)
-
-    best_worst_cost = exec_utils.get_variant(variant).get_best_worst_cost(petri_net, initial_marking, final_marking,
-                                                                          parameters=parameters_best_worst)
+    best_worst_cost = None
+    if alignments_cache is not None:
+        best_worst_cost = alignments_cache.get(model_key, variant_key + BEST_WORST_COST_SUFFIX, [()]).get(())
+    if best_worst_cost is None:
+        parameters_best_worst = copy(parameters)
+        best_worst_cost = exec_utils.get_variant(variant).get_best_worst_cost(petri_net, initial_marking,
+                                                                              final_marking,
+                                                                              parameters=parameters_best_worst)
+        if alignments_cache is not None:
+            alignments_cache.put(model_key, variant_key + BEST_WORST_COST_SUFFIX, {(): best_worst_cost})
 
     variants_idxs = exec_utils.get_param_value(Parameters.VARIANTS_IDX, parameters, None)
     if variants_idxs is None:
@@ -149,12 +220,46 @@ def apply_log(log, petri_net, initial_marking, final_marking, parameters=None, v
     for var in variants_list:
         one_tr_per_var.append(log[variants_idxs[var][0]])
 
-    all_alignments = []
-    for trace in one_tr_per_var:
-        this_max_align_time = min(max_align_time_case, (max_align_time - (time.time() - start_time)) * 0.5)
-        parameters[Parameters.PARAM_MAX_ALIGN_TIME_TRACE] = this_max_align_time
-        all_alignments.append(apply_trace(trace, petri_net, initial_marking, final_marking, parameters=copy(parameters),
-                                          variant=variant))
+    num_workers = exec_utils.get_param_value(Parameters.NUM_WORKERS, parameters, 1)
+    if num_workers is None:
+        num_workers = os.cpu_count()
+
+    all_alignments = [None] * len(one_tr_per_var)
+    to_align = list(range(len(one_tr_per_var)))
+    if alignments_cache is not None:
+        activities = [tuple(x[activity_key] for x in trace if activity_key in x) for trace in one_tr_per_var]
+        cached = alignments_cache.get(model_key, variant_key, activities)
+        to_align = []
+        for i in range(len(one_tr_per_var)):
+            if activities[i] in cached:
+                all_alignments[i] = cached[activities[i]]
+            else:
+                to_align.append(i)
+
+    traces = [one_tr_per_var[i] for i in to_align]
+    if exec_utils.get_variant(variant) is versions.dijkstra_prefix_trie:
+        # the variants are aligned together, in a single search on their prefix trie
+        parameters[Parameters.PARAM_MAX_ALIGN_TIME] = max_align_time - (time.time() - start_time)
+        new_alignments = versions.dijkstra_prefix_trie.apply_traces(traces, petri_net, initial_marking,
+                                                                    final_marking, parameters=copy(parameters))
+    elif num_workers > 1 and len(traces) > 1:
+        new_alignments = __apply_variants_parallel(traces, petri_net, initial_marking, final_marking,
+                                                   parameters, variant, num_workers, start_time)
+    else:
+        new_alignments = []
+        for trace in traces:
+            this_max_align_time = min(max_align_time_case, (max_align_time - (time.time() - start_time)) * 0.5)
+            parameters[Parameters.PARAM_MAX_ALIGN_TIME_TRACE] = this_max_align_time
+            new_alignments.append(apply_trace(trace, petri_net, initial_marking, final_marking,
+                                              parameters=copy(parameters), variant=variant))
+    for i, alignment in zip(to_align, new_alignments):
+        all_alignments[i] = alignment
+
+    if alignments_cache is not None:
+        # the alignments that are not computed (e.g. because of the time limits) are not stored
+        alignments_cache.put(model_key, variant_key,
+                             {activities[i]: alignment for i, alignment in zip(to_align, new_alignments) if
+                              alignment is not None})
 
     al_idx = {}
     for index_variant, variant in enumerate(variants_idxs):
@@ -177,3 +282,80 @@ def apply_log(log, petri_net, initial_marking, final_marking, parameters=None, v
             else:
                 align['fitness'] = 0
     return alignments
+
+
+# context of the worker processes of the parallel alignments (set by the initializer)
+__worker_context = {}
+
+
+def __apply_variants_parallel(traces, petri_net, initial_marking, final_marking, parameters, variant, num_workers,
+                              start_time):
+    """
+    Aligns the given traces (one per variant) in a pool of processes. The Petri net is sent once to each process
+    (by the initializer of the pool), and the traces are scheduled from the longest to the shortest one.
+    The time available for each trace is computed, as in the sequential alignments, from the global time budget
+    (starting from start_time)
+
+    Parameters
+    -------------
+    traces
+        Traces (one per variant)
+    petri_net
+        Petri net
+    initial_marking
+        Initial marking
+    final_marking
+        Final marking
+    parameters
+        Parameters of the algorithm
+    variant
+        Variant of the algorithm
+    num_workers
+        Number of processes
+    start_time
+        Starting time of the alignments
+
+    Returns
+    -------------
+    all_alignments
+        Alignments of the traces (in the same order)
+    """
+    if not isinstance(variant, Variants):
+        variant = Variants(variant)
+
+    order = sorted(range(len(traces)), key=lambda i: len(traces[i]), reverse=True)
+    all_alignments = [None] * len(traces)
+    # the Petri net and the parameters (whose cost functions refer to the transitions of the net) are sent
+    # together, so the workers align on the same objects (in the same order) as the sequential alignments
+    with ProcessPoolExecutor(max_workers=min(num_workers, len(traces)), initializer=__initialize_worker,
+                             initargs=(petri_net, initial_marking, final_marking, copy(parameters), variant,
+                                       start_time)) as executor:
+        futures = {i: executor.submit(__align_trace_worker, traces[i]) for i in order}
+        for i in order:
+            all_alignments[i] = futures[i].result()
+    return all_alignments
+
+
+def __initialize_worker(petri_net, initial_marking, final_marking, parameters, variant, start_time):
+    """
+    Initializes a worker process of the parallel alignments
+    """
+    __worker_context["petri_net"] = (petri_net, initial_marking, final_marking)
+    __worker_context["parameters"] = parameters
+    __worker_context["variant"] = variant
+    __worker_context["start_time"] = start_time
+
+
+def __align_trace_worker(trace):
+    """
+    Aligns a trace in a worker process of the parallel alignments
+    """
+    petri_net, initial_marking, final_marking = __worker_context["petri_net"]
+    parameters = copy(__worker_context["parameters"])
+    max_align_time = exec_utils.get_param_value(Parameters.PARAM_MAX_ALIGN_TIME, parameters, sys.maxsize)
+    max_align_time_case = exec_utils.get_param_value(Parameters.PARAM_MAX_ALIGN_TIME_TRACE, parameters,
+                                                     sys.maxsize)
+    parameters[Parameters.PARAM_MAX_ALIGN_TIME_TRACE] = min(max_align_time_case, (
+            max_align_time - (time.time() - __worker_context["start_time"])) * 0.5)
+    return apply_trace(trace, petri_net, initial_marking, final_marking, parameters=parameters,
+                       variant=__worker_context["variant"])
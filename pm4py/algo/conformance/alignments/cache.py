@@ -0,0 +1,243 @@
+import hashlib
+import json
+import sqlite3
+
+from pm4py.objects.petri.petrinet import PetriNet
+
+
+class AlignmentsCache(object):
+    """
+    Persistent cache of the results of the alignments (stored in a SQLite database).
+    Each result is stored under the fingerprint of the model (see get_model_fingerprint), the name of the
+    variant of the algorithm that computed it, and the tuple of activities of the (variant of the) trace.
+    The results are stored as JSON (see encode_result), so that reading the database never executes code
+    """
+
+    # maximum number of tuples of activities that are looked up by a single query
+    MAX_QUERY_SIZE = 500
+
+    def __init__(self, path):
+        """
+        Opens (or creates) the cache
+
+        Parameters
+        -------------
+        path
+            Path of the SQLite database
+        """
+        self.path = path
+        self.connection = sqlite3.connect(path)
+        self.connection.execute("CREATE TABLE IF NOT EXISTS results (model TEXT NOT NULL, variant TEXT NOT NULL, "
+                                "activities TEXT NOT NULL, result TEXT NOT NULL, "
+                                "PRIMARY KEY (model, variant, activities))")
+        self.connection.commit()
+
+    def get(self, model_key, variant_key, activities_list):
+        """
+        Gets the cached results for the given tuples of activities
+
+        Parameters
+        -------------
+        model_key
+            Fingerprint of the model
+        variant_key
+            Name of the variant of the algorithm
+        activities_list
+            List of tuples of activities
+
+        Returns
+        -------------
+        results
+            Dictionary associating to the tuples of activities that are in the cache the stored result
+        """
+        encoded = {self.__encode_activities(activities): activities for activities in activities_list}
+        keys = list(encoded)
+        results = {}
+        cursor = self.connection.cursor()
+        for i in range(0, len(keys), AlignmentsCache.MAX_QUERY_SIZE):
+            chunk = keys[i:i + AlignmentsCache.MAX_QUERY_SIZE]
+            query = "SELECT activities, result FROM results WHERE model = ? AND variant = ? AND activities IN (" \
+                    + ", ".join("?" * len(chunk)) + ")"
+            for activities, result in cursor.execute(query, [model_key, variant_key] + chunk):
+                results[encoded[activities]] = decode_result(json.loads(result))
+        return results
+
+    def put(self, model_key, variant_key, results):
+        """
+        Stores some results in the cache
+
+        Parameters
+        -------------
+        model_key
+            Fingerprint of the model
+        variant_key
+            Name of the variant of the algorithm
+        results
+            Dictionary associating to some tuples of activities the corresponding result
+        """
+        self.connection.executemany("INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?)",
+                                    [(model_key, variant_key, self.__encode_activities(activities),
+                                      json.dumps(encode_result(result)))
+                                     for activities, result in results.items()])
+        self.connection.commit()
+
+    @staticmethod
+    def __encode_activities(activities):
+        """
+        Encodes a tuple of activities as a key of the database
+        """
+        return repr(tuple(activities))
+
+    def close(self):
+        """
+        Closes the cache
+        """
+        self.connection.close()
+
+
+# tags of the JSON-encoded values that are not native JSON values
+_TAG = "t"
+_VALUE = "v"
+_DICT = "dict"
+_TUPLE = "tuple"
+
+
+def encode_result(value):
+    """
+    Encodes a result as a JSON value. Strings, numbers, booleans, None and lists are stored as they are;
+    dictionaries and tuples are stored as JSON objects tagged with their type (so that the keys of the dictionaries
+    are not restricted to strings, and the tuples are not turned into lists)
+
+    Parameters
+    -------------
+    value
+        Result (composed of dictionaries, lists, tuples, strings, numbers, booleans and None)
+
+    Returns
+    -------------
+    encoded_value
+        JSON-serializable value
+    """
+    if value is None or type(value) in (str, bool, int, float):
+        return value
+    if isinstance(value, dict):
+        return {_TAG: _DICT, _VALUE: [[encode_result(k), encode_result(v)] for k, v in value.items()]}
+    if isinstance(value, list):
+        return [encode_result(v) for v in value]
+    if isinstance(value, tuple):
+        return {_TAG: _TUPLE, _VALUE: [encode_result(v) for v in value]}
+    if hasattr(value, "item"):
+        # NumPy scalars
+        return encode_result(value.item())
+    raise TypeError("values of type " + type(value).__name__ + " cannot be stored in the alignments cache")
+
+
+def decode_result(value):
+    """
+    Decodes a result encoded by encode_result
+
+    Parameters
+    -------------
+    value
+        JSON value
+
+    Returns
+    -------------
+    decoded_value
+        Result
+    """
+    if isinstance(value, list):
+        return [decode_result(v) for v in value]
+    if not isinstance(value, dict):
+        return value
+    if value[_TAG] == _DICT:
+        return {decode_result(k): decode_result(v) for k, v in value[_VALUE]}
+    if value[_TAG] == _TUPLE:
+        return tuple(decode_result(v) for v in value[_VALUE])
+    raise Exception("unknown value in the alignments cache: " + str(value[_TAG]))
+
+
+def __element_key(element):
+    """
+    Gets a key (independent from the identity of the objects) of an element of the Petri net
+    """
+    if isinstance(element, PetriNet.Place):
+        return ("place", element.name)
+    if isinstance(element, PetriNet.Transition):
+        return ("transition", element.name, element.label)
+    return element
+
+
+def get_model_fingerprint(net, im, fm, properties=None):
+    """
+    Gets a canonical fingerprint (SHA-256) of an accepting Petri net, that is independent from the identity
+    of the objects. The places and the transitions are identified by their name, since the cached results
+    refer to them by name (e.g. the markings of the precision checking): the fingerprint describes the places,
+    the transitions (with their labels) and the arcs (with their direction and weight) through the names,
+    hence it identifies the structure of the net only when the names of the places, and the names of the transitions,
+    are unique. For nets with repeated names, None is returned (and the cache should not be used).
+    Nets whose names are generated differently at each run (e.g. depending on the iteration order of sets)
+    get different fingerprints at each run
+
+    Parameters
+    -------------
+    net
+        Petri net
+    im
+        Initial marking
+    fm
+        Final marking
+    properties
+        (Optional) dictionary of further properties that affect the results (e.g. the cost functions).
+        The places and the transitions contained in the properties are identified by their name (and label)
+
+    Returns
+    -------------
+    fingerprint
+        Fingerprint (hexadecimal string), or None if the names of the places or of the transitions are not unique
+    """
+    if properties is None:
+        properties = {}
+
+    place_names = sorted(p.name for p in net.places)
+    transition_names = sorted(t.name for t in net.transitions)
+    if len(set(place_names)) < len(place_names) or len(set(transition_names)) < len(transition_names):
+        return None
+
+    def canonical(obj):
+        if isinstance(obj, dict):
+            return sorted((repr(canonical(k)), repr(canonical(v))) for k, v in obj.items())
+        if isinstance(obj, (list, tuple)):
+            return [canonical(x) for x in obj]
+        if isinstance(obj, (set, frozenset)):
+            return sorted(repr(canonical(x)) for x in obj)
+        return __element_key(obj)
+
+    description = [place_names,
+                   sorted(repr((t.name, t.label)) for t in net.transitions),
+                   sorted(repr((isinstance(a.source, PetriNet.Place), a.source.name, a.target.name, a.weight))
+                          for a in net.arcs),
+                   canonical(im), canonical(fm), canonical(properties)]
+    return hashlib.sha256(repr(description).encode("utf-8")).hexdigest()
+
+
+def get_cache(cache):
+    """
+    Gets the cache from the value of a parameter, which is either the path of the SQLite database
+    or an AlignmentsCache object
+
+    Parameters
+    -------------
+    cache
+        Path of the database, or cache
+
+    Returns
+    -------------
+    cache
+        Cache object
+    opened
+        Boolean that is True if the cache has been opened here (and should be closed by the caller)
+    """
+    if isinstance(cache, AlignmentsCache):
+        return cache, False
+    return AlignmentsCache(cache), True
@@ -311,65 +311,99 @@ def apply(trace, net, im, fm, parameters=None):
                       ret_tuple_as_trans_desc=ret_tuple_as_trans_desc)
 
 
-def __dict_leq(d1, d2):
+def __vectorize_transitions(model_struct):
     """
-    Checks if the first dictionary is <= the second
+    Expresses the transitions of the model on markings that are tuples of token counts (indexed by place)
 
     Parameters
     --------------
-    d1
-        First dictionary
-    d2
-        Second dictionary
+    model_struct
+        Efficient model structure
+
+    Returns
+    --------------
+    no_places
+        Number of places
+    trans_pre
+        For each transition, its preset as tuple of (place, tokens)
+    trans_delta
+        For each transition, the changes of the token counts (place, difference) caused by its firing
+    place_consumers
+        For each place, the transitions having the place in their preset
+    trans_empty_preset
+        Transitions with an empty preset
+    """
+    trans_pre_dict = model_struct[TRANS_PRE_DICT]
+    trans_post_dict = model_struct[TRANS_POST_DICT]
+
+    no_places = len(model_struct[PLACES_DICT])
+    trans_pre = {t: tuple(trans_pre_dict[t].items()) for t in trans_pre_dict}
+    trans_delta = {}
+    place_consumers = [[] for i in range(no_places)]
+    trans_empty_preset = []
+    for t in trans_pre_dict:
+        delta = {k: -v for k, v in trans_pre_dict[t].items()}
+        for k, v in trans_post_dict[t].items():
+            delta[k] = delta[k] + v if k in delta else v
+        trans_delta[t] = tuple((k, v) for k, v in delta.items() if v != 0)
+        for k in trans_pre_dict[t]:
+            place_consumers[k].append(t)
+        if not trans_pre_dict[t]:
+            trans_empty_preset.append(t)
+
+    return no_places, trans_pre, trans_delta, place_consumers, trans_empty_preset
+
+
+def __get_enabled_transitions(m, trans_pre, place_consumers, trans_empty_preset):
+    """
+    Gets the transitions that are enabled in the given marking (sorted by their index)
+
+    Parameters
+    --------------
+    m
+        Marking (tuple of token counts)
+    trans_pre
+        For each transition, its preset as tuple of (place, tokens)
+    place_consumers
+        For each place, the transitions having the place in their preset
+    trans_empty_preset
+        Transitions with an empty preset
 
     Returns
     --------------
-    boolean
-        Boolean
+    en_t
+        Enabled transitions
     """
-    for k in d1:
-        if k not in d2:
-            return False
-        if d1[k] > d2[k]:
-            return False
-    return True
+    candidates = set(trans_empty_preset)
+    for k, n in enumerate(m):
+        if n > 0:
+            candidates.update(place_consumers[k])
+    return [t for t in sorted(candidates) if all(m[k] >= n for k, n in trans_pre[t])]
 
 
-def __fire_trans(m, preset, postset):
+def __fire_trans(m, delta):
     """
     Fires a transition and returns a new marking
 
     Parameters
     ---------------
     m
-        Marking
-    preset
-        Preset
-    postset
-        Postset
+        Marking (tuple of token counts)
+    delta
+        Changes of the token counts (place, difference) caused by the firing of the transition
 
     Returns
     ---------------
     new_m
         New marking
     """
-    ret = {}
-    for k in m:
-        if k in preset:
-            diff = m[k] - preset[k]
-            if diff > 0:
-                ret[k] = diff
-        else:
-            ret[k] = m[k]
-    for k in postset:
-        if k not in ret:
-            ret[k] = postset[k]
-        else:
-            ret[k] = ret[k] + postset[k]
-    return ret
+    new_m = list(m)
+    for k, diff in delta:
+        new_m[k] += diff
+    return tuple(new_m)
 
 
-def __encode_marking(marking_dict, m_d):
+def __encode_marking(marking_dict, m_d, no_places):
     """
     Encode a marking using the dictionary
 
@@ -379,45 +413,39 @@ def __encode_marking(marking_dict, m_d):
         Marking dictionary
     m_d
         Current marking (dict)
+    no_places
+        Number of places
 
     Returns
     --------------
     m_t
-        Marking in tuple
+        Marking in tuple (token count of each place)
     """
-    keys = sorted(list(m_d.keys()))
-    m_t = []
-    for el in keys:
-        for i in range(m_d[el]):
-            m_t.append(el)
-    m_t = tuple(m_t)
-    if m_t not in marking_dict:
-        marking_dict[m_t] = m_t
-    return marking_dict[m_t]
+    m_t = [0] * no_places
+    for el in m_d:
+        m_t[el] = m_d[el]
+    return __intern_marking(marking_dict, tuple(m_t))
 
 
-def __decode_marking(m_t):
+def __intern_marking(marking_dict, m_t):
     """
-    Decode a marking using a dictionary
+    Gets the (unique) instance of a marking
 
     Parameters
-    ---------------
+    --------------
+    marking_dict
+        Marking dictionary
     m_t
-        Marking as tuple
+        Marking in tuple
 
     Returns
-    ---------------
-    m_d
-        Marking as dictionary
+    --------------
+    m_t
+        Unique instance of the marking
     """
-    m_d = {}
-    for el in m_t:
-        if el not in m_d:
-            m_d[el] = 1
-        else:
-            m_d[el] = m_d[el] + 1
-
-    return m_d
+    if m_t not in marking_dict:
+        marking_dict[m_t] = m_t
+    return marking_dict[m_t]
 
 
 def __check_closed(closed, ns):
@@ -524,17 +552,17 @@ def __dijkstra(model_struct, trace_struct, sync_cost=align_utils.STD_SYNC_COST,
     """
     start_time = time.time()
 
-    trans_pre_dict = model_struct[TRANS_PRE_DICT]
-    trans_post_dict = model_struct[TRANS_POST_DICT]
     trans_labels_dict = model_struct[TRANS_LABELS_DICT]
     transf_model_cost_function = model_struct[TRANSF_MODEL_COST_FUNCTION]
 
     transf_trace = trace_struct[TRANSF_TRACE]
     trace_cost_function = trace_struct[TRACE_COST_FUNCTION]
 
+    no_places, trans_pre, trans_delta, place_consumers, trans_empty_preset = __vectorize_transitions(model_struct)
+
     marking_dict = {}
-    im = __encode_marking(marking_dict, model_struct[TRANSF_IM])
-    fm = __encode_marking(marking_dict, model_struct[TRANSF_FM])
+    im = __encode_marking(marking_dict, model_struct[TRANSF_IM], no_places)
+    fm = __encode_marking(marking_dict, model_struct[TRANSF_FM], no_places)
 
     # each state is characterized by:
     # position 0 (POSITION_TOTAL_COST): total cost of the state
@@ -561,7 +589,6 @@ def __dijkstra(model_struct, trace_struct, sync_cost=align_utils.STD_SYNC_COST,
             return None
         curr = heapq.heappop(open_set)
         curr_m0 = curr[POSITION_MARKING]
-        curr_m = __decode_marking(curr_m0)
         visited = visited + 1
         # if a situation equivalent to the one of the current state has been
         # visited previously, then discard this
@@ -576,7 +603,7 @@ def __dijkstra(model_struct, trace_struct, sync_cost=align_utils.STD_SYNC_COST,
                                                len(marking_dict),
                                                ret_tuple_as_trans_desc=ret_tuple_as_trans_desc)
         # retrieves the transitions that are enabled in the current marking
-        en_t = [t for t in trans_pre_dict if __dict_leq(trans_pre_dict[t], curr_m)]
+        en_t = __get_enabled_transitions(curr_m0, trans_pre, place_consumers, trans_empty_preset)
         this_closed = set()
         j = 0
         while j < len(en_t):
@@ -587,8 +614,7 @@ def __dijkstra(model_struct, trace_struct, sync_cost=align_utils.STD_SYNC_COST,
             if is_sync:
                 dummy_count = dummy_count + 1
                 # virtually fires the transition to get a new marking
-                new_m = __encode_marking(marking_dict,
-                                         __fire_trans(curr_m, trans_pre_dict[t], trans_post_dict[t]))
+                new_m = __intern_marking(marking_dict, __fire_trans(curr_m0, trans_delta[t]))
                 new_state = (
                     curr[POSITION_TOTAL_COST] + sync_cost, curr[POSITION_INDEX] - 1, IS_SYNC_MOVE, dummy_count,
                     curr,
@@ -608,8 +634,7 @@ def __dijkstra(model_struct, trace_struct, sync_cost=align_utils.STD_SYNC_COST,
             t = en_t[j]
             dummy_count = dummy_count + 1
             # virtually fires the transition to get a new marking
-            new_m = __encode_marking(marking_dict,
-                                     __fire_trans(curr_m, trans_pre_dict[t], trans_post_dict[t]))
+            new_m = __intern_marking(marking_dict, __fire_trans(curr_m0, trans_delta[t]))
             new_state = (
                 curr[POSITION_TOTAL_COST] + transf_model_cost_function[t], curr[POSITION_INDEX], IS_MODEL_MOVE,
                 dummy_count, curr, new_m, t)
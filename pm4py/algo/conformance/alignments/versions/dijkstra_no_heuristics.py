@@ -7,8 +7,7 @@ from pm4py.objects.petri.importer import pnml as petri_importer
 from pm4py.objects.log import log as log_implementation
 from pm4py.util.xes_constants import DEFAULT_NAME_KEY
 from pm4py.objects.petri.synchronous_product import construct_cost_aware
-from pm4py.objects.petri.utils import construct_trace_net_cost_aware, decorate_places_preset_trans, \
-    decorate_transitions_prepostset
+from pm4py.objects.petri.utils import construct_trace_net_cost_aware, decorate_transitions_prepostset
 from pm4py.objects.petri import align_utils as utils
 from pm4py.util import exec_utils
 from copy import copy
@@ -301,7 +300,12 @@ def __search(sync_net, ini, fin, cost_function, skip, ret_tuple_as_trans_desc=Fa
     start_time = time.time()
 
     decorate_transitions_prepostset(sync_net)
-    decorate_places_preset_trans(sync_net)
+
+    # the markings are represented as tuples of token counts, and the transitions by their index
+    vect_net = utils.VectorizedNet(sync_net)
+    ini = vect_net.encode(ini)
+    fin = vect_net.encode(fin)
+    trans_cost = [cost_function[t] for t in vect_net.transitions]
 
     closed = set()
 
@@ -312,8 +316,6 @@ def __search(sync_net, ini, fin, cost_function, skip, ret_tuple_as_trans_desc=Fa
     queued = 0
     traversed = 0
 
-    trans_empty_preset = set(t for t in sync_net.transitions if len(t.in_arcs) == 0)
-
     while not len(open_set) == 0:
         if (time.time() - start_time) > max_align_time_trace:
             return None
@@ -335,25 +337,16 @@ def __search(sync_net, ini, fin, cost_function, skip, ret_tuple_as_trans_desc=Fa
         closed.add(current_marking)
         visited += 1
 
-        possible_enabling_transitions = copy(trans_empty_preset)
-        for p in current_marking:
-            for t in p.ass_trans:
-                possible_enabling_transitions.add(t)
-
-        enabled_trans = [t for t in possible_enabling_transitions if t.sub_marking <= current_marking]
-
-        trans_to_visit_with_cost = [(t, cost_function[t]) for t in enabled_trans if not (
-                t is not None and utils.__is_log_move(t, skip) and utils.__is_model_move(t, skip))]
-
-        for t, cost in trans_to_visit_with_cost:
+        for j in vect_net.enabled_transitions(current_marking):
             traversed += 1
-            new_marking = utils.add_markings(current_marking, t.add_marking)
+            new_marking = vect_net.fire(current_marking, j)
 
             if new_marking in closed:
                 continue
 
             queued += 1
 
-            tp = utils.DijkstraSearchTuple(curr.g + cost, new_marking, curr, t, curr.l + 1)
+            tp = utils.DijkstraSearchTuple(curr.g + trans_cost[j], new_marking, curr, vect_net.transitions[j],
+                                           curr.l + 1)
 
             heapq.heappush(open_set, tp)
@@ -0,0 +1,440 @@
+import heapq
+import sys
+import time
+from copy import copy
+from enum import Enum
+
+from pm4py import util as pm4pyutil
+from pm4py.objects.log import log as log_implementation
+from pm4py.objects.petri import align_utils as utils
+from pm4py.objects.petri.importer import pnml as petri_importer
+from pm4py.objects.petri.utils import decorate_transitions_prepostset
+from pm4py.util import exec_utils
+from pm4py.util.constants import PARAMETER_CONSTANT_ACTIVITY_KEY
+from pm4py.util.xes_constants import DEFAULT_NAME_KEY
+
+
+class Parameters(Enum):
+    PARAM_TRACE_COST_FUNCTION = 'trace_cost_function'
+    PARAM_MODEL_COST_FUNCTION = 'model_cost_function'
+    PARAM_SYNC_COST_FUNCTION = 'sync_cost_function'
+    PARAM_ALIGNMENT_RESULT_IS_SYNC_PROD_AWARE = 'ret_tuple_as_trans_desc'
+    PARAM_MAX_ALIGN_TIME_TRACE = "max_align_time_trace"
+    PARAM_MAX_ALIGN_TIME = "max_align_time"
+    PARAMETER_VARIANT_DELIMITER = "variant_delimiter"
+    ACTIVITY_KEY = PARAMETER_CONSTANT_ACTIVITY_KEY
+
+
+def get_best_worst_cost(petri_net, initial_marking, final_marking, parameters=None):
+    """
+    Gets the best worst cost of an alignment
+
+    Parameters
+    -----------
+    petri_net
+        Petri net
+    initial_marking
+        Initial marking
+    final_marking
+        Final marking
+
+    Returns
+    -----------
+    best_worst_cost
+        Best worst cost of alignment
+    """
+    if parameters is None:
+        parameters = {}
+    trace = log_implementation.Trace()
+
+    best_worst = apply(trace, petri_net, initial_marking, final_marking, parameters=parameters)
+
+    if best_worst['cost'] > 0:
+        return best_worst['cost'] // utils.STD_MODEL_LOG_MOVE_COST
+    return 0
+
+
+def apply(trace, petri_net, initial_marking, final_marking, parameters=None):
+    """
+    Performs the alignment search (on the product of the model and of the trace), given a trace and a net.
+
+    Parameters
+    ----------
+    trace: :class:`list` input trace, assumed to be a list of events (i.e. the code will use the activity key
+    to get the attributes)
+    petri_net: :class:`pm4py.objects.petri.net.PetriNet` the Petri net to use in the alignment
+    initial_marking: :class:`pm4py.objects.petri.net.Marking` initial marking in the Petri net
+    final_marking: :class:`pm4py.objects.petri.net.Marking` final marking in the Petri net
+    parameters: :class:`dict` (optional) dictionary containing one of the following:
+        Parameters.PARAM_TRACE_COST_FUNCTION: :class:`list` (parameter) mapping of each index of the trace to a positive cost value
+        Parameters.PARAM_MODEL_COST_FUNCTION: :class:`dict` (parameter) mapping of each transition in the model to corresponding
+        model cost
+        Parameters.PARAM_SYNC_COST_FUNCTION: :class:`dict` (parameter) mapping of each transition in the model to corresponding
+        synchronous costs
+        Parameters.ACTIVITY_KEY: :class:`str` (parameter) key to use to identify the activity described by the events
+
+    Returns
+    -------
+    dictionary: `dict` with keys **alignment**, **cost**, **visited_states**, **queued_states** and **traversed_arcs**
+    """
+    if parameters is None:
+        parameters = {}
+
+    activity_key = exec_utils.get_param_value(Parameters.ACTIVITY_KEY, parameters, DEFAULT_NAME_KEY)
+    trace_cost_function = exec_utils.get_param_value(Parameters.PARAM_TRACE_COST_FUNCTION, parameters, None)
+    max_align_time_trace = exec_utils.get_param_value(Parameters.PARAM_MAX_ALIGN_TIME_TRACE, parameters,
+                                                      sys.maxsize)
+
+    return align_variants([tuple(x[activity_key] for x in trace)], petri_net, initial_marking, final_marking,
+                          max_align_time=max_align_time_trace, log_move_costs=trace_cost_function,
+                          parameters=parameters)[0]
+
+
+def apply_traces(traces, petri_net, initial_marking, final_marking, parameters=None):
+    """
+    Aligns a list of traces with a single search, in which the traces are organized in a prefix trie
+    (the time limit is Parameters.PARAM_MAX_ALIGN_TIME, for the overall search)
+
+    Parameters
+    -------------
+    traces
+        List of traces
+    petri_net
+        Petri net
+    initial_marking
+        Initial marking
+    final_marking
+        Final marking
+    parameters
+        Parameters of the algorithm (same as 'apply' method)
+
+    Returns
+    -------------
+    alignments
+        List of alignments (one for each trace; None if the alignment is not found in time)
+    """
+    if parameters is None:
+        parameters = {}
+
+    activity_key = exec_utils.get_param_value(Parameters.ACTIVITY_KEY, parameters, DEFAULT_NAME_KEY)
+    trace_cost_function = exec_utils.get_param_value(Parameters.PARAM_TRACE_COST_FUNCTION, parameters, None)
+    max_align_time = exec_utils.get_param_value(Parameters.PARAM_MAX_ALIGN_TIME, parameters, sys.maxsize)
+
+    return align_variants([tuple(x[activity_key] for x in trace) for trace in traces], petri_net, initial_marking,
+                          final_marking, max_align_time=max_align_time, log_move_costs=trace_cost_function,
+                          parameters=parameters)
+
+
+def apply_from_variant(variant, petri_net, initial_marking, final_marking, parameters=None):
+    """
+    Apply the alignments from the specification of a single variant
+
+    Parameters
+    -------------
+    variant
+        Variant (as string delimited by the "variant_delimiter" parameter)
+    petri_net
+        Petri net
+    initial_marking
+        Initial marking
+    final_marking
+        Final marking
+    parameters
+        Parameters of the algorithm (same as 'apply' method, plus 'variant_delimiter' that is , by default)
+
+    Returns
+    ------------
+    dictionary: `dict` with keys **alignment**, **cost**, **visited_states**, **queued_states** and **traversed_arcs**
+    """
+    if parameters is None:
+        parameters = {}
+    trace_cost_function = exec_utils.get_param_value(Parameters.PARAM_TRACE_COST_FUNCTION, parameters, None)
+    max_align_time_trace = exec_utils.get_param_value(Parameters.PARAM_MAX_ALIGN_TIME_TRACE, parameters,
+                                                      sys.maxsize)
+    return align_variants([__split_variant(variant, parameters)], petri_net, initial_marking, final_marking,
+                          max_align_time=max_align_time_trace, log_move_costs=trace_cost_function,
+                          parameters=parameters)[0]
+
+
+def apply_from_variants_dictionary(var_dictio, petri_net, initial_marking, final_marking, parameters=None):
+    if parameters is None:
+        parameters = {}
+    return apply_from_variants_list([(variant, var_dictio[variant]) for variant in var_dictio], petri_net,
+                                    initial_marking, final_marking, parameters=parameters)
+
+
+def apply_from_variants_list(var_list, petri_net, initial_marking, final_marking, parameters=None):
+    """
+    Apply the alignments from the specification of a list of variants in the log.
+    The variants are organized in a prefix trie and aligned with a single search, so the states reached
+    by a common prefix are explored once for all the variants sharing it
+    (the time limit is Parameters.PARAM_MAX_ALIGN_TIME, for the overall search)
+
+    Parameters
+    -------------
+    var_list
+        List of variants (for each item, the first entry is the variant itself, the second entry may be the number of cases)
+    petri_net
+        Petri net
+    initial_marking
+        Initial marking
+    final_marking
+        Final marking
+    parameters
+        Parameters of the algorithm (same as 'apply' method, plus 'variant_delimiter' that is , by default)
+
+    Returns
+    --------------
+    dictio_alignments
+        Dictionary that assigns to each variant its alignment
+    """
+    if parameters is None:
+        parameters = {}
+    trace_cost_function = exec_utils.get_param_value(Parameters.PARAM_TRACE_COST_FUNCTION, parameters, None)
+    max_align_time = exec_utils.get_param_value(Parameters.PARAM_MAX_ALIGN_TIME, parameters, sys.maxsize)
+    variants = [varitem[0] for varitem in var_list]
+    alignments = align_variants([__split_variant(variant, parameters) for variant in variants], petri_net,
+                                initial_marking, final_marking, max_align_time=max_align_time,
+                                log_move_costs=trace_cost_function, parameters=parameters)
+    return {variant: alignment for variant, alignment in zip(variants, alignments)}
+
+
+def apply_from_variants_list_petri_string(var_list, petri_net_string, parameters=None):
+    if parameters is None:
+        parameters = {}
+
+    petri_net, initial_marking, final_marking = petri_importer.import_petri_from_string(petri_net_string)
+
+    res = apply_from_variants_list(var_list, petri_net, initial_marking, final_marking, parameters=parameters)
+    return res
+
+
+def apply_from_variants_list_petri_string_mprocessing(mp_output, var_list, petri_net_string, parameters=None):
+    if parameters is None:
+        parameters = {}
+
+    res = apply_from_variants_list_petri_string(var_list, petri_net_string, parameters=parameters)
+    mp_output.put(res)
+
+
+def __split_variant(variant, parameters):
+    """
+    Gets the tuple of activities of a variant (expressed as string delimited by the "variant_delimiter" parameter)
+    """
+    variant_delimiter = exec_utils.get_param_value(Parameters.PARAMETER_VARIANT_DELIMITER, parameters,
+                                                   pm4pyutil.constants.DEFAULT_VARIANT_SEP)
+    return tuple(variant.split(variant_delimiter)) if type(variant) is str else tuple(variant)
+
+
+def align_variants(variants, petri_net, initial_marking, final_marking, max_align_time=sys.maxsize,
+                   log_move_costs=None, parameters=None):
+    """
+    Aligns a list of variants (tuples of activities) with a single Dijkstra search on the product of the model
+    and of the prefix trie of the variants. A state is a pair (node of the trie, marking of the model):
+    the log moves and the synchronous moves go from a node to one of its children, the model moves stay on the node.
+    The alignment of a variant is found when the state (last node of the variant, final marking) is popped
+    from the queue; the states on nodes whose variants are all aligned are not expanded anymore.
+    Since the nodes of a variant are only reached through its prefixes, the costs are the same as in the
+    separate alignment of each variant
+
+    Parameters
+    -------------
+    variants
+        List of tuples of activities
+    petri_net
+        Petri net
+    initial_marking
+        Initial marking
+    final_marking
+        Final marking
+    max_align_time
+        Time limit of the search
+    log_move_costs
+        (If provided) cost of the log move of each position of the variants (otherwise, the standard cost is used)
+    parameters
+        Parameters of the algorithm, including:
+            Parameters.PARAM_MODEL_COST_FUNCTION -> mapping of each transition in the model to the cost of
+            the model move
+            Parameters.PARAM_SYNC_COST_FUNCTION -> mapping of each (visible) transition in the model to the cost of
+            the synchronous move
+            Parameters.PARAM_ALIGNMENT_RESULT_IS_SYNC_PROD_AWARE -> returns the names of the transitions along
+            with the labels
+
+    Returns
+    -------------
+    alignments
+        List of alignments (one for each variant; None if the alignment is not found in time).
+        The visited/queued states and the traversed arcs are the ones of the shared search until
+        the alignment of the variant is found
+    """
+    if parameters is None:
+        parameters = {}
+
+    ret_tuple_as_trans_desc = exec_utils.get_param_value(Parameters.PARAM_ALIGNMENT_RESULT_IS_SYNC_PROD_AWARE,
+                                                         parameters, False)
+    model_cost_function = exec_utils.get_param_value(Parameters.PARAM_MODEL_COST_FUNCTION, parameters, None)
+    sync_cost_function = exec_utils.get_param_value(Parameters.PARAM_SYNC_COST_FUNCTION, parameters, None)
+
+    if model_cost_function is None or sync_cost_function is None:
+        # standard costs
+        model_cost_function = {t: utils.STD_MODEL_LOG_MOVE_COST if t.label is not None else utils.STD_TAU_COST
+                               for t in petri_net.transitions}
+        sync_cost_function = {t: utils.STD_SYNC_COST for t in petri_net.transitions if t.label is not None}
+
+    decorate_transitions_prepostset(petri_net)
+    vect_net = utils.VectorizedNet(petri_net)
+    model_costs = [model_cost_function[t] for t in vect_net.transitions]
+    sync_costs = [sync_cost_function[t] if t.label is not None else None for t in vect_net.transitions]
+
+    trie = __build_trie(variants, log_move_costs)
+
+    return __search(vect_net, vect_net.encode(initial_marking), vect_net.encode(final_marking), model_costs,
+                    sync_costs, trie, len(variants), max_align_time, ret_tuple_as_trans_desc)
+
+
+def __build_trie(variants, log_move_costs):
+    """
+    Builds the prefix trie of the variants. The nodes are identified by their index (0 is the root);
+    each node is described by its activity, its parent, its depth, its children (dictionary activity -> node)
+    and the cost of the log move reaching it. The variants ending in each node are recorded in ends
+    """
+    activities = [None]
+    parents = [None]
+    depths = [0]
+    children = [{}]
+    log_costs = [0]
+    ends = {}
+    for index, variant in enumerate(variants):
+        node = 0
+        for i, act in enumerate(variant):
+            child = children[node].get(act)
+            if child is None:
+                child = len(activities)
+                activities.append(act)
+                parents.append(node)
+                depths.append(i + 1)
+                children.append({})
+                log_costs.append(log_move_costs[i] if log_move_costs is not None else utils.STD_MODEL_LOG_MOVE_COST)
+                children[node][act] = child
+            node = child
+        ends.setdefault(node, []).append(index)
+    return activities, parents, depths, children, log_costs, ends
+
+
+def __reconstruct_alignment(entry, trie, vect_net, visited, queued, traversed, ret_tuple_as_trans_desc):
+    """
+    Reconstructs the alignment from the final entry of the search (following the parent entries)
+    """
+    activities, parents, depths, children, log_costs, ends = trie
+    cost = entry[0]
+    alignment = []
+    while entry[5] is not None:
+        move_node, j = entry[6]
+        if move_node is not None:
+            act = activities[move_node]
+            trace_name = "t_" + str(act) + "_" + str(depths[move_node] - 1)
+        else:
+            act, trace_name = utils.SKIP, utils.SKIP
+        if j is not None:
+            t = vect_net.transitions[j]
+            model_label, model_name = t.label, t.name
+        else:
+            model_label, model_name = utils.SKIP, utils.SKIP
+        if ret_tuple_as_trans_desc:
+            alignment.append(((trace_name, model_name), (act, model_label)))
+        else:
+            alignment.append((act, model_label))
+        entry = entry[5]
+    alignment.reverse()
+    return {'alignment': alignment, 'cost': cost, 'visited_states': visited, 'queued_states': queued,
+            'traversed_arcs': traversed}
+
+
+def __search(vect_net, ini, fin, model_costs, sync_costs, trie, no_variants, max_align_time,
+             ret_tuple_as_trans_desc):
+    start_time = time.time()
+
+    activities, parents, depths, children, log_costs, ends = trie
+    labels = [t.label for t in vect_net.transitions]
+
+    # number of variants (ending in the subtree of each node) that are still to be aligned
+    pending = [0] * len(activities)
+    for node, indexes in ends.items():
+        while node is not None:
+            pending[node] += len(indexes)
+            node = parents[node]
+
+    alignments = [None] * no_variants
+    closed = set()
+
+    # the entries of the queue are tuples (cost, -length, counter, node, marking, parent entry, move),
+    # where the move is the pair (node reached by the log/sync move, index of the model transition)
+    counter = 0
+    open_set = [(0, 0, counter, 0, ini, None, None)]
+    visited = 0
+    queued = 0
+    traversed = 0
+
+    while open_set and pending[0] > 0:
+        if (time.time() - start_time) > max_align_time:
+            break
+
+        curr = heapq.heappop(open_set)
+        g, neg_l, _, node, m, _, _ = curr
+
+        if pending[node] == 0:
+            continue
+        state = (node, m)
+        if state in closed:
+            continue
+
+        if m == fin and node in ends:
+            alignment = __reconstruct_alignment(curr, trie, vect_net, visited, queued, traversed,
+                                                ret_tuple_as_trans_desc)
+            for index in ends[node]:
+                alignments[index] = copy(alignment)
+            no_aligned = len(ends[node])
+            parent = node
+            while parent is not None:
+                pending[parent] -= no_aligned
+                parent = parents[parent]
+            if pending[node] == 0:
+                continue
+
+        closed.add(state)
+        visited += 1
+
+        node_children = children[node]
+        for child in node_children.values():
+            # log moves
+            if pending[child] == 0:
+                continue
+            traversed += 1
+            if (child, m) in closed:
+                continue
+            queued += 1
+            counter += 1
+            heapq.heappush(open_set, (g + log_costs[child], neg_l - 1, counter, child, m, curr, (child, None)))
+
+        for j in vect_net.enabled_transitions(m):
+            new_marking = vect_net.fire(m, j)
+
+            # model move
+            traversed += 1
+            if (node, new_marking) not in closed:
+                queued += 1
+                counter += 1
+                heapq.heappush(open_set, (g + model_costs[j], neg_l - 1, counter, node, new_marking, curr,
+                                          (None, j)))
+
+            # synchronous move
+            child = node_children.get(labels[j]) if sync_costs[j] is not None else None
+            if child is not None and pending[child] > 0:
+                traversed += 1
+                if (child, new_marking) not in closed:
+                    queued += 1
+                    counter += 1
+                    heapq.heappush(open_set, (g + sync_costs[j], neg_l - 1, counter, child, new_marking, curr,
+                                              (child, j)))
+
+    return alignments
@@ -16,16 +16,12 @@ import heapq
 from copy import copy
 import time
 
-import numpy as np
-
 from pm4py import util as pm4pyutil
 from pm4py.objects import petri
 from pm4py.objects.petri.importer import pnml as petri_importer
 from pm4py.objects.log import log as log_implementation
 from pm4py.util.xes_constants import DEFAULT_NAME_KEY
-from pm4py.objects.petri.synchronous_product import construct_cost_aware
-from pm4py.objects.petri.utils import construct_trace_net_cost_aware, decorate_places_preset_trans, \
-    decorate_transitions_prepostset
+from pm4py.objects.petri.utils import construct_trace_net_cost_aware, decorate_transitions_prepostset
 from pm4py.util.lp import solver as lp_solver
 from pm4py.objects.petri import align_utils as utils
 from pm4py.util import exec_utils
@@ -346,27 +342,25 @@ def apply_trace_net(petri_net, initial_marking, final_marking, trace_net, trace_
                                                                                                   final_marking,
                                                                                                   utils.SKIP)
         cost_function = utils.construct_standard_cost_function(sync_prod, utils.SKIP)
+        incidence_matrix = None
     else:
-        revised_sync = dict()
-        for t_trace in trace_net.transitions:
-            for t_model in petri_net.transitions:
-                if t_trace.label == t_model.label:
-                    revised_sync[(t_trace, t_model)] = sync_cost_function[t_model]
-
-        sync_prod, sync_initial_marking, sync_final_marking, cost_function = construct_cost_aware(
-            trace_net, trace_im, trace_fm, petri_net, initial_marking, final_marking, utils.SKIP,
-            trace_net_costs, model_cost_function, revised_sync)
+        # the model half of the synchronous product net (along with its incidence matrix) is computed
+        # once for the Petri net, and only the trace part is added here
+        skeleton = petri.synchronous_product.get_skeleton(petri_net, initial_marking, final_marking, utils.SKIP,
+                                                          model_cost_function, sync_cost_function)
+        sync_prod, sync_initial_marking, sync_final_marking, cost_function, incidence_matrix = skeleton.construct(
+            trace_net, trace_im, trace_fm, trace_net_costs)
 
     max_align_time_trace = exec_utils.get_param_value(Parameters.PARAM_MAX_ALIGN_TIME_TRACE, parameters,
                                                       sys.maxsize)
 
     return apply_sync_prod(sync_prod, sync_initial_marking, sync_final_marking, cost_function,
                            utils.SKIP, ret_tuple_as_trans_desc=ret_tuple_as_trans_desc,
-                           max_align_time_trace=max_align_time_trace)
+                           max_align_time_trace=max_align_time_trace, incidence_matrix=incidence_matrix)
 
 
 def apply_sync_prod(sync_prod, initial_marking, final_marking, cost_function, skip, ret_tuple_as_trans_desc=False,
-                    max_align_time_trace=sys.maxsize):
+                    max_align_time_trace=sys.maxsize, incidence_matrix=None):
     """
     Performs the basic alignment search on top of the synchronous product net, given a cost function and skip-symbol
 
@@ -377,6 +371,8 @@ def apply_sync_prod(sync_prod, initial_marking, final_marking, cost_function, sk
     final_marking: :class:`pm4py.objects.petri.net.Marking` final marking in the synchronous product net
     cost_function: :class:`dict` cost function mapping transitions to the synchronous product net
     skip: :class:`Any` symbol to use for skips in the alignment
+    incidence_matrix: (optional) incidence matrix of the synchronous product net, when it is already decorated
+    (e.g., built from a skeleton); if None, it is computed here
 
     Returns
     -------
@@ -384,43 +380,42 @@ def apply_sync_prod(sync_prod, initial_marking, final_marking, cost_function, sk
     and **traversed_arcs**
     """
     return __search(sync_prod, initial_marking, final_marking, cost_function, skip,
-                    ret_tuple_as_trans_desc=ret_tuple_as_trans_desc, max_align_time_trace=max_align_time_trace)
+                    ret_tuple_as_trans_desc=ret_tuple_as_trans_desc, max_align_time_trace=max_align_time_trace,
+                    incidence_matrix=incidence_matrix)
 
 
 def __search(sync_net, ini, fin, cost_function, skip, ret_tuple_as_trans_desc=False,
-             max_align_time_trace=sys.maxsize):
+             max_align_time_trace=sys.maxsize, incidence_matrix=None):
     start_time = time.time()
 
-    decorate_transitions_prepostset(sync_net)
-    decorate_places_preset_trans(sync_net)
+    if incidence_matrix is None:
+        decorate_transitions_prepostset(sync_net)
+
+        incidence_matrix = petri.incidence_matrix.construct(sync_net)
+    # otherwise, the synchronous product net comes from a skeleton, and is already decorated
 
-    incidence_matrix = petri.incidence_matrix.construct(sync_net)
     ini_vec, fin_vec, cost_vec = utils.__vectorize_initial_final_cost(incidence_matrix, ini, fin, cost_function)
 
-    closed = set()
+    # the markings are represented as tuples of token counts (indexed as the places of the incidence matrix),
+    # and the transitions by their index in the incidence matrix
+    vect_net = utils.VectorizedNet(sync_net, incidence_matrix.places, incidence_matrix.transitions)
+    ini = tuple(ini_vec)
+    fin = tuple(fin_vec)
+    trans_cost = [cost_function[t] for t in vect_net.transitions]
 
-    a_matrix = np.asmatrix(incidence_matrix.a_matrix).astype(np.float64)
-    g_matrix = -np.eye(len(sync_net.transitions))
-    h_cvx = np.matrix(np.zeros(len(sync_net.transitions))).transpose()
-    cost_vec = [x * 1.0 for x in cost_vec]
+    closed = set()
 
     use_cvxopt = False
     if lp_solver.DEFAULT_LP_SOLVER_VARIANT == lp_solver.CVXOPT_SOLVER_CUSTOM_ALIGN or lp_solver.DEFAULT_LP_SOLVER_VARIANT == lp_solver.CVXOPT_SOLVER_CUSTOM_ALIGN_ILP:
         use_cvxopt = True
 
-    if use_cvxopt:
-        # not available in the latest version of PM4Py
-        from cvxopt import matrix
-
-        a_matrix = matrix(a_matrix)
-        g_matrix = matrix(g_matrix)
-        h_cvx = matrix(h_cvx)
-        cost_vec = matrix(cost_vec)
+    # the state equation is built once for the synchronous product net: only the right-hand side
+    # changes between the markings, and the solutions are cached by marking
+    state_equation = utils.StateEquationHeuristic(sync_net, incidence_matrix, cost_vec, fin_vec,
+                                                  lp_solver.DEFAULT_LP_SOLVER_VARIANT, use_cvxopt=use_cvxopt)
+    cost_vec = [x * 1.0 for x in cost_vec]
 
-    h, x = utils.__compute_exact_heuristic_new_version(sync_net, a_matrix, h_cvx, g_matrix, cost_vec, incidence_matrix,
-                                                       ini,
-                                                       fin_vec, lp_solver.DEFAULT_LP_SOLVER_VARIANT,
-                                                       use_cvxopt=use_cvxopt)
+    h, x = state_equation.compute(ini)
     ini_state = utils.SearchTuple(0 + h, 0, h, ini, None, None, x, True)
     open_set = [ini_state]
     heapq.heapify(open_set)
@@ -428,8 +423,6 @@ def __search(sync_net, ini, fin, cost_function, skip, ret_tuple_as_trans_desc=Fa
     queued = 0
     traversed = 0
 
-    trans_empty_preset = set(t for t in sync_net.transitions if len(t.in_arcs) == 0)
-
     while not len(open_set) == 0:
         if (time.time() - start_time) > max_align_time_trace:
             return None
@@ -445,10 +438,7 @@ def __search(sync_net, ini, fin, cost_function, skip, ret_tuple_as_trans_desc=Fa
             continue
 
         while not curr.trust:
-            h, x = utils.__compute_exact_heuristic_new_version(sync_net, a_matrix, h_cvx, g_matrix, cost_vec,
-                                                               incidence_matrix, curr.m,
-                                                               fin_vec, lp_solver.DEFAULT_LP_SOLVER_VARIANT,
-                                                               use_cvxopt=use_cvxopt)
+            h, x = state_equation.compute(curr.m)
 
             # 11/10/19: shall not a state for which we compute the exact heuristics be
             # by nature a trusted solution?
@@ -477,23 +467,14 @@ def __search(sync_net, ini, fin, cost_function, skip, ret_tuple_as_trans_desc=Fa
         closed.add(current_marking)
         visited += 1
 
-        possible_enabling_transitions = copy(trans_empty_preset)
-        for p in current_marking:
-            for t in p.ass_trans:
-                possible_enabling_transitions.add(t)
-
-        enabled_trans = [t for t in possible_enabling_transitions if t.sub_marking <= current_marking]
-
-        trans_to_visit_with_cost = [(t, cost_function[t]) for t in enabled_trans if not (
-                t is not None and utils.__is_log_move(t, skip) and utils.__is_model_move(t, skip))]
-
-        for t, cost in trans_to_visit_with_cost:
+        for j in vect_net.enabled_transitions(current_marking):
             traversed += 1
-            new_marking = utils.add_markings(current_marking, t.add_marking)
+            new_marking = vect_net.fire(current_marking, j)
 
             if new_marking in closed:
                 continue
-            g = curr.g + cost
+            t = vect_net.transitions[j]
+            g = curr.g + trans_cost[j]
 
             queued += 1
             h, x = utils.__derive_heuristic(incidence_matrix, cost_vec, curr.x, t, curr.h)
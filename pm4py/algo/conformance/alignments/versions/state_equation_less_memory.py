@@ -1,5 +1,6 @@
 from pm4py.algo.conformance.alignments.versions.dijkstra_less_memory import __add_to_open_set, __add_closed, \
-    __check_closed, __decode_marking, __encode_marking, __fire_trans, __dict_leq, \
+    __check_closed, __encode_marking, __intern_marking, __fire_trans, __vectorize_transitions, \
+    __get_enabled_transitions, \
     __transform_model_to_mem_efficient_structure, __transform_trace_to_mem_efficient_structure, __reconstruct_alignment, \
     get_best_worst_cost
 
@@ -321,10 +322,10 @@ def apply(trace, net, im, fm, parameters=None):
 def get_corresp_marking_and_trans(m, index, corresp, t):
     marking = petri.petrinet.Marking()
     marking[corresp[0][-index]] = 1
-    for pl in m:
-        if not corresp[1][pl] in marking:
-            marking[corresp[1][pl]] = 0
-        marking[corresp[1][pl]] = marking[corresp[1][pl]] + 1
+    # the marking of the model is a tuple of token counts
+    for pl, n in enumerate(m):
+        if n > 0:
+            marking[corresp[1][pl]] = n
     trans = None
     if t in corresp[2]:
         trans = corresp[2][t]
@@ -394,8 +395,6 @@ def __align(model_struct, trace_struct, product_net, corresp, sync_cost=align_ut
     """
     start_time = time.time()
 
-    trans_pre_dict = model_struct[TRANS_PRE_DICT]
-    trans_post_dict = model_struct[TRANS_POST_DICT]
     trans_labels_dict = model_struct[TRANS_LABELS_DICT]
     transf_model_cost_function = model_struct[TRANSF_MODEL_COST_FUNCTION]
     transf_trace = trace_struct[TRANSF_TRACE]
@@ -424,9 +423,11 @@ def __align(model_struct, trace_struct, product_net, corresp, sync_cost=align_ut
         h_cvx = matrix(h_cvx)
         cost_vec = matrix(cost_vec)
 
+    no_places, trans_pre, trans_delta, place_consumers, trans_empty_preset = __vectorize_transitions(model_struct)
+
     marking_dict = {}
-    im = __encode_marking(marking_dict, model_struct[TRANSF_IM])
-    fm = __encode_marking(marking_dict, model_struct[TRANSF_FM])
+    im = __encode_marking(marking_dict, model_struct[TRANSF_IM], no_places)
+    fm = __encode_marking(marking_dict, model_struct[TRANSF_FM], no_places)
 
     h, x, trustable = __calculate_heuristics(None, None, im, 0, corresp, None, sync_net, incidence_matrix,
                                              fin_vec,
@@ -447,8 +448,6 @@ def __align(model_struct, trace_struct, product_net, corresp, sync_cost=align_ut
             return None
         curr = heapq.heappop(open_set)
         curr_m0 = curr[POSITION_MARKING]
-
-        curr_m = __decode_marking(curr_m0)
         index = curr[POSITION_INDEX]
 
         visited = visited + 1
@@ -462,7 +461,7 @@ def __align(model_struct, trace_struct, product_net, corresp, sync_cost=align_ut
         trustable = curr[POSITION_TRUSTABLE]
 
         if not trustable:
-            m, t = get_corresp_marking_and_trans(curr_m, index, corresp, None)
+            m, t = get_corresp_marking_and_trans(curr_m0, index, corresp, None)
             h, x = utils.__compute_exact_heuristic_new_version(sync_net, a_matrix, h_cvx, g_matrix, cost_vec,
                                                                incidence_matrix, m, fin_vec,
                                                                lp_solver.DEFAULT_LP_SOLVER_VARIANT,
@@ -489,9 +488,8 @@ def __align(model_struct, trace_struct, product_net, corresp, sync_cost=align_ut
                                                len(marking_dict), exact_heu_calculations,
                                                ret_tuple_as_trans_desc=ret_tuple_as_trans_desc)
         # retrieves the transitions that are enabled in the current marking
-        en_t = [[t, __encode_marking(marking_dict, __fire_trans(curr_m, trans_pre_dict[t], trans_post_dict[t])), 0,
-                 None, False]
-                for t in trans_pre_dict if __dict_leq(trans_pre_dict[t], curr_m)]
+        en_t = [[t, __intern_marking(marking_dict, __fire_trans(curr_m0, trans_delta[t])), 0, None, False]
+                for t in __get_enabled_transitions(curr_m0, trans_pre, place_consumers, trans_empty_preset)]
 
         this_closed = set()
         j = 0
@@ -1,4 +1,4 @@
-from pm4py.algo.conformance.log_skeleton.versions import classic
+from pm4py.algo.conformance.log_skeleton.versions import classic, vectorized
 from pm4py.objects.log.log import Trace
 from pm4py.objects.conversion.log import converter as log_conversion
 from enum import Enum
@@ -7,9 +7,11 @@ from pm4py.util import exec_utils
 
 class Variants(Enum):
     CLASSIC = classic
+    VECTORIZED = vectorized
 
 
 CLASSIC = Variants.CLASSIC
+VECTORIZED = Variants.VECTORIZED
 DEFAULT_VARIANT = Variants.CLASSIC
 
 
@@ -25,7 +27,7 @@ def apply(obj, model, variant=DEFAULT_VARIANT, parameters=None):
     model
         Log-skeleton model
     variant
-        Variant of the algorithm, possible values: Variants.CLASSIC
+        Variant of the algorithm, possible values: Variants.CLASSIC, Variants.VECTORIZED
     parameters
         Parameters of the algorithm, including:
         - Parameters.ACTIVITY_KEY
@@ -62,7 +64,7 @@ def apply_from_variants_list(var_list, model, variant=DEFAULT_VARIANT, parameter
     model
         Log skeleton model
     variant
-        Variant of the algorithm, possible values: Variants.CLASSIC
+        Variant of the algorithm, possible values: Variants.CLASSIC, Variants.VECTORIZED
     parameters
         Parameters
 
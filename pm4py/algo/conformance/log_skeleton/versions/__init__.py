@@ -1 +1 @@
-from pm4py.algo.conformance.log_skeleton.versions import classic
+from pm4py.algo.conformance.log_skeleton.versions import classic, vectorized
@@ -36,21 +36,22 @@ def apply_log(log, model, parameters=None):
 
     activity_key = exec_utils.get_param_value(Parameters.ACTIVITY_KEY, parameters, xes.DEFAULT_NAME_KEY)
 
-    traces = [tuple(y[activity_key] for y in x) for x in log]
-    grouped_traces = {}
-    gtk = []
-    inv_idxs = {}
-    for i in range(len(traces)):
-        tr = traces[i]
-        if not tr in grouped_traces:
-            grouped_traces[tr] = []
-            gtk.append(tr)
-        grouped_traces[tr].append(i)
-        inv_idxs[i] = gtk.index(tr)
+    consid_constraints = exec_utils.get_param_value(Parameters.CONSIDERED_CONSTRAINTS, parameters,
+                                                    Parameters.DEFAULT_CONSIDERED_CONSTRAINTS.value)
 
+    traces = [tuple(y[activity_key] for y in x) for x in log]
+    variants_idxs = {}
+    inv_idxs = []
+    for tr in traces:
+        if tr not in variants_idxs:
+            variants_idxs[tr] = len(variants_idxs)
+        inv_idxs.append(variants_idxs[tr])
+
+    # the model is indexed once, and the information of each variant is computed once
+    model_info = get_model_info(model, consid_constraints)
     res0 = []
-    for trace in grouped_traces:
-        res0.append(apply_actlist(trace, model, parameters=parameters))
+    for trace in variants_idxs:
+        res0.append(__apply_actlist(trace, trace_skel.get_trace_info(trace), model, model_info, consid_constraints))
 
     res = []
     for i in range(len(traces)):
@@ -59,6 +60,38 @@ def apply_log(log, model, parameters=None):
     return res
 
 
+def get_model_info(model, consid_constraints=None):
+    """
+    Indexes the relations of the log-skeleton model by their first activity
+
+    Parameters
+    --------------
+    model
+        Log-skeleton model
+    consid_constraints
+        Relations of the model that are indexed (default: Parameters.DEFAULT_CONSIDERED_CONSTRAINTS); the model
+        is required to contain (at least) these relations
+
+    Returns
+    --------------
+    model_info
+        Dictionary associating to each relation of the model a dictionary, that associates to each activity
+        the set of the pairs of the relation having the activity as first element
+    """
+    if consid_constraints is None:
+        consid_constraints = Parameters.DEFAULT_CONSIDERED_CONSTRAINTS.value
+
+    model_info = {}
+    for constraint in consid_constraints:
+        if constraint != DiscoveryOutputs.ACTIV_FREQ.value:
+            model_info[constraint] = {}
+            for x in model[constraint]:
+                if x[0] not in model_info[constraint]:
+                    model_info[constraint][x[0]] = set()
+                model_info[constraint][x[0]].add(x)
+    return model_info
+
+
 def apply_trace(trace, model, parameters=None):
     """
     Apply log-skeleton based conformance checking given a trace
@@ -120,7 +153,17 @@ def apply_actlist(trace, model, parameters=None):
         parameters = {}
 
     consid_constraints = exec_utils.get_param_value(Parameters.CONSIDERED_CONSTRAINTS, parameters, Parameters.DEFAULT_CONSIDERED_CONSTRAINTS.value)
-    trace_info = trace_skel.get_trace_info(trace)
+
+    return __apply_actlist(trace, trace_skel.get_trace_info(trace), model, get_model_info(model, consid_constraints), consid_constraints)
+
+
+def __apply_actlist(trace, trace_info, model, model_info, consid_constraints):
+    """
+    Apply log-skeleton based conformance checking given the list of activities of a trace, along with
+    the information of the trace (see trace_skel.get_trace_info) and the indexed model (see get_model_info)
+    """
+    # activities of the trace (with their frequency)
+    trace_activities = trace_info[5]
 
     ret = {}
     ret[Outputs.DEVIATIONS.value] = []
@@ -134,7 +177,7 @@ def apply_actlist(trace, model, parameters=None):
         if default_considered_constraints[i] in consid_constraints:
             if default_considered_constraints[i] == DiscoveryOutputs.ACTIV_FREQ.value:
                 this_constraints = {x: y for x, y in model[default_considered_constraints[i]].items()}
-                conf_total += len(list(act for act in trace_info[i] if act in this_constraints)) + len(list(act for act in trace_info[i] if act not in this_constraints)) + len(list(act for act in this_constraints if min(this_constraints[act]) > 0 and not act in trace))
+                conf_total += len(list(act for act in trace_info[i] if act in this_constraints)) + len(list(act for act in trace_info[i] if act not in this_constraints)) + len(list(act for act in this_constraints if min(this_constraints[act]) > 0 and not act in trace_activities))
                 for act in trace_info[i]:
                     if act in this_constraints:
                         if trace_info[i][act] not in this_constraints[act]:
@@ -144,18 +187,20 @@ def apply_actlist(trace, model, parameters=None):
                         dev_total += 1
                         ret[Outputs.DEVIATIONS.value].append((default_considered_constraints[i], (act, 0)))
                 for act in this_constraints:
-                    if min(this_constraints[act]) > 0 and not act in trace:
+                    if min(this_constraints[act]) > 0 and not act in trace_activities:
                         dev_total += 1
                         ret[Outputs.DEVIATIONS.value].append((default_considered_constraints[i], (act, this_constraints[act])))
             elif default_considered_constraints[i] == DiscoveryOutputs.NEVER_TOGETHER.value:
-                this_constraints = {x for x in model[default_considered_constraints[i]] if x[0] in trace}
+                this_constraints = __get_trace_constraints(model_info[default_considered_constraints[i]],
+                                                           trace_activities)
                 conf_total += len(this_constraints)
                 setinte = this_constraints.intersection(trace_info[i])
                 dev_total += len(setinte)
                 if len(setinte) > 0:
                     ret[Outputs.DEVIATIONS.value].append((default_considered_constraints[i], tuple(setinte)))
             else:
-                this_constraints = {x for x in model[default_considered_constraints[i]] if x[0] in trace}
+                this_constraints = __get_trace_constraints(model_info[default_considered_constraints[i]],
+                                                           trace_activities)
                 conf_total += len(this_constraints)
                 setdiff = this_constraints.difference(trace_info[i])
                 dev_total += len(setdiff)
@@ -170,6 +215,17 @@ def apply_actlist(trace, model, parameters=None):
     return ret
 
 
+def __get_trace_constraints(relation_info, trace_activities):
+    """
+    Gets the pairs of a relation of the model having as first element an activity of the trace
+    """
+    this_constraints = set()
+    for act in trace_activities:
+        if act in relation_info:
+            this_constraints.update(relation_info[act])
+    return this_constraints
+
+
 def apply_from_variants_list(var_list, model, parameters=None):
     """
     Performs conformance checking using the log skeleton,
@@ -0,0 +1,527 @@
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+
+import numpy as np
+
+from pm4py.algo.conformance.log_skeleton.outputs import Outputs
+from pm4py.algo.discovery.log_skeleton import trace_skel
+from pm4py.algo.discovery.log_skeleton.outputs import Outputs as DiscoveryOutputs
+from pm4py.algo.discovery.log_skeleton.parameters import Parameters
+from pm4py.objects.log.util import xes
+from pm4py.util import exec_utils, constants
+
+# relations of the log-skeleton model that are sets of pairs of activities
+RELATIONS = [DiscoveryOutputs.EQUIVALENCE.value, DiscoveryOutputs.ALWAYS_AFTER.value,
+             DiscoveryOutputs.ALWAYS_BEFORE.value, DiscoveryOutputs.NEVER_TOGETHER.value,
+             DiscoveryOutputs.DIRECTLY_FOLLOWS.value]
+
+# maximum number of elements of the (variants x activities x activities) matrices of a block
+MAX_BLOCK_ELEMENTS = 2 ** 22
+
+# default maximum number of variants whose results are memoized in a compiled model
+DEFAULT_MAX_MEMO_SIZE = 10000
+
+
+class CompiledLogSkeleton(object):
+    def __init__(self, model, max_memo_size=DEFAULT_MAX_MEMO_SIZE):
+        """
+        Log-skeleton model compiled over the indexes of its activities.
+        Each relation is stored both as an adjacency matrix and as a list of bitsets (one integer per activity,
+        having the bit of the activity y set if the pair (x, y) belongs to the relation).
+        The results of the conformance checking of the most recently checked variants are memoized, so the
+        compiled model can be reused on several batches of traces
+
+        Parameters
+        -------------
+        model
+            Log-skeleton model
+        max_memo_size
+            Maximum number of memoized results (the least recently used ones are discarded first)
+        """
+        activities = set(model[DiscoveryOutputs.ACTIV_FREQ.value])
+        for relation in RELATIONS:
+            for x, y in model[relation]:
+                activities.add(x)
+                activities.add(y)
+        self.model = model
+        self.activities = sorted(activities)
+        self.activities_idx = {act: i for i, act in enumerate(self.activities)}
+        self.matrices = {}
+        self.bitsets = {}
+        self.bitsets_count = {}
+        for relation in RELATIONS:
+            matrix = np.zeros((len(self.activities), len(self.activities)), dtype=bool)
+            for x, y in model[relation]:
+                matrix[self.activities_idx[x], self.activities_idx[y]] = True
+            self.matrices[relation] = matrix
+            self.bitsets[relation] = [sum(1 << int(j) for j in np.nonzero(row)[0]) for row in matrix]
+            self.bitsets_count[relation] = matrix.sum(axis=1)
+        self.activ_freq = model[DiscoveryOutputs.ACTIV_FREQ.value]
+        # activities that should occur at least once in each trace
+        self.mandatory = set(act for act in self.activities if act in self.activ_freq and min(self.activ_freq[act]) > 0)
+        self.max_memo_size = max_memo_size
+        self.memo = OrderedDict()
+
+    def get_result(self, variant, consid_constraints):
+        """
+        Gets the memoized result of a variant for the given considered constraints (None if it is not memoized)
+        """
+        key = (tuple(sorted(consid_constraints)), variant)
+        if key not in self.memo:
+            return None
+        self.memo.move_to_end(key)
+        return self.memo[key]
+
+    def set_result(self, variant, consid_constraints, result):
+        """
+        Memoizes the result of a variant for the given considered constraints
+        """
+        key = (tuple(sorted(consid_constraints)), variant)
+        self.memo[key] = result
+        self.memo.move_to_end(key)
+        while len(self.memo) > self.max_memo_size:
+            self.memo.popitem(last=False)
+
+
+def compile_model(model, max_memo_size=DEFAULT_MAX_MEMO_SIZE):
+    """
+    Compiles a log-skeleton model over the indexes of its activities
+
+    Parameters
+    --------------
+    model
+        Log-skeleton model
+    max_memo_size
+        Maximum number of variants whose results are memoized in the compiled model
+
+    Returns
+    --------------
+    compiled_model
+        Compiled log-skeleton model
+    """
+    if isinstance(model, CompiledLogSkeleton):
+        return model
+    return CompiledLogSkeleton(model, max_memo_size=max_memo_size)
+
+
+def apply_log(log, model, parameters=None):
+    """
+    Apply log-skeleton based conformance checking given an event log
+    and a log-skeleton model.
+    The variants of the log are checked together, on the compiled model, and the results are broadcast to the traces
+
+    Parameters
+    --------------
+    log
+        Event log
+    model
+        Log-skeleton model (or compiled log-skeleton model, see compile_model)
+    parameters
+        Parameters of the algorithm, including:
+        - Parameters.ACTIVITY_KEY
+        - Parameters.CONSIDERED_CONSTRAINTS, among: equivalence, always_after, always_before, never_together, directly_follows, activ_freq
+        - Parameters.BLOCK_SIZE => number of variants that are checked together (default: 256)
+
+    Returns
+    --------------
+    aligned_traces
+        Conformance checking results for each trace:
+        - Outputs.IS_FIT => boolean that tells if the trace is perfectly fit according to the model
+        - Outputs.DEV_FITNESS => deviation based fitness (between 0 and 1; the more the trace is near to 1 the more fit is)
+        - Outputs.DEVIATIONS => list of deviations in the model
+    """
+    if parameters is None:
+        parameters = {}
+
+    activity_key = exec_utils.get_param_value(Parameters.ACTIVITY_KEY, parameters, xes.DEFAULT_NAME_KEY)
+
+    traces = [tuple(y[activity_key] for y in x) for x in log]
+    variants_idxs = {}
+    inv_idxs = []
+    for tr in traces:
+        if tr not in variants_idxs:
+            variants_idxs[tr] = len(variants_idxs)
+        inv_idxs.append(variants_idxs[tr])
+
+    res0 = apply_variants(list(variants_idxs), model, parameters=parameters)
+
+    return [res0[i] for i in inv_idxs]
+
+
+def apply_variants(variants, model, parameters=None):
+    """
+    Apply log-skeleton based conformance checking to a list of variants (tuples of activities),
+    evaluating all the variants that are not memoized in the compiled model at once
+
+    Parameters
+    --------------
+    variants
+        List of variants (tuples of activities)
+    model
+        Log-skeleton model (or compiled log-skeleton model, see compile_model)
+    parameters
+        Parameters of the algorithm, including:
+        - Parameters.CONSIDERED_CONSTRAINTS, among: equivalence, always_after, always_before, never_together, directly_follows, activ_freq
+        - Parameters.BLOCK_SIZE => number of variants that are checked together (default: 256)
+
+    Returns
+    --------------
+    results
+        List of the conformance checking results (one for each variant)
+    """
+    if parameters is None:
+        parameters = {}
+
+    consid_constraints = exec_utils.get_param_value(Parameters.CONSIDERED_CONSTRAINTS, parameters,
+                                                    Parameters.DEFAULT_CONSIDERED_CONSTRAINTS.value)
+    block_size = exec_utils.get_param_value(Parameters.BLOCK_SIZE, parameters, 256)
+
+    compiled_model = compile_model(model)
+    # the size of the blocks is limited, since the relations of the variants are (variants x activities x activities)
+    block_size = max(1, min(block_size, MAX_BLOCK_ELEMENTS // max(1, len(compiled_model.activities) ** 2)))
+
+    results = {}
+    to_check = []
+    for variant in dict.fromkeys(variants):
+        results[variant] = compiled_model.get_result(variant, consid_constraints)
+        if results[variant] is None:
+            to_check.append(variant)
+    for i in range(0, len(to_check), block_size):
+        block = to_check[i:i + block_size]
+        for variant, result in zip(block, __check_block(block, compiled_model, consid_constraints)):
+            compiled_model.set_result(variant, consid_constraints, result)
+            results[variant] = result
+
+    # the memoized results are not exposed to the caller
+    return [__copy_result(results[v]) for v in variants]
+
+
+def __encode_block(block, compiled_model, consid_constraints):
+    """
+    Encodes a block of variants as matrices over the indexes of the activities of the model
+    (the activities that are not in the model are kept apart)
+    """
+    activities_idx = compiled_model.activities_idx
+    no_activities = len(compiled_model.activities)
+    counts = np.zeros((len(block), no_activities), dtype=np.int64)
+    # the first occurrence of an activity that does not occur in the variant is after everything
+    first = np.full((len(block), no_activities), np.iinfo(np.int64).max, dtype=np.int64)
+    last = np.full((len(block), no_activities), -1, dtype=np.int64)
+    directly_follows = None
+    unknown = []
+    var_idxs = []
+    codes = []
+    positions = []
+    for i, variant in enumerate(block):
+        variant_codes = [activities_idx.get(act, -1) for act in variant]
+        var_idxs.extend([i] * len(variant_codes))
+        codes.extend(variant_codes)
+        positions.extend(range(len(variant_codes)))
+        unknown.append([act for act in dict.fromkeys(variant) if act not in activities_idx])
+    var_idxs = np.array(var_idxs, dtype=np.int64)
+    codes = np.array(codes, dtype=np.int64)
+    positions = np.array(positions, dtype=np.int64)
+    known = codes >= 0
+    np.add.at(counts, (var_idxs[known], codes[known]), 1)
+    np.minimum.at(first, (var_idxs[known], codes[known]), positions[known])
+    np.maximum.at(last, (var_idxs[known], codes[known]), positions[known])
+    if DiscoveryOutputs.DIRECTLY_FOLLOWS.value in consid_constraints:
+        directly_follows = np.zeros((len(block), no_activities, no_activities), dtype=bool)
+        if len(codes) > 1:
+            # consecutive events of the same variant, both having an activity of the model
+            df_idxs = np.nonzero((var_idxs[:-1] == var_idxs[1:]) & known[:-1] & known[1:])[0]
+            directly_follows[var_idxs[df_idxs], codes[df_idxs], codes[df_idxs + 1]] = True
+    return counts, first, last, directly_follows, unknown
+
+
+def __check_block(block, compiled_model, consid_constraints):
+    """
+    Checks a block of variants against the compiled model, computing the relations of all the variants
+    as boolean (variants x activities x activities) matrices
+    """
+    activities = compiled_model.activities
+    counts, first, last, directly_follows, unknown = __encode_block(block, compiled_model, consid_constraints)
+    present = counts > 0
+    # the pairs of activities, in the order of the flattened (activities x activities) matrices
+    pairs = [(x, y) for x in activities for y in activities]
+    not_diagonal = ~np.eye(len(activities), dtype=bool)
+
+    deviations = [[] for _ in block]
+    dev_total = np.zeros(len(block), dtype=np.int64)
+    conf_total = np.zeros(len(block), dtype=np.int64)
+
+    for relation in RELATIONS:
+        if relation not in consid_constraints:
+            continue
+        # the constraints of the model having as first element an activity of the variant
+        this_constraints = present[:, :, np.newaxis] & compiled_model.matrices[relation][np.newaxis, :, :]
+        conf_total += present.dot(compiled_model.bitsets_count[relation])
+        if relation == DiscoveryOutputs.EQUIVALENCE.value:
+            violated = this_constraints & ~((counts[:, :, np.newaxis] == counts[:, np.newaxis, :]) & not_diagonal)
+        elif relation == DiscoveryOutputs.ALWAYS_AFTER.value:
+            violated = this_constraints & ~(first[:, :, np.newaxis] < last[:, np.newaxis, :])
+        elif relation == DiscoveryOutputs.ALWAYS_BEFORE.value:
+            violated = this_constraints & ~(last[:, :, np.newaxis] > first[:, np.newaxis, :])
+        elif relation == DiscoveryOutputs.NEVER_TOGETHER.value:
+            violated = this_constraints & present[:, np.newaxis, :] & not_diagonal
+        else:
+            violated = this_constraints & ~directly_follows
+        var_idxs, xs, ys = np.nonzero(violated)
+        dev_total += np.bincount(var_idxs, minlength=len(block))
+        bounds = np.searchsorted(var_idxs, np.arange(len(block) + 1))
+        pairs_idxs = (xs * len(activities) + ys).tolist()
+        for i in np.nonzero(bounds[1:] > bounds[:-1])[0]:
+            deviations[i].append((relation, tuple(map(pairs.__getitem__, pairs_idxs[bounds[i]:bounds[i + 1]]))))
+
+    if DiscoveryOutputs.ACTIV_FREQ.value in consid_constraints:
+        activ_freq = compiled_model.activ_freq
+        conf_total += present.sum(axis=1) + np.array([len(x) for x in unknown], dtype=np.int64)
+        for j, act in enumerate(activities):
+            if act in activ_freq:
+                wrong_freq = present[:, j] & ~np.isin(counts[:, j], list(activ_freq[act]))
+                for i in np.nonzero(wrong_freq)[0]:
+                    deviations[i].append((DiscoveryOutputs.ACTIV_FREQ.value, (act, int(counts[i, j]))))
+                if act in compiled_model.mandatory:
+                    missing = ~present[:, j]
+                    conf_total += missing
+                    for i in np.nonzero(missing)[0]:
+                        deviations[i].append((DiscoveryOutputs.ACTIV_FREQ.value, (act, activ_freq[act])))
+                    wrong_freq = wrong_freq | missing
+                dev_total += wrong_freq
+            else:
+                for i in np.nonzero(present[:, j])[0]:
+                    deviations[i].append((DiscoveryOutputs.ACTIV_FREQ.value, (act, 0)))
+                dev_total += present[:, j]
+        for i in range(len(block)):
+            for act in unknown[i]:
+                deviations[i].append((DiscoveryOutputs.ACTIV_FREQ.value, (act, 0)))
+            dev_total[i] += len(unknown[i])
+
+    return [__get_result(deviations[i], int(dev_total[i]), int(conf_total[i])) for i in range(len(block))]
+
+
+def __get_result(deviations, dev_total, conf_total):
+    """
+    Forms the conformance checking result of a variant
+    """
+    ret = {}
+    ret[Outputs.DEVIATIONS.value] = sorted(deviations, key=lambda x: (x[0], x[1]))
+    ret[Outputs.NO_DEV_TOTAL.value] = dev_total
+    ret[Outputs.NO_CONSTR_TOTAL.value] = conf_total
+    ret[Outputs.DEV_FITNESS.value] = 1.0 - float(dev_total) / float(conf_total) if conf_total > 0 else 1.0
+    ret[Outputs.IS_FIT.value] = len(ret[Outputs.DEVIATIONS.value]) == 0
+    return ret
+
+
+def __copy_result(result):
+    """
+    Copies the result of a variant, so that the memoized result cannot be modified by the caller
+    """
+    ret = dict(result)
+    ret[Outputs.DEVIATIONS.value] = list(result[Outputs.DEVIATIONS.value])
+    return ret
+
+
+def apply_trace(trace, model, parameters=None):
+    """
+    Apply log-skeleton based conformance checking given a trace
+    and a log-skeleton model
+
+    Parameters
+    --------------
+    trace
+        Trace
+    model
+        Log-skeleton model (or compiled log-skeleton model, see compile_model)
+    parameters
+        Parameters of the algorithm, including:
+        - the activity key (pm4py:param:activity_key)
+        - the list of considered constraints (considered_constraints) among: equivalence, always_after, always_before, never_together, directly_follows, activ_freq
+
+    Returns
+    --------------
+    aligned_trace
+        Containing:
+        - is_fit => boolean that tells if the trace is perfectly fit according to the model
+        - dev_fitness => deviation based fitness (between 0 and 1; the more the trace is near to 1 the more fit is)
+        - deviations => list of deviations in the model
+    """
+    if parameters is None:
+        parameters = {}
+
+    activity_key = exec_utils.get_param_value(Parameters.ACTIVITY_KEY, parameters, xes.DEFAULT_NAME_KEY)
+    trace = [x[activity_key] for x in trace]
+
+    return apply_actlist(trace, model, parameters=parameters)
+
+
+def apply_actlist(trace, model, parameters=None):
+    """
+    Apply log-skeleton based conformance checking given the list of activities of a trace
+    and a log-skeleton model, checking the relations of each activity of the trace
+    with operations on the bitsets of the compiled model
+
+    Parameters
+    --------------
+    trace
+        List of activities of a trace
+    model
+        Log-skeleton model (or compiled log-skeleton model, see compile_model)
+    parameters
+        Parameters of the algorithm, including:
+        - the activity key (pm4py:param:activity_key)
+        - the list of considered constraints (considered_constraints) among: equivalence, always_after, always_before, never_together, directly_follows, activ_freq
+
+    Returns
+    --------------
+    aligned_trace
+        Containing:
+        - is_fit => boolean that tells if the trace is perfectly fit according to the model
+        - dev_fitness => deviation based fitness (between 0 and 1; the more the trace is near to 1 the more fit is)
+        - deviations => list of deviations in the model
+    """
+    if parameters is None:
+        parameters = {}
+
+    consid_constraints = exec_utils.get_param_value(Parameters.CONSIDERED_CONSTRAINTS, parameters,
+                                                    Parameters.DEFAULT_CONSIDERED_CONSTRAINTS.value)
+
+    compiled_model = compile_model(model)
+    trace = tuple(trace)
+    result = compiled_model.get_result(trace, consid_constraints)
+    if result is None:
+        result = __check_variant(trace, compiled_model, consid_constraints)
+        compiled_model.set_result(trace, consid_constraints, result)
+    return __copy_result(result)
+
+
+def __get_bitset(activities, activities_idx):
+    """
+    Gets the bitset of a collection of activities
+    """
+    bitset = 0
+    for act in activities:
+        bitset |= 1 << activities_idx[act]
+    return bitset
+
+
+def __check_variant(trace, compiled_model, consid_constraints):
+    """
+    Checks a variant against the compiled model, representing the relations of each activity of the variant
+    as a bitset
+    """
+    activities = compiled_model.activities
+    activities_idx = compiled_model.activities_idx
+    activ_freq = trace_skel.activ_freq(trace)
+    first, last = trace_skel.first_last_occurrences(trace)
+    # the activities are visited in the order of their index, so the violated pairs are sorted as in __check_block
+    known = sorted((act for act in activ_freq if act in activities_idx), key=lambda act: activities_idx[act])
+    trace_bitset = __get_bitset(known, activities_idx)
+
+    # bitsets of the activities having a given frequency in the trace
+    freq_bitsets = {}
+    for act in known:
+        freq_bitsets[activ_freq[act]] = freq_bitsets.get(activ_freq[act], 0) | (1 << activities_idx[act])
+    # activities sorted by the position of their last (first) occurrence, with the bitsets of the suffixes (prefixes)
+    by_last = sorted(known, key=lambda act: last[act])
+    last_positions = [last[act] for act in by_last]
+    suffix_bitsets = [0] * (len(by_last) + 1)
+    for k in range(len(by_last) - 1, -1, -1):
+        suffix_bitsets[k] = suffix_bitsets[k + 1] | (1 << activities_idx[by_last[k]])
+    by_first = sorted(known, key=lambda act: first[act])
+    first_positions = [first[act] for act in by_first]
+    prefix_bitsets = [0] * (len(by_first) + 1)
+    for k in range(len(by_first)):
+        prefix_bitsets[k + 1] = prefix_bitsets[k] | (1 << activities_idx[by_first[k]])
+    df_bitsets = {}
+    for k in range(len(trace) - 1):
+        if trace[k] in activities_idx and trace[k + 1] in activities_idx:
+            df_bitsets[trace[k]] = df_bitsets.get(trace[k], 0) | (1 << activities_idx[trace[k + 1]])
+
+    deviations = []
+    dev_total = 0
+    conf_total = 0
+
+    for relation in RELATIONS:
+        if relation not in consid_constraints:
+            continue
+        bitsets = compiled_model.bitsets[relation]
+        bitsets_count = compiled_model.bitsets_count[relation]
+        violated = []
+        for act in known:
+            i = activities_idx[act]
+            if not bitsets[i]:
+                continue
+            conf_total += int(bitsets_count[i])
+            if relation == DiscoveryOutputs.EQUIVALENCE.value:
+                satisfied = freq_bitsets[activ_freq[act]] & ~(1 << i)
+            elif relation == DiscoveryOutputs.ALWAYS_AFTER.value:
+                # the activities having an occurrence after the first occurrence of the activity
+                satisfied = suffix_bitsets[bisect_right(last_positions, first[act])]
+            elif relation == DiscoveryOutputs.ALWAYS_BEFORE.value:
+                # the activities having an occurrence before the last occurrence of the activity
+                satisfied = prefix_bitsets[bisect_left(first_positions, last[act])]
+            elif relation == DiscoveryOutputs.NEVER_TOGETHER.value:
+                # for never-together, the constraints satisfied by the trace are the violated ones
+                satisfied = ~(trace_bitset & ~(1 << i))
+            else:
+                satisfied = df_bitsets.get(act, 0)
+            violated_bitset = bitsets[i] & ~satisfied
+            while violated_bitset:
+                lowest = violated_bitset & -violated_bitset
+                violated.append((act, activities[lowest.bit_length() - 1]))
+                violated_bitset ^= lowest
+        dev_total += len(violated)
+        if len(violated) > 0:
+            deviations.append((relation, tuple(violated)))
+
+    if DiscoveryOutputs.ACTIV_FREQ.value in consid_constraints:
+        model_activ_freq = compiled_model.activ_freq
+        conf_total += len(activ_freq)
+        for act in activ_freq:
+            if act in model_activ_freq:
+                if activ_freq[act] not in model_activ_freq[act]:
+                    dev_total += 1
+                    deviations.append((DiscoveryOutputs.ACTIV_FREQ.value, (act, activ_freq[act])))
+            else:
+                dev_total += 1
+                deviations.append((DiscoveryOutputs.ACTIV_FREQ.value, (act, 0)))
+        for act in activities:
+            if act in compiled_model.mandatory and act not in activ_freq:
+                conf_total += 1
+                dev_total += 1
+                deviations.append((DiscoveryOutputs.ACTIV_FREQ.value, (act, model_activ_freq[act])))
+
+    return __get_result(deviations, dev_total, conf_total)
+
+
+def apply_from_variants_list(var_list, model, parameters=None):
+    """
+    Performs conformance checking using the log skeleton,
+    applying it from a list of variants
+
+    Parameters
+    --------------
+    var_list
+        List of variants
+    model
+        Log skeleton model (or compiled log-skeleton model, see compile_model)
+    parameters
+        Parameters
+
+    Returns
+    --------------
+    conformance_dictio
+        Dictionary containing, for each variant, the result
+        of log skeleton checking
+    """
+    if parameters is None:
+        parameters = {}
+
+    variant_delimiter = exec_utils.get_param_value(Parameters.PARAMETER_VARIANT_DELIMITER, parameters,
+                                                   constants.DEFAULT_VARIANT_SEP)
+
+    variants = [cv[0] for cv in var_list]
+    results = apply_variants([tuple(v.split(variant_delimiter)) for v in variants], model, parameters=parameters)
+
+    return {v: r for v, r in zip(variants, results)}
@@ -1,4 +1,4 @@
-from pm4py.algo.conformance.tokenreplay.versions import token_replay, backwards
+from pm4py.algo.conformance.tokenreplay.versions import token_replay, backwards, compiled_token_replay
 from pm4py.objects.conversion.log import converter as log_converter
 from enum import Enum
 from pm4py.util import exec_utils
@@ -6,8 +6,9 @@ from pm4py.util import exec_utils
 class Variants(Enum):
     TOKEN_REPLAY = token_replay
     BACKWARDS = backwards
+    COMPILED_TOKEN_REPLAY = compiled_token_replay
 
-VERSIONS = {Variants.TOKEN_REPLAY, Variants.BACKWARDS}
+VERSIONS = {Variants.TOKEN_REPLAY, Variants.BACKWARDS, Variants.COMPILED_TOKEN_REPLAY}
 DEFAULT_VARIANT = Variants.TOKEN_REPLAY
 
 
@@ -32,6 +33,7 @@ def apply(log, net, initial_marking, final_marking, parameters=None, variant=DEF
         Variant of the algorithm to use:
             - Variants.TOKEN_REPLAY
             - Variants.BACKWARDS
+            - Variants.COMPILED_TOKEN_REPLAY
     """
     if parameters is None:
         parameters = {}
@@ -1 +1 @@
-from pm4py.algo.conformance.tokenreplay.versions import token_replay
+from pm4py.algo.conformance.tokenreplay.versions import token_replay, compiled_token_replay
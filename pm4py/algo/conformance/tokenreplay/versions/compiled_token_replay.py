@@ -0,0 +1,536 @@
+from enum import Enum
+
+from pm4py.algo.conformance.tokenreplay.versions import token_replay
+from pm4py.algo.conformance.tokenreplay.versions.token_replay import TechnicalParameters, NoConceptNameException
+from pm4py.objects.petri.align_utils import get_visible_transitions_eventually_enabled_by_marking
+from pm4py.objects.petri.petrinet import Marking
+from pm4py.objects.petri.utils import get_places_shortest_path_by_hidden
+from pm4py.util import exec_utils, constants
+from pm4py.util import xes_constants as xes_util
+
+
+class Parameters(Enum):
+    ACTIVITY_KEY = constants.PARAMETER_CONSTANT_ACTIVITY_KEY
+    VARIANTS = "variants"
+    PLACES_SHORTEST_PATH_BY_HIDDEN = "places_shortest_path_by_hidden"
+    DISABLE_VARIANTS = "disable_variants"
+    CLEANING_TOKEN_FLOOD = "cleaning_token_flood"
+    IS_REDUCTION = "is_reduction"
+    WALK_THROUGH_HIDDEN_TRANS = "walk_through_hidden_trans"
+    RETURN_NAMES = "return_names"
+    STOP_IMMEDIATELY_UNFIT = "stop_immediately_unfit"
+    TRY_TO_REACH_FINAL_MARKING_THROUGH_HIDDEN = "try_to_reach_final_marking_through_hidden"
+    CONSIDER_REMAINING_IN_FITNESS = "consider_remaining_in_fitness"
+    ENABLE_PLTR_FITNESS = "enable_pltr_fitness"
+    TOKEN_REPLAY_CONTEXT = "token_replay_context"
+
+
+class CompiledNet(object):
+    """
+    Accepting Petri net compiled for the token-based replay: the places and the transitions are identified
+    by their index, the arcs are described, for each transition, by the list of (place index, weight) pairs
+    in the order of the arcs of the net, and the shortest paths between places
+    through hidden transitions are expressed as tuples of transition indexes
+    """
+
+    def __init__(self, net, initial_marking, final_marking, places_shortest_path_by_hidden=None,
+                 max_enabled_cache_size=None):
+        """
+        Compiles the Petri net
+
+        Parameters
+        -------------
+        net
+            Petri net
+        initial_marking
+            Initial marking
+        final_marking
+            Final marking
+        places_shortest_path_by_hidden
+            (If provided) shortest paths between places by hidden transitions
+        max_enabled_cache_size
+            (If provided) maximum number of markings whose eventually enabled visible transitions are kept
+        """
+        if places_shortest_path_by_hidden is None:
+            places_shortest_path_by_hidden = get_places_shortest_path_by_hidden(net,
+                                                                                TechnicalParameters.MAX_REC_DEPTH.value)
+        self.net = net
+        self.places = list(net.places)
+        self.transitions = list(net.transitions)
+        place_index = {p: i for i, p in enumerate(self.places)}
+        trans_index = {t: j for j, t in enumerate(self.transitions)}
+        self.trans_index = trans_index
+
+        self.pre = [tuple((place_index[a.source], a.weight) for a in t.in_arcs) for t in self.transitions]
+        self.post = [tuple((place_index[a.target], a.weight) for a in t.out_arcs) for t in self.transitions]
+        self.consumed = [sum(w for i, w in arcs) for arcs in self.pre]
+        self.produced = [sum(w for i, w in arcs) for arcs in self.post]
+
+        # as in the token-based replay, the last transition (in the order of the net) having a label is used
+        trans_map = {}
+        for t in net.transitions:
+            trans_map[t.label] = t
+        self.trans_map = {label: trans_index[t] for label, t in trans_map.items()}
+
+        name_order = sorted(range(len(self.places)), key=lambda i: self.places[i].name)
+        self.name_rank = [0] * len(self.places)
+        for rank, i in enumerate(name_order):
+            self.name_rank[i] = rank
+        self.shortest_paths = {place_index[p1]: {place_index[p2]: tuple(trans_index[t] for t in path) for p2, path in
+                                                 paths.items()} for p1, paths in
+                               places_shortest_path_by_hidden.items()}
+
+        self.initial_marking = [(place_index[p], n) for p, n in initial_marking.items()]
+        self.final_marking = [(place_index[p], n) for p, n in final_marking.items()]
+        self.final_places_by_name = sorted((i for i, n in self.final_marking), key=lambda i: self.name_rank[i])
+        self.sum_tokens_im = sum(n for i, n in self.initial_marking)
+        self.sum_tokens_fm = sum(n for i, n in self.final_marking)
+        # visible transitions eventually enabled by the reached markings (depending only on the marking, so
+        # discarding the least recently used entries does not change the results)
+        self.enabled_cache = {} if max_enabled_cache_size is None else token_replay.LRUCache(max_enabled_cache_size)
+
+
+class MarkingVector(object):
+    """
+    Marking as vector of token counts. As in the Counter-based markings, a place is contained in the marking
+    when it gets tokens, and removed when a firing consumes all its tokens; the stamps keep the order in which
+    the places have been added (-1 for the places that are not contained)
+    """
+
+    __slots__ = ["cn", "m", "stamps", "clock"]
+
+    def __init__(self, cn):
+        self.cn = cn
+        self.m = [0] * len(cn.places)
+        self.stamps = [-1] * len(cn.places)
+        self.clock = 0
+        for i, n in cn.initial_marking:
+            self.m[i] = n
+            self.stamps[i] = self.clock
+            self.clock += 1
+
+    def copy(self):
+        other = MarkingVector.__new__(MarkingVector)
+        other.cn = self.cn
+        other.m = list(self.m)
+        other.stamps = list(self.stamps)
+        other.clock = self.clock
+        return other
+
+    def is_enabled(self, j):
+        m = self.m
+        for i, w in self.cn.pre[j]:
+            if m[i] < w:
+                return False
+        return True
+
+    def execute(self, j):
+        m = self.m
+        stamps = self.stamps
+        for i, w in self.cn.pre[j]:
+            m[i] -= w
+            if m[i] == 0:
+                stamps[i] = -1
+        for i, w in self.cn.post[j]:
+            if stamps[i] < 0:
+                stamps[i] = self.clock
+                self.clock += 1
+            m[i] += w
+
+    def add_missing_tokens(self, j):
+        """
+        Adds the tokens needed to activate the transition (as add_missing_tokens of the token-based replay),
+        returning the number of missing tokens
+        """
+        m = self.m
+        missing = 0
+        for i, w in self.cn.pre[j]:
+            if m[i] < w:
+                missing += w - m[i]
+                if self.stamps[i] < 0:
+                    self.stamps[i] = self.clock
+                    self.clock += 1
+                m[i] += w
+        return missing
+
+    def places_with_missing_tokens(self, j):
+        m = self.m
+        return [i for i, w in self.cn.pre[j] if m[i] < w]
+
+    def places_by_name(self):
+        return sorted((i for i, s in enumerate(self.stamps) if s >= 0), key=lambda i: self.cn.name_rank[i])
+
+    def places_by_insertion(self):
+        return sorted((i for i, s in enumerate(self.stamps) if s >= 0), key=lambda i: self.stamps[i])
+
+    def contains_final_marking_places(self):
+        stamps = self.stamps
+        for i, n in self.cn.final_marking:
+            if stamps[i] < 0:
+                return False
+        return True
+
+    def to_marking(self):
+        places = self.cn.places
+        return Marking({places[i]: self.m[i] for i in self.places_by_insertion()})
+
+
+def __get_hidden_transitions_to_enable(cn, marking, target_places):
+    """
+    Gets the shortest paths (through hidden transitions) from the places of the marking to the target places,
+    sorted by length (as get_hidden_transitions_to_enable of the token-based replay)
+    """
+    hidden_transitions_to_enable = []
+    for p1 in marking.places_by_name():
+        paths = cn.shortest_paths.get(p1)
+        if paths:
+            for p2 in target_places:
+                path = paths.get(p2)
+                if path is not None:
+                    hidden_transitions_to_enable.append(path)
+    return sorted(hidden_transitions_to_enable, key=lambda x: len(x))
+
+
+def __enable_hidden_transitions(marking, activated_transitions, visited_transitions, hidden_transitions_to_enable,
+                                t):
+    """
+    Fires the hidden transitions in order to enable the given transition
+    (as enable_hidden_transitions of the token-based replay)
+    """
+    j_indexes = [0] * len(hidden_transitions_to_enable)
+    for z in range(10000000):
+        something_changed = False
+        g = z % len(hidden_transitions_to_enable)
+        group = hidden_transitions_to_enable[g]
+        for k in range(j_indexes[g], len(group)):
+            t3 = group[j_indexes[g]]
+            if not t3 == t:
+                if marking.is_enabled(t3):
+                    if t3 not in visited_transitions:
+                        marking.execute(t3)
+                        activated_transitions.append(t3)
+                        visited_transitions.add(t3)
+                        something_changed = True
+            j_indexes[g] = j_indexes[g] + 1
+            if marking.is_enabled(t):
+                break
+        if marking.is_enabled(t):
+            break
+        if not something_changed:
+            break
+
+
+def __apply_hidden_trans(cn, t, marking, act_tr, rec_depth, visit_trans):
+    """
+    Fires hidden transitions in order to enable the given transition (as apply_hidden_trans of the
+    token-based replay)
+    """
+    if rec_depth >= TechnicalParameters.MAX_REC_DEPTH_HIDTRANSENABL.value or t in visit_trans:
+        return
+    visit_trans.add(t)
+    marking_at_start = list(marking.m)
+    places_with_missing = sorted(marking.places_with_missing_tokens(t), key=lambda i: cn.name_rank[i])
+    hidden_transitions_to_enable = __get_hidden_transitions_to_enable(cn, marking, places_with_missing)
+
+    if hidden_transitions_to_enable:
+        __enable_hidden_transitions(marking, act_tr, visit_trans, hidden_transitions_to_enable, t)
+        if not marking.is_enabled(t):
+            hidden_transitions_to_enable = __get_hidden_transitions_to_enable(cn, marking, places_with_missing)
+            for group in hidden_transitions_to_enable:
+                for t4 in group:
+                    if not t4 == t:
+                        if t4 not in visit_trans:
+                            if not marking.is_enabled(t4):
+                                __apply_hidden_trans(cn, t4, marking, act_tr, rec_depth + 1, visit_trans)
+                            if marking.is_enabled(t4):
+                                marking.execute(t4)
+                                act_tr.append(t4)
+                                visit_trans.add(t4)
+        if not marking.is_enabled(t):
+            if not (marking_at_start == marking.m):
+                __apply_hidden_trans(cn, t, marking, act_tr, rec_depth + 1, visit_trans)
+
+
+def __get_enabled_transitions(cn, marking):
+    """
+    Gets the visible transitions eventually enabled by the marking (cached by marking)
+    """
+    marking_key = tuple(marking.m)
+    if marking_key not in cn.enabled_cache:
+        cn.enabled_cache[marking_key] = get_visible_transitions_eventually_enabled_by_marking(cn.net,
+                                                                                             marking.to_marking())
+    return cn.enabled_cache[marking_key]
+
+
+def replay_activity(cn, marking, activity, walk_through_hidden_trans=True):
+    """
+    Replays an activity from the given marking (modified in place), firing the hidden transitions needed to enable
+    the corresponding transition, as the replay of a trace that stops immediately when a non-conformance is detected.
+    Replaying the activities of a prefix one at a time reaches the same marking as replaying the prefix
+
+    Parameters
+    -------------
+    cn
+        Compiled net
+    marking
+        Marking vector
+    activity
+        Activity
+    walk_through_hidden_trans
+        Boolean value that decides if we shall walk through hidden transitions in order to enable visible transitions
+
+    Returns
+    -------------
+    is_fit
+        Boolean value that is False when the transition could not be enabled (missing tokens)
+    """
+    t = cn.trans_map.get(activity)
+    if t is None:
+        return True
+    if walk_through_hidden_trans and not marking.is_enabled(t):
+        __apply_hidden_trans(cn, t, marking, [], 0, set())
+    if not marking.is_enabled(t):
+        return False
+    marking.execute(t)
+    return True
+
+
+def replay_trace(cn, activities, consider_remaining_in_fitness=True, try_to_reach_final_marking_through_hidden=True,
+                 stop_immediately_unfit=False, walk_through_hidden_trans=True, prefixes_enabled_transitions=None):
+    """
+    Replays a trace (list of activities) on the compiled net, following the rules of the token-based replay
+    (without the place/transition fitness, the cleaning of the token flood and the caches of the reduction)
+
+    Parameters
+    -------------
+    cn
+        Compiled net
+    activities
+        List of activities
+    consider_remaining_in_fitness
+        Boolean value telling if the remaining tokens should be considered in fitness evaluation
+    try_to_reach_final_marking_through_hidden
+        Boolean value that decides if we shall try to reach the final marking through hidden transitions
+    stop_immediately_unfit
+        Boolean value that decides if we shall stop immediately when a non-conformance is detected
+    walk_through_hidden_trans
+        Boolean value that decides if we shall walk through hidden transitions in order to enable visible transitions
+    prefixes_enabled_transitions
+        (If provided) list to which, for each proper (non-empty) prefix of the trace, the set of visible transitions
+        eventually enabled by the marking reached after the prefix is appended (None if the prefix could not be
+        replayed without missing tokens). These are the enabled transitions that the replay of the prefix alone
+        would return, without stopping at the end of the prefix
+
+    Returns
+    -------------
+    replay_result
+        List with the same content as the output of apply_trace in the token-based replay
+    """
+    marking = MarkingVector(cn)
+    pre_consumed = cn.consumed
+    post_produced = cn.produced
+    act_trans = []
+    transitions_with_problems = []
+    missing = 0
+    consumed = 0
+    produced = cn.sum_tokens_im
+
+    for idx, act in enumerate(activities):
+        if prefixes_enabled_transitions is not None and idx > 0:
+            prefixes_enabled_transitions.append(
+                None if transitions_with_problems else __get_enabled_transitions(cn, marking))
+        t = cn.trans_map.get(act)
+        if t is None:
+            continue
+        if walk_through_hidden_trans and not marking.is_enabled(t):
+            prev_len_activated_transitions = len(act_trans)
+            __apply_hidden_trans(cn, t, marking, act_trans, 0, set())
+            for t5 in act_trans[prev_len_activated_transitions:]:
+                consumed += pre_consumed[t5]
+                produced += post_produced[t5]
+        if not marking.is_enabled(t):
+            transitions_with_problems.append(t)
+            if stop_immediately_unfit:
+                missing = missing + 1
+                break
+            missing += marking.add_missing_tokens(t)
+        consumed += pre_consumed[t]
+        produced += post_produced[t]
+        if marking.is_enabled(t):
+            marking.execute(t)
+            act_trans.append(t)
+
+    if try_to_reach_final_marking_through_hidden:
+        for i in range(TechnicalParameters.MAX_IT_FINAL1.value):
+            if not marking.contains_final_marking_places():
+                for group in __get_hidden_transitions_to_enable(cn, marking, cn.final_places_by_name):
+                    for t in group:
+                        if marking.is_enabled(t):
+                            marking.execute(t)
+                            act_trans.append(t)
+                            consumed += pre_consumed[t]
+                            produced += post_produced[t]
+                    if marking.contains_final_marking_places():
+                        break
+            else:
+                break
+
+        # try to reach the final marking in a different fashion, if not already reached
+        if not marking.contains_final_marking_places():
+            if len(cn.final_marking) == 1:
+                sink_place = cn.final_marking[0][0]
+                connections_to_sink = []
+                for place in marking.places_by_insertion():
+                    if place in cn.shortest_paths and sink_place in cn.shortest_paths[place]:
+                        connections_to_sink.append(cn.shortest_paths[place][sink_place])
+                connections_to_sink = sorted(connections_to_sink, key=lambda x: len(x))
+
+                for i in range(TechnicalParameters.MAX_IT_FINAL2.value):
+                    for path in connections_to_sink:
+                        for t in path:
+                            if marking.is_enabled(t):
+                                marking.execute(t)
+                                act_trans.append(t)
+                                consumed += pre_consumed[t]
+                                produced += post_produced[t]
+                            else:
+                                break
+
+    m = marking.m
+    reached_marking = marking.to_marking()
+    final_marking = dict(cn.final_marking)
+
+    remaining = 0
+    for i in marking.places_by_insertion():
+        if i in final_marking:
+            remaining += max(0, m[i] - final_marking[i])
+        else:
+            remaining += m[i]
+
+    if consider_remaining_in_fitness:
+        is_fit = (missing == 0) and (remaining == 0)
+    else:
+        is_fit = (missing == 0)
+
+    consumed += cn.sum_tokens_fm
+    for i, n in cn.final_marking:
+        if n - m[i] > 0:
+            missing += n - m[i]
+
+    if consumed > 0 and produced > 0:
+        trace_fitness = 0.5 * (1.0 - float(missing) / float(consumed)) + 0.5 * (
+                1.0 - float(remaining) / float(produced))
+    else:
+        trace_fitness = 1.0
+
+    transitions = cn.transitions
+    return [is_fit, trace_fitness, [transitions[j] for j in act_trans], [transitions[j] for j in
+                                                                         transitions_with_problems],
+            reached_marking, set(__get_enabled_transitions(cn, marking)), missing, consumed, remaining, produced]
+
+
+def get_compiled_net(net, initial_marking, final_marking, context=None, places_shortest_path_by_hidden=None):
+    """
+    Gets the compiled net, reusing the one kept in the token replay context (if provided)
+
+    Parameters
+    -------------
+    net
+        Petri net
+    initial_marking
+        Initial marking
+    final_marking
+        Final marking
+    context
+        (If provided) TokenReplayContext bound to the net
+    places_shortest_path_by_hidden
+        (If provided) shortest paths between places by hidden transitions
+
+    Returns
+    -------------
+    cn
+        Compiled net
+    """
+    if context is None:
+        return CompiledNet(net, initial_marking, final_marking,
+                           places_shortest_path_by_hidden=places_shortest_path_by_hidden)
+    context.check_net(net, initial_marking, final_marking)
+    if context.compiled_net is None:
+        context.compiled_net = CompiledNet(net, initial_marking, final_marking,
+                                           places_shortest_path_by_hidden=context.get_places_shortest_path_by_hidden(),
+                                           max_enabled_cache_size=context.max_cache_size)
+    return context.compiled_net
+
+
+def apply(log, net, initial_marking, final_marking, parameters=None):
+    """
+    Method to apply the token-based replay on a compiled representation of the Petri net
+    (the net is compiled once, and each variant is replayed on vectors of token counts).
+    The place/transition fitness, the cleaning of the token flood and the reduction attempts
+    are delegated to the token-based replay
+
+    Parameters
+    -----------
+    log
+        Log
+    net
+        Petri net
+    initial_marking
+        Initial marking
+    final_marking
+        Final marking
+    parameters
+        Parameters of the algorithm (same as the token-based replay), including:
+            Parameters.TOKEN_REPLAY_CONTEXT -> (optional) TokenReplayContext bound to the net, in which the
+            compiled net is kept across calls
+
+    Returns
+    -----------
+    aligned_traces
+        For each trace, dictionary with the same keys as the token-based replay
+    """
+    if parameters is None:
+        parameters = {}
+
+    enable_pltr_fitness = exec_utils.get_param_value(Parameters.ENABLE_PLTR_FITNESS, parameters, False)
+    cleaning_token_flood = exec_utils.get_param_value(Parameters.CLEANING_TOKEN_FLOOD, parameters, False)
+    is_reduction = exec_utils.get_param_value(Parameters.IS_REDUCTION, parameters, False)
+    if enable_pltr_fitness or cleaning_token_flood or is_reduction:
+        return token_replay.apply(log, net, initial_marking, final_marking, parameters=parameters)
+
+    consider_remaining_in_fitness = exec_utils.get_param_value(Parameters.CONSIDER_REMAINING_IN_FITNESS, parameters,
+                                                               True)
+    try_to_reach_final_marking_through_hidden = exec_utils.get_param_value(
+        Parameters.TRY_TO_REACH_FINAL_MARKING_THROUGH_HIDDEN, parameters, True)
+    stop_immediately_unfit = exec_utils.get_param_value(Parameters.STOP_IMMEDIATELY_UNFIT, parameters, False)
+    walk_through_hidden_trans = exec_utils.get_param_value(Parameters.WALK_THROUGH_HIDDEN_TRANS, parameters, True)
+    disable_variants = exec_utils.get_param_value(Parameters.DISABLE_VARIANTS, parameters, False)
+    return_names = exec_utils.get_param_value(Parameters.RETURN_NAMES, parameters, False)
+    places_shortest_path_by_hidden = exec_utils.get_param_value(Parameters.PLACES_SHORTEST_PATH_BY_HIDDEN, parameters,
+                                                                None)
+    activity_key = exec_utils.get_param_value(Parameters.ACTIVITY_KEY, parameters, xes_util.DEFAULT_NAME_KEY)
+    variants = exec_utils.get_param_value(Parameters.VARIANTS, parameters, None)
+
+    aligned_traces = []
+    if len(log) > 0 and len(log[0]) > 0:
+        if activity_key not in log[0][0]:
+            raise NoConceptNameException("at least an event is without " + activity_key)
+        if variants is None:
+            variants = token_replay.get_variants_from_log(log, activity_key, disable_variants=disable_variants)
+        context = exec_utils.get_param_value(Parameters.TOKEN_REPLAY_CONTEXT, parameters, None)
+        cn = get_compiled_net(net, initial_marking, final_marking, context=context,
+                              places_shortest_path_by_hidden=places_shortest_path_by_hidden)
+        replay_results = {}
+        for variant in variants:
+            replay_result = replay_trace(cn, [x[activity_key] for x in variants[variant][0]],
+                                         consider_remaining_in_fitness=consider_remaining_in_fitness,
+                                         try_to_reach_final_marking_through_hidden=try_to_reach_final_marking_through_hidden,
+                                         stop_immediately_unfit=stop_immediately_unfit,
+                                         walk_through_hidden_trans=walk_through_hidden_trans)
+            replay_results[variant] = token_replay.get_replay_result(replay_result, return_names)
+        for trace in log:
+            trace_variant = token_replay.get_variant_from_trace(trace, activity_key, disable_variants=disable_variants)
+            if trace_variant in replay_results:
+                aligned_traces.append(replay_results[trace_variant])
+
+    return aligned_traces
@@ -1,3 +1,6 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
 from pm4py.statistics.variants.log import get as variants_module
 from pm4py.util import xes_constants as xes_util
 from pm4py.objects.petri import semantics
@@ -6,6 +9,7 @@ from pm4py.objects.petri.utils import get_places_shortest_path_by_hidden, get_s_
 from pm4py.objects.log import log as log_implementation
 from pm4py.objects.petri.importer.versions import pnml as petri_importer
 from pm4py.objects.petri import align_utils
+from collections import OrderedDict
 from copy import copy
 from enum import Enum
 from pm4py.util import exec_utils, constants
@@ -26,6 +30,8 @@ class Parameters(Enum):
     TRY_TO_REACH_FINAL_MARKING_THROUGH_HIDDEN = "try_to_reach_final_marking_through_hidden"
     CONSIDER_REMAINING_IN_FITNESS = "consider_remaining_in_fitness"
     ENABLE_PLTR_FITNESS = "enable_pltr_fitness"
+    NUM_WORKERS = "num_workers"
+    TOKEN_REPLAY_CONTEXT = "token_replay_context"
 
 
 class TechnicalParameters(Enum):
@@ -38,6 +44,7 @@ class TechnicalParameters(Enum):
     MAX_DEF_THR_EX_TIME = 10
     ENABLE_POSTFIX_CACHE = False
     ENABLE_MARKTOACT_CACHE = False
+    CONTEXT_CACHE_SIZE = 10000
 
 
 class DebugConst:
@@ -830,6 +837,28 @@ class ApplyTraceTokenReplay:
         self.thread_is_alive = False
 
 
+class LRUCache(OrderedDict):
+    """
+    Dictionary keeping at most max_size entries: when the limit is exceeded,
+    the least recently used entry is evicted
+    """
+
+    def __init__(self, max_size):
+        super().__init__()
+        self.max_size = max_size
+
+    def __getitem__(self, key):
+        value = super().__getitem__(key)
+        self.move_to_end(key)
+        return value
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self.move_to_end(key)
+        if len(self) > self.max_size:
+            self.popitem(last=False)
+
+
 class PostFixCaching:
     """
     Post fix caching object
@@ -850,6 +879,59 @@ class MarkingToActivityCaching:
         self.cache = {}
 
 
+class TokenReplayContext:
+    """
+    Context of the token-based replay bound to an accepting Petri net, that can be reused across calls
+    (passed through Parameters.TOKEN_REPLAY_CONTEXT), so that the preprocessing of the model
+    (shortest paths between places through hidden transitions, S-components, compiled net) is done once.
+    The post-fix and marking-to-activity caches are not kept, since their content affects the results of the
+    replay: each call starts from empty caches, and gets the same results as a replay without context
+    """
+
+    def __init__(self, net, initial_marking, final_marking,
+                 max_cache_size=TechnicalParameters.CONTEXT_CACHE_SIZE.value):
+        """
+        Constructor
+
+        Parameters
+        -------------
+        net
+            Petri net
+        initial_marking
+            Initial marking
+        final_marking
+            Final marking
+        max_cache_size
+            Maximum number of markings whose eventually enabled visible transitions are kept by the compiled net
+        """
+        self.net = net
+        self.initial_marking = initial_marking
+        self.final_marking = final_marking
+        self.max_cache_size = max_cache_size
+        self.places_shortest_path_by_hidden = None
+        self.s_components = None
+        # compiled representation of the net (used by the compiled token-based replay)
+        self.compiled_net = None
+
+    def check_net(self, net, initial_marking, final_marking):
+        """
+        Checks that the context is bound to the given accepting Petri net
+        """
+        if net is not self.net or initial_marking != self.initial_marking or final_marking != self.final_marking:
+            raise Exception("the token replay context is bound to a different accepting Petri net")
+
+    def get_places_shortest_path_by_hidden(self):
+        if self.places_shortest_path_by_hidden is None:
+            self.places_shortest_path_by_hidden = get_places_shortest_path_by_hidden(
+                self.net, TechnicalParameters.MAX_REC_DEPTH.value)
+        return self.places_shortest_path_by_hidden
+
+    def get_s_components(self):
+        if self.s_components is None:
+            self.s_components = get_s_components_from_petri(self.net, self.initial_marking, self.final_marking)
+        return self.s_components
+
+
 def get_variant_from_trace(trace, activity_key, disable_variants=False):
     """
     Gets the variant from the trace (allow disabling)
@@ -905,7 +987,8 @@ def apply_log(log, net, initial_marking, final_marking, enable_pltr_fitness=Fals
               activity_key="concept:name", reach_mark_through_hidden=True, stop_immediately_unfit=False,
               walk_through_hidden_trans=True, places_shortest_path_by_hidden=None,
               variants=None, is_reduction=False, thread_maximum_ex_time=TechnicalParameters.MAX_DEF_THR_EX_TIME.value,
-              cleaning_token_flood=False, disable_variants=False, return_object_names=False):
+              cleaning_token_flood=False, disable_variants=False, return_object_names=False, num_workers=1,
+              context=None):
     """
     Apply token-based replay to a log
 
@@ -945,9 +1028,18 @@ def apply_log(log, net, initial_marking, final_marking, enable_pltr_fitness=Fals
         Disable variants grouping
     return_object_names
         Decides whether names instead of object pointers shall be returned
+    num_workers
+        Number of processes replaying the variants (if 1, the replay is sequential). The parallel replay is not
+        used when the fitness at the place/transition level is enabled
+    context
+        (If provided) token replay context bound to the net, providing the preprocessing of the model
     """
     post_fix_cache = PostFixCaching()
     marking_to_activity_cache = MarkingToActivityCaching()
+    if context is not None and places_shortest_path_by_hidden is None:
+        places_shortest_path_by_hidden = context.get_places_shortest_path_by_hidden()
+    enable_postfix_cache = TechnicalParameters.ENABLE_POSTFIX_CACHE.value or is_reduction
+    enable_marktoact_cache = TechnicalParameters.ENABLE_MARKTOACT_CACHE.value or is_reduction
     if places_shortest_path_by_hidden is None:
         places_shortest_path_by_hidden = get_places_shortest_path_by_hidden(net,
                                                                             TechnicalParameters.MAX_REC_DEPTH.value)
@@ -968,7 +1060,10 @@ def apply_log(log, net, initial_marking, final_marking, enable_pltr_fitness=Fals
     s_components = []
 
     if cleaning_token_flood:
-        s_components = get_s_components_from_petri(net, initial_marking, final_marking)
+        if context is not None:
+            s_components = context.get_s_components()
+        else:
+            s_components = get_s_components_from_petri(net, initial_marking, final_marking)
 
     notexisting_activities_in_model = {}
 
@@ -981,62 +1076,42 @@ def apply_log(log, net, initial_marking, final_marking, enable_pltr_fitness=Fals
                 if variants is None:
                     variants = get_variants_from_log(log, activity_key, disable_variants=disable_variants)
                 vc = variants_module.get_variants_sorted_by_count(variants)
-                threads = {}
                 threads_results = {}
-                all_activated_transitions = set()
+
+                if num_workers > 1 and len(vc) > 1 and not enable_pltr_fitness:
+                    # the place/transition fitness refers to the traces of the log, hence it is computed only
+                    # in the sequential replay
+                    replay_results = __apply_variants_parallel(
+                        [(variants[vc[i][0]][0], vc[i][1]) for i in range(len(vc))], net, initial_marking,
+                        final_marking, places_shortest_path_by_hidden, s_components, num_workers,
+                        {"consider_remaining_in_fitness": consider_remaining_in_fitness,
+                         "activity_key": activity_key,
+                         "try_to_reach_final_marking_through_hidden": reach_mark_through_hidden,
+                         "stop_immediately_unfit": stop_immediately_unfit,
+                         "walk_through_hidden_trans": walk_through_hidden_trans, "is_reduction": is_reduction,
+                         "thread_maximum_ex_time": thread_maximum_ex_time,
+                         "cleaning_token_flood": cleaning_token_flood})
+                else:
+                    replay_results = []
+                    for i in range(len(vc)):
+                        replay_results.append(
+                            apply_trace(variants[vc[i][0]][0], net, initial_marking, final_marking, trans_map,
+                                        enable_pltr_fitness, place_fitness_per_trace, transition_fitness_per_trace,
+                                        notexisting_activities_in_model, places_shortest_path_by_hidden,
+                                        consider_remaining_in_fitness, activity_key=activity_key,
+                                        try_to_reach_final_marking_through_hidden=reach_mark_through_hidden,
+                                        stop_immediately_unfit=stop_immediately_unfit,
+                                        walk_through_hidden_trans=walk_through_hidden_trans,
+                                        post_fix_caching=post_fix_cache,
+                                        marking_to_activity_caching=marking_to_activity_cache,
+                                        is_reduction=is_reduction, thread_maximum_ex_time=thread_maximum_ex_time,
+                                        enable_postfix_cache=enable_postfix_cache,
+                                        enable_marktoact_cache=enable_marktoact_cache,
+                                        cleaning_token_flood=cleaning_token_flood, s_components=s_components,
+                                        trace_occurrences=vc[i][1]))
 
                 for i in range(len(vc)):
-                    variant = vc[i][0]
-                    threads[variant] = ApplyTraceTokenReplay(variants[variant][0], net, initial_marking, final_marking,
-                                                             trans_map, enable_pltr_fitness, place_fitness_per_trace,
-                                                             transition_fitness_per_trace,
-                                                             notexisting_activities_in_model,
-                                                             places_shortest_path_by_hidden,
-                                                             consider_remaining_in_fitness,
-                                                             activity_key=activity_key,
-                                                             reach_mark_through_hidden=reach_mark_through_hidden,
-                                                             stop_immediately_when_unfit=stop_immediately_unfit,
-                                                             walk_through_hidden_trans=walk_through_hidden_trans,
-                                                             post_fix_caching=post_fix_cache,
-                                                             marking_to_activity_caching=marking_to_activity_cache,
-                                                             is_reduction=is_reduction,
-                                                             thread_maximum_ex_time=thread_maximum_ex_time,
-                                                             cleaning_token_flood=cleaning_token_flood,
-                                                             s_components=s_components, trace_occurrences=vc[i][1])
-                    threads[variant].run()
-                    t = threads[variant]
-                    threads_results[variant] = {"trace_is_fit": copy(t.t_fit),
-                                                "trace_fitness": float(copy(t.t_value)),
-                                                "activated_transitions": copy(t.act_trans),
-                                                "reached_marking": copy(t.reached_marking),
-                                                "enabled_transitions_in_marking": copy(
-                                                    t.enabled_trans_in_mark),
-                                                "transitions_with_problems": copy(
-                                                    t.trans_probl),
-                                                "missing_tokens": int(t.missing),
-                                                "consumed_tokens": int(t.consumed),
-                                                "remaining_tokens": int(t.remaining),
-                                                "produced_tokens": int(t.produced)}
-
-                    if return_object_names:
-                        threads_results[variant]["activated_transitions_labels"] = [x.label for x in
-                                                                                    threads_results[variant][
-                                                                                        "activated_transitions"]]
-                        threads_results[variant]["activated_transitions"] = [x.name for x in threads_results[variant][
-                            "activated_transitions"]]
-                        threads_results[variant]["enabled_transitions_in_marking_labels"] = [x.label for x in
-                                                                                             threads_results[variant][
-                                                                                                 "enabled_transitions_in_marking"]]
-                        threads_results[variant]["enabled_transitions_in_marking"] = [x.name for x in
-                                                                                      threads_results[variant][
-                                                                                          "enabled_transitions_in_marking"]]
-                        threads_results[variant]["transitions_with_problems"] = [x.name for x in
-                                                                                 threads_results[variant][
-                                                                                     "transitions_with_problems"]]
-                        threads_results[variant]["reached_marking"] = {x.name: y for x, y in
-                                                                       threads_results[variant][
-                                                                           "reached_marking"].items()}
-                    del threads[variant]
+                    threads_results[vc[i][0]] = get_replay_result(replay_results[i], return_object_names)
                 for trace in log:
                     trace_variant = get_variant_from_trace(trace, activity_key, disable_variants=disable_variants)
                     if trace_variant in threads_results:
@@ -1051,6 +1126,150 @@ def apply_log(log, net, initial_marking, final_marking, enable_pltr_fitness=Fals
         return aligned_traces
 
 
+def get_replay_result(replay_result, return_object_names):
+    """
+    Gets the dictionary describing the replay of a trace, from the output of apply_trace
+
+    Parameters
+    ------------
+    replay_result
+        Tuple returned by apply_trace
+    return_object_names
+        Boolean value that tells if the transitions and the places are expressed by their names
+
+    Returns
+    -------------
+    result
+        Dictionary describing the replay of the trace
+    """
+    t_fit, t_value, act_trans, trans_probl, reached_marking, enabled_trans_in_mark, missing, consumed, remaining, \
+        produced = replay_result
+    result = {"trace_is_fit": t_fit, "trace_fitness": float(t_value), "activated_transitions": act_trans,
+              "reached_marking": reached_marking, "enabled_transitions_in_marking": enabled_trans_in_mark,
+              "transitions_with_problems": trans_probl, "missing_tokens": int(missing),
+              "consumed_tokens": int(consumed), "remaining_tokens": int(remaining), "produced_tokens": int(produced)}
+    if return_object_names:
+        result["activated_transitions_labels"] = [x.label for x in act_trans]
+        result["activated_transitions"] = [x.name for x in act_trans]
+        result["enabled_transitions_in_marking_labels"] = [x.label for x in enabled_trans_in_mark]
+        result["enabled_transitions_in_marking"] = [x.name for x in enabled_trans_in_mark]
+        result["transitions_with_problems"] = [x.name for x in trans_probl]
+        result["reached_marking"] = {x.name: y for x, y in reached_marking.items()}
+    return result
+
+
+# context of the worker processes of the parallel replay (set by the initializer)
+__worker_context = {}
+
+
+def __apply_variants_parallel(traces, net, initial_marking, final_marking, places_shortest_path_by_hidden,
+                              s_components, num_workers, settings):
+    """
+    Replays the given traces (one per variant) in a pool of processes. The Petri net is sent once to each process
+    (by the initializer of the pool), the traces are sent in chunks (keeping only the activities), and the results
+    come back as tuples in which the places and the transitions are expressed by their index
+
+    Parameters
+    -------------
+    traces
+        List of tuples (trace, number of occurrences), one per variant
+    net
+        Petri net
+    initial_marking
+        Initial marking
+    final_marking
+        Final marking
+    places_shortest_path_by_hidden
+        Shortest paths between places by hidden transitions
+    s_components
+        S-components of the Petri net
+    num_workers
+        Number of processes
+    settings
+        Keyword arguments of apply_trace
+
+    Returns
+    -------------
+    replay_results
+        Output of apply_trace for each trace (in the same order)
+    """
+    activity_key = settings["activity_key"]
+    places = list(net.places)
+    transitions = list(net.transitions)
+    num_workers = min(num_workers, len(traces))
+    # more chunks than processes, so that the load is balanced
+    no_chunks = min(len(traces), num_workers * 4)
+    chunks = [[] for i in range(no_chunks)]
+    for i, (trace, occurrences) in enumerate(traces):
+        chunks[i % no_chunks].append(
+            (log_implementation.Trace([log_implementation.Event({activity_key: x[activity_key]}) for x in trace]),
+             occurrences))
+
+    replay_results = [None] * len(traces)
+    # the places and the transitions are sent along with the net, so their indexes refer to the same objects
+    with ProcessPoolExecutor(max_workers=num_workers, initializer=__initialize_worker,
+                             initargs=(net, initial_marking, final_marking, places, transitions,
+                                       places_shortest_path_by_hidden, s_components, settings)) as executor:
+        for c, chunk_results in enumerate(executor.map(__replay_chunk_worker, chunks)):
+            for j, (t_fit, t_value, act_trans, trans_probl, reached_marking, enabled_trans_in_mark, missing, consumed,
+                    remaining, produced) in enumerate(chunk_results):
+                replay_results[c + j * no_chunks] = [
+                    t_fit, t_value, [transitions[x] for x in act_trans], [transitions[x] for x in trans_probl],
+                    Marking({places[x]: y for x, y in reached_marking}),
+                    {transitions[x] for x in enabled_trans_in_mark}, missing, consumed, remaining, produced]
+    return replay_results
+
+
+def __initialize_worker(net, initial_marking, final_marking, places, transitions, places_shortest_path_by_hidden,
+                        s_components, settings):
+    """
+    Initializes a worker process of the parallel replay
+    """
+    __worker_context["petri_net"] = (net, initial_marking, final_marking)
+    __worker_context["places"] = {p: i for i, p in enumerate(places)}
+    __worker_context["transitions"] = {t: i for i, t in enumerate(transitions)}
+    __worker_context["trans_map"] = {t.label: t for t in net.transitions}
+    __worker_context["places_shortest_path_by_hidden"] = places_shortest_path_by_hidden
+    __worker_context["s_components"] = s_components
+    __worker_context["settings"] = settings
+    __worker_context["post_fix_cache"] = PostFixCaching()
+    __worker_context["marking_to_activity_cache"] = MarkingToActivityCaching()
+
+
+def __replay_chunk_worker(chunk):
+    """
+    Replays a chunk of traces in a worker process of the parallel replay
+    """
+    net, initial_marking, final_marking = __worker_context["petri_net"]
+    places = __worker_context["places"]
+    transitions = __worker_context["transitions"]
+    settings = __worker_context["settings"]
+    is_reduction = settings["is_reduction"]
+    chunk_results = []
+    for trace, occurrences in chunk:
+        t_fit, t_value, act_trans, trans_probl, reached_marking, enabled_trans_in_mark, missing, consumed, \
+            remaining, produced = apply_trace(
+                trace, net, initial_marking, final_marking, __worker_context["trans_map"], False, {}, {}, {},
+                __worker_context["places_shortest_path_by_hidden"], settings["consider_remaining_in_fitness"],
+                activity_key=settings["activity_key"],
+                try_to_reach_final_marking_through_hidden=settings["try_to_reach_final_marking_through_hidden"],
+                stop_immediately_unfit=settings["stop_immediately_unfit"],
+                walk_through_hidden_trans=settings["walk_through_hidden_trans"],
+                post_fix_caching=__worker_context["post_fix_cache"],
+                marking_to_activity_caching=__worker_context["marking_to_activity_cache"], is_reduction=is_reduction,
+                thread_maximum_ex_time=settings["thread_maximum_ex_time"],
+                enable_postfix_cache=TechnicalParameters.ENABLE_POSTFIX_CACHE.value or is_reduction,
+                enable_marktoact_cache=TechnicalParameters.ENABLE_MARKTOACT_CACHE.value or is_reduction,
+                cleaning_token_flood=settings["cleaning_token_flood"], s_components=__worker_context["s_components"],
+                trace_occurrences=occurrences)
+        chunk_results.append((t_fit, t_value, tuple(transitions[t] for t in act_trans),
+                              tuple(transitions[t] for t in trans_probl),
+                              tuple((places[p], n) for p, n in reached_marking.items()),
+                              tuple(transitions[t] for t in enabled_trans_in_mark), missing, consumed, remaining,
+                              produced))
+    return chunk_results
+
+
 def apply(log, net, initial_marking, final_marking, parameters=None):
     """
     Method to apply token-based replay
@@ -1066,7 +1285,10 @@ def apply(log, net, initial_marking, final_marking, parameters=None):
     final_marking
         Final marking
     parameters
-        Parameters of the algorithm
+        Parameters of the algorithm, including:
+            Parameters.NUM_WORKERS -> number of processes replaying the variants (default: 1, sequential replay;
+            None: number of CPUs)
+            Parameters.TOKEN_REPLAY_CONTEXT -> (optional) TokenReplayContext bound to the net, reused across calls
     """
     if parameters is None:
         parameters = {}
@@ -1089,6 +1311,12 @@ def apply(log, net, initial_marking, final_marking, parameters=None):
                                                                 None)
     activity_key = exec_utils.get_param_value(Parameters.ACTIVITY_KEY, parameters, xes_util.DEFAULT_NAME_KEY)
     variants = exec_utils.get_param_value(Parameters.VARIANTS, parameters, None)
+    num_workers = exec_utils.get_param_value(Parameters.NUM_WORKERS, parameters, 1)
+    if num_workers is None:
+        num_workers = os.cpu_count()
+    context = exec_utils.get_param_value(Parameters.TOKEN_REPLAY_CONTEXT, parameters, None)
+    if context is not None:
+        context.check_net(net, initial_marking, final_marking)
 
     return apply_log(log, net, initial_marking, final_marking, enable_pltr_fitness=enable_pltr_fitness,
                      consider_remaining_in_fitness=consider_remaining_in_fitness,
@@ -1098,7 +1326,7 @@ def apply(log, net, initial_marking, final_marking, parameters=None):
                      places_shortest_path_by_hidden=places_shortest_path_by_hidden, activity_key=activity_key,
                      variants=variants, is_reduction=is_reduction, thread_maximum_ex_time=thread_maximum_ex_time,
                      cleaning_token_flood=cleaning_token_flood, disable_variants=disable_variants,
-                     return_object_names=return_names)
+                     return_object_names=return_names, num_workers=num_workers, context=context)
 
 
 def apply_variants_list(variants_list, net, initial_marking, final_marking, parameters=None):
@@ -8,7 +8,7 @@ def apply(log, parameters=None):
     Parameters
     ----------
     log
-        Trace log
+        Trace log (or iterable of traces, e.g. from the streaming XES importer)
     parameters
         Possible parameters passed to the algorithms:
             Parameters.ACTIVITY_KEY -> Attribute to use as activity
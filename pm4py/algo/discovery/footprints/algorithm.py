@@ -45,7 +45,7 @@ def apply(*args, variant=None, parameters=None):
     if variant is None:
         if type(args[0]) is pd.DataFrame:
             variant = Variants.ENTIRE_DATAFRAME
-        elif type(args[0]) is EventLog:
+        elif isinstance(args[0], EventLog):
             variant = Variants.TRACE_BY_TRACE
         elif type(args[0]) is PetriNet:
             variant = Variants.PETRI_REACH_GRAPH
@@ -12,6 +12,8 @@ class Parameters(Enum):
                                       "directly_follows", "activ_freq"]
     ACTIVITY_KEY = PARAMETER_CONSTANT_ACTIVITY_KEY
     PARAMETER_VARIANT_DELIMITER = "variant_delimiter"
+    # number of variants that are checked together by the vectorized conformance checking
+    BLOCK_SIZE = "block_size"
 
 
 NOISE_THRESHOLD = Parameters.NOISE_THRESHOLD
@@ -19,3 +21,4 @@ CONSIDERED_CONSTRAINTS = Parameters.CONSIDERED_CONSTRAINTS
 DEFAULT_CONSIDERED_CONSTRAINTS = Parameters.DEFAULT_CONSIDERED_CONSTRAINTS
 ACTIVITY_KEY = Parameters.ACTIVITY_KEY
 PARAMETER_VARIANT_DELIMITER = Parameters.PARAMETER_VARIANT_DELIMITER
+BLOCK_SIZE = Parameters.BLOCK_SIZE
@@ -1,5 +1,6 @@
 from collections import Counter
 
+
 def equivalence(trace):
     """
     Get the equivalence relations given a list of activities
@@ -14,14 +15,38 @@ def equivalence(trace):
     rel
         Relations inside the trace
     """
-    ret = set()
-    freq = activ_freq(trace)
-    for x in freq:
-        for y in freq:
-            if x != y and freq[x] == freq[y]:
-                ret.add((x, y))
-                ret.add((y, x))
-    return ret
+    # the activities are grouped by frequency, so that only the pairs of equivalent activities are visited
+    activities_by_freq = {}
+    for act, freq in activ_freq(trace).items():
+        if freq not in activities_by_freq:
+            activities_by_freq[freq] = []
+        activities_by_freq[freq].append(act)
+    return set((x, y) for activities in activities_by_freq.values() for x in activities for y in activities if x != y)
+
+
+def first_last_occurrences(trace):
+    """
+    Gets the position of the first and of the last occurrence of each activity of a trace
+
+    Parameters
+    --------------
+    trace
+        List activities
+
+    Returns
+    --------------
+    first
+        Dictionary associating to each activity the position of its first occurrence
+    last
+        Dictionary associating to each activity the position of its last occurrence
+    """
+    first = {}
+    last = {}
+    for i, act in enumerate(trace):
+        if act not in first:
+            first[act] = i
+        last[act] = i
+    return first, last
 
 
 def after(trace):
@@ -38,7 +63,9 @@ def after(trace):
     rel
         After- inside the trace
     """
-    return set((trace[i], trace[j]) for i in range(len(trace)) for j in range(len(trace)) if j > i)
+    # an occurrence of x precedes an occurrence of y iff the first occurrence of x precedes the last occurrence of y
+    first, last = first_last_occurrences(trace)
+    return set((x, y) for x in first for y in last if first[x] < last[y])
 
 
 def before(trace):
@@ -55,7 +82,9 @@ def before(trace):
     rel
         Before- inside the trace
     """
-    return set((trace[i], trace[j]) for i in range(len(trace)) for j in range(len(trace)) if j < i)
+    # an occurrence of x follows an occurrence of y iff the last occurrence of x follows the first occurrence of y
+    first, last = first_last_occurrences(trace)
+    return set((x, y) for x in last for y in first if last[x] > first[y])
 
 
 def combos(trace):
@@ -72,7 +101,8 @@ def combos(trace):
     rel
         Combos inside the trace
     """
-    return set((x, y) for x in trace for y in trace if x != y)
+    activities = set(trace)
+    return set((x, y) for x in activities for y in activities if x != y)
 
 
 def directly_follows(trace):
@@ -1,5 +1,8 @@
 from pm4py.objects.log.util import xes
 from collections import Counter
+
+import numpy as np
+
 from pm4py.algo.discovery.log_skeleton import trace_skel
 from pm4py.algo.discovery.log_skeleton.parameters import Parameters
 from pm4py.algo.discovery.log_skeleton.outputs import Outputs
@@ -7,9 +10,9 @@ from pm4py.util import exec_utils, constants
 from pm4py.objects.log.log import EventLog, Trace, Event
 
 
-def equivalence(logs_traces, all_activs, noise_threshold=0):
+def __get_variants_matrices(logs_traces, all_activs):
     """
-    Gets the equivalence relations given the traces of the log
+    Encodes the variants of the log as matrices (one row per variant, one column per activity)
 
     Parameters
     -------------
@@ -17,6 +20,50 @@ def equivalence(logs_traces, all_activs, noise_threshold=0):
         Traces of the log
     all_activs
         All the activities
+
+    Returns
+    --------------
+    activities
+        List of the activities (in the order of the columns)
+    weights
+        Number of occurrences of each variant
+    counts
+        Number of occurrences of the activities in each variant
+    first
+        Position of the first occurrence of the activities in each variant (the length of the variant if the
+        activity does not occur)
+    last
+        Position of the last occurrence of the activities in each variant (-1 if the activity does not occur)
+    """
+    activities = list(all_activs)
+    activities_idx = {act: j for j, act in enumerate(activities)}
+    weights = np.array([logs_traces[trace] for trace in logs_traces], dtype=np.int64)
+    counts = np.zeros((len(logs_traces), len(activities)), dtype=np.int64)
+    first = np.zeros((len(logs_traces), len(activities)), dtype=np.int64)
+    last = np.full((len(logs_traces), len(activities)), -1, dtype=np.int64)
+    for i, trace in enumerate(logs_traces):
+        first[i] = len(trace)
+        trace_first, trace_last = trace_skel.first_last_occurrences(trace)
+        for act, freq in trace_skel.activ_freq(trace).items():
+            j = activities_idx[act]
+            counts[i, j] = freq
+            first[i, j] = trace_first[act]
+            last[i, j] = trace_last[act]
+    return activities, weights, counts, first, last
+
+
+def __get_relations(activities, ret0, all_activs, noise_threshold):
+    """
+    Gets the relations (pairs of activities) that are satisfied by a sufficient number of traces
+
+    Parameters
+    -------------
+    activities
+        List of the activities
+    ret0
+        Matrix containing, for each pair of activities, the number of traces satisfying the relation
+    all_activs
+        All the activities
     noise_threshold
         Noise threshold
 
@@ -25,17 +72,43 @@ def equivalence(logs_traces, all_activs, noise_threshold=0):
     rel
         List of relations in the log
     """
-    ret0 = Counter()
-    for trace in logs_traces:
-        rs = Counter(trace_skel.equivalence(list(trace)))
-        for k in rs:
-            rs[k] = rs[k] * logs_traces[trace]
-        ret0 += rs
-    ret = set(x for x, y in ret0.items() if y >= all_activs[x[0]] * (1.0 - noise_threshold))
-    return ret
+    thresholds = np.array([all_activs[act] for act in activities]) * (1.0 - noise_threshold)
+    rows, columns = np.nonzero((ret0 > 0) & (ret0 >= thresholds.reshape((-1, 1))))
+    return set((activities[i], activities[j]) for i, j in zip(rows, columns))
+
+
+def equivalence(logs_traces, all_activs, noise_threshold=0, variants_matrices=None):
+    """
+    Gets the equivalence relations given the traces of the log
 
+    Parameters
+    -------------
+    logs_traces
+        Traces of the log
+    all_activs
+        All the activities
+    noise_threshold
+        Noise threshold
+    variants_matrices
+        (If provided) matrices of the variants of the log, as returned by __get_variants_matrices
 
-def always_after(logs_traces, all_activs, noise_threshold=0):
+    Returns
+    --------------
+    rel
+        List of relations in the log
+    """
+    if variants_matrices is None:
+        variants_matrices = __get_variants_matrices(logs_traces, all_activs)
+    activities, weights, counts, first, last = variants_matrices
+    ret0 = np.zeros((len(activities), len(activities)), dtype=np.int64)
+    for j in range(len(activities)):
+        # traces in which the activity occurs with the same number of occurrences as the other activities
+        ret0[j] = weights.dot((counts == counts[:, j:j + 1]) & (counts[:, j:j + 1] > 0))
+    np.fill_diagonal(ret0, 0)
+    return __get_relations(activities, ret0, all_activs, noise_threshold)
+
+
+def always_after(logs_traces, all_activs, noise_threshold=0, variants_matrices=None):
     """
     Gets the always-after relations given the traces of the log
 
@@ -47,23 +120,25 @@ def always_after(logs_traces, all_activs, noise_threshold=0):
         All the activities
     noise_threshold
         Noise threshold
+    variants_matrices
+        (If provided) matrices of the variants of the log, as returned by __get_variants_matrices
 
     Returns
     --------------
     rel
         List of relations in the log
     """
-    ret0 = Counter()
-    for trace in logs_traces:
-        rs = Counter(trace_skel.after(list(trace)))
-        for k in rs:
-            rs[k] = rs[k] * logs_traces[trace]
-        ret0 += rs
-    ret = set(x for x, y in ret0.items() if y >= all_activs[x[0]] * (1.0 - noise_threshold))
-    return ret
+    if variants_matrices is None:
+        variants_matrices = __get_variants_matrices(logs_traces, all_activs)
+    activities, weights, counts, first, last = variants_matrices
+    ret0 = np.zeros((len(activities), len(activities)), dtype=np.int64)
+    for j in range(len(activities)):
+        # traces in which the first occurrence of the activity precedes the last occurrence of the other activities
+        ret0[j] = weights.dot(first[:, j:j + 1] < last)
+    return __get_relations(activities, ret0, all_activs, noise_threshold)
 
 
-def always_before(logs_traces, all_activs, noise_threshold=0):
+def always_before(logs_traces, all_activs, noise_threshold=0, variants_matrices=None):
     """
     Gets the always-before relations given the traces of the log
 
@@ -75,23 +150,25 @@ def always_before(logs_traces, all_activs, noise_threshold=0):
         All the activities
     noise_threshold
         Noise threshold
+    variants_matrices
+        (If provided) matrices of the variants of the log, as returned by __get_variants_matrices
 
     Returns
     --------------
     rel
         List of relations in the log
     """
-    ret0 = Counter()
-    for trace in logs_traces:
-        rs = Counter(trace_skel.before(list(trace)))
-        for k in rs:
-            rs[k] = rs[k] * logs_traces[trace]
-        ret0 += rs
-    ret = set(x for x, y in ret0.items() if y >= all_activs[x[0]] * (1.0 - noise_threshold))
-    return ret
+    if variants_matrices is None:
+        variants_matrices = __get_variants_matrices(logs_traces, all_activs)
+    activities, weights, counts, first, last = variants_matrices
+    ret0 = np.zeros((len(activities), len(activities)), dtype=np.int64)
+    for j in range(len(activities)):
+        # traces in which the last occurrence of the activity follows the first occurrence of the other activities
+        ret0[j] = weights.dot(last[:, j:j + 1] > first)
+    return __get_relations(activities, ret0, all_activs, noise_threshold)
 
 
-def never_together(logs_traces, all_activs, len_log, noise_threshold=0):
+def never_together(logs_traces, all_activs, len_log, noise_threshold=0, variants_matrices=None):
     """
     Gets the never-together relations given the traces of the log
 
@@ -105,23 +182,23 @@ def never_together(logs_traces, all_activs, len_log, noise_threshold=0):
         Length of the log
     noise_threshold
         Noise threshold
+    variants_matrices
+        (If provided) matrices of the variants of the log, as returned by __get_variants_matrices
 
     Returns
     --------------
     rel
         List of relations in the log
     """
-    all_combos = set((x, y) for x in all_activs for y in all_activs if x != y)
-    ret0 = Counter()
-    for k in all_combos:
-        ret0[k] = all_activs[k[0]]
-    for trace in logs_traces:
-        rs = Counter(trace_skel.combos(list(trace)))
-        for k in rs:
-            rs[k] = rs[k] * logs_traces[trace]
-        ret0 -= rs
-    ret = set(x for x, y in ret0.items() if y >= all_activs[x[0]] * (1.0 - noise_threshold))
-    return ret
+    if variants_matrices is None:
+        variants_matrices = __get_variants_matrices(logs_traces, all_activs)
+    activities, weights, counts, first, last = variants_matrices
+    present = (counts > 0).astype(np.int64)
+    # number of traces in which both the activities occur
+    together = (present * weights.reshape((-1, 1))).T.dot(present)
+    ret0 = np.array([all_activs[act] for act in activities], dtype=np.int64).reshape((-1, 1)) - together
+    np.fill_diagonal(ret0, 0)
+    return __get_relations(activities, ret0, all_activs, noise_threshold)
 
 
 def directly_follows(logs_traces, all_activs, noise_threshold=0):
@@ -223,12 +300,19 @@ def apply(log, parameters=None):
     logs_traces = Counter([tuple(y[activity_key] for y in x) for x in log])
     all_activs = Counter(list(y[activity_key] for x in log for y in x))
 
+    # the variants are encoded once, and shared between the relations
+    variants_matrices = __get_variants_matrices(logs_traces, all_activs)
+
     ret = {}
-    ret[Outputs.EQUIVALENCE.value] = equivalence(logs_traces, all_activs, noise_threshold=noise_threshold)
-    ret[Outputs.ALWAYS_AFTER.value] = always_after(logs_traces, all_activs, noise_threshold=noise_threshold)
-    ret[Outputs.ALWAYS_BEFORE.value] = always_before(logs_traces, all_activs, noise_threshold=noise_threshold)
+    ret[Outputs.EQUIVALENCE.value] = equivalence(logs_traces, all_activs, noise_threshold=noise_threshold,
+                                                 variants_matrices=variants_matrices)
+    ret[Outputs.ALWAYS_AFTER.value] = always_after(logs_traces, all_activs, noise_threshold=noise_threshold,
+                                                   variants_matrices=variants_matrices)
+    ret[Outputs.ALWAYS_BEFORE.value] = always_before(logs_traces, all_activs, noise_threshold=noise_threshold,
+                                                     variants_matrices=variants_matrices)
     ret[Outputs.NEVER_TOGETHER.value] = never_together(logs_traces, all_activs, len(log),
-                                                       noise_threshold=noise_threshold)
+                                                       noise_threshold=noise_threshold,
+                                                       variants_matrices=variants_matrices)
     ret[Outputs.DIRECTLY_FOLLOWS.value] = directly_follows(logs_traces, all_activs, noise_threshold=noise_threshold)
     ret[Outputs.ACTIV_FREQ.value] = activ_freq(logs_traces, all_activs, len(log), noise_threshold=noise_threshold)
 
@@ -1,10 +1,11 @@
-from pm4py.evaluation.earth_mover_distance.versions import pyemd
+from pm4py.evaluation.earth_mover_distance.versions import pyemd, fast_pyemd
 from enum import Enum
 from pm4py.util import exec_utils
 
 
 class Variants(Enum):
     PYEMD = pyemd
+    FAST_PYEMD = fast_pyemd
 
 
 DEFAULT_VARIANT = Variants.PYEMD
@@ -27,6 +28,8 @@ def apply(lang1, lang2, variant=Variants.PYEMD, parameters=None):
     variants
         Variants of the algorithm, including:
             - Variants.PYEMD: pyemd based distance
+            - Variants.FAST_PYEMD: pyemd based distance, with the distances between the traces computed in batches
+            (optionally truncating the languages to their top-k variants, and in a pool of processes)
 
     Returns
     -------------
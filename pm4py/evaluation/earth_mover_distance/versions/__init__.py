@@ -1 +1 @@
-from pm4py.evaluation.earth_mover_distance.versions import pyemd
+from pm4py.evaluation.earth_mover_distance.versions import pyemd, fast_pyemd
@@ -0,0 +1,286 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from enum import Enum
+
+import numpy as np
+from pyemd import emd
+
+from pm4py.util import exec_utils
+
+
+class Parameters(Enum):
+    TOP_K = "top_k"
+    NUM_WORKERS = "num_workers"
+    BLOCK_SIZE = "block_size"
+
+
+# context of the worker processes computing the distance matrix (set by the initializer)
+__worker_context = {}
+
+
+def encode_language(lang, activity_codes):
+    """
+    Encodes the variants of a language as rows of a matrix of integer activity codes
+
+    Parameters
+    --------------
+    lang
+        List of variants (tuples of activities)
+    activity_codes
+        Dictionary associating to each activity its integer code
+
+    Returns
+    --------------
+    encoded
+        Matrix (one row per variant) of the activity codes, padded with -1
+    lengths
+        Lengths of the variants
+    """
+    lengths = np.array([len(x) for x in lang], dtype=np.int64)
+    encoded = np.full((len(lang), max(lengths) if len(lang) > 0 else 0), -1, dtype=np.int64)
+    for i, variant in enumerate(lang):
+        encoded[i, :len(variant)] = [activity_codes[act] for act in variant]
+    return encoded, lengths
+
+
+def batched_levenshtein(x, x_lengths, y, y_lengths):
+    """
+    Computes the Levenshtein distance between each variant of the first batch and each variant of the second batch.
+    The dynamic programming matrices of all the pairs are computed together, row by row, so that each NumPy operation
+    is done on all the pairs at once
+
+    Parameters
+    --------------
+    x
+        Encoded variants of the first batch (matrix padded with -1)
+    x_lengths
+        Lengths of the variants of the first batch
+    y
+        Encoded variants of the second batch (matrix padded with -1)
+    y_lengths
+        Lengths of the variants of the second batch
+
+    Returns
+    --------------
+    distances
+        Matrix of the Levenshtein distances
+    """
+    n, lx = x.shape
+    m, ly = y.shape
+    dtype = np.int16 if max(lx, ly) < np.iinfo(np.int16).max else np.int32
+    positions = np.arange(ly + 1, dtype=dtype).reshape((ly + 1, 1, 1))
+    # the axes of the rows of the dynamic programming matrices are (position in the second variant, pair)
+    prev = np.broadcast_to(positions, (ly + 1, n, m)).astype(dtype)
+    y_codes = y.T.reshape((ly, 1, m))
+    columns = np.arange(m)
+    distances = np.zeros((n, m), dtype=np.int64)
+    distances[x_lengths == 0] = y_lengths
+    for i in range(1, lx + 1):
+        substitution = prev[:-1] + (y_codes != x[:, i - 1].reshape((1, n, 1)))
+        curr = np.empty_like(prev)
+        curr[0] = i
+        np.minimum(prev[1:] + 1, substitution, out=curr[1:])
+        # insertions: each position depends on the previous one, but the pairs are processed together
+        for j in range(1, ly + 1):
+            np.minimum(curr[j], curr[j - 1] + 1, out=curr[j])
+        rows = np.nonzero(x_lengths == i)[0]
+        if len(rows) > 0:
+            distances[rows] = curr[y_lengths, :, columns].T[rows]
+        prev = curr
+    return distances
+
+
+def __normalized_distances(x, x_lengths, y, y_lengths, block_size):
+    """
+    Computes the normalized Levenshtein distances between the rows of x and the rows of y, in blocks
+    (the variants are sorted by length, so that the variants in a block are padded to similar lengths)
+    """
+    distances = np.zeros((len(x_lengths), len(y_lengths)))
+    x_order = np.argsort(x_lengths, kind="stable")
+    y_order = np.argsort(y_lengths, kind="stable")
+    for i in range(0, len(x_order), block_size):
+        rows = x_order[i:i + block_size]
+        rows_len = x_lengths[rows]
+        for j in range(0, len(y_order), block_size):
+            columns = y_order[j:j + block_size]
+            columns_len = y_lengths[columns]
+            block = batched_levenshtein(x[rows, :max(rows_len)], rows_len, y[columns, :max(columns_len)],
+                                        columns_len)
+            # the distance between two empty variants is zero
+            max_len = np.maximum(np.maximum.outer(rows_len, columns_len), 1)
+            distances[np.ix_(rows, columns)] = block / max_len
+    return distances
+
+
+def __initialize_worker(y, y_lengths, block_size):
+    """
+    Initializes a worker process computing the distance matrix
+    """
+    __worker_context["y"] = (y, y_lengths)
+    __worker_context["block_size"] = block_size
+
+
+def __distances_worker(chunk):
+    """
+    Computes the rows of the distance matrix for a chunk of variants of the first language
+    """
+    x, x_lengths = chunk
+    y, y_lengths = __worker_context["y"]
+    return __normalized_distances(x, x_lengths, y, y_lengths, __worker_context["block_size"])
+
+
+def get_distance_matrix(x, x_lengths, y, y_lengths, block_size=256, num_workers=1):
+    """
+    Computes the matrix of the normalized Levenshtein distances between two sets of encoded variants,
+    optionally splitting the rows between a pool of processes
+
+    Parameters
+    --------------
+    x
+        Encoded variants of the first set
+    x_lengths
+        Lengths of the variants of the first set
+    y
+        Encoded variants of the second set
+    y_lengths
+        Lengths of the variants of the second set
+    block_size
+        Number of variants of each set that are compared together
+    num_workers
+        Number of processes
+
+    Returns
+    --------------
+    distances
+        Matrix of the normalized distances
+    """
+    if num_workers <= 1 or len(x_lengths) <= block_size:
+        return __normalized_distances(x, x_lengths, y, y_lengths, block_size)
+    no_chunks = min(num_workers * 4, (len(x_lengths) + block_size - 1) // block_size)
+    # the rows are sorted by length and dealt round-robin, so that the chunks have a similar load
+    order = np.argsort(x_lengths, kind="stable")
+    chunks_rows = [order[c::no_chunks] for c in range(no_chunks)]
+    chunks = [(x[rows, :max(1, max(x_lengths[rows]))], x_lengths[rows]) for rows in chunks_rows]
+    distances = np.zeros((len(x_lengths), len(y_lengths)))
+    with ProcessPoolExecutor(max_workers=min(num_workers, no_chunks), initializer=__initialize_worker,
+                             initargs=(y, y_lengths, block_size)) as executor:
+        for rows, chunk_distances in zip(chunks_rows, executor.map(__distances_worker, chunks)):
+            distances[rows] = chunk_distances
+    return distances
+
+
+def truncate_language(lang, top_k):
+    """
+    Keeps the top-k variants of a language by probability, rescaling them to the total mass of the language
+
+    Parameters
+    --------------
+    lang
+        Language
+    top_k
+        Number of variants to keep
+
+    Returns
+    --------------
+    truncated_lang
+        Truncated language
+    removed_mass
+        Mass of the removed variants
+    """
+    if top_k is None or len(lang) <= top_k:
+        return lang, 0.0
+    total_mass = sum(lang.values())
+    kept = sorted(lang.items(), key=lambda x: (-x[1], x[0]))[:top_k]
+    kept_mass = sum(x[1] for x in kept)
+    if kept_mass <= 0:
+        return dict(kept), total_mass
+    return {x: y * total_mass / kept_mass for x, y in kept}, total_mass - kept_mass
+
+
+def apply_with_error_bound(lang1, lang2, parameters=None):
+    """
+    Calculates the EMD distance between the two stochastic languages (using the normalized Levenshtein distance
+    between the traces), along with an upper bound of the error introduced by the truncation of the languages.
+
+    Since the normalized distances are at most 1, replacing a language by its top-k variants (rescaled to the
+    same mass) moves it at most by the removed mass: the EMD of the truncated languages differs from the EMD
+    of the original languages at most by the sum of the masses removed from the two languages
+
+    Parameters
+    -------------
+    lang1
+        First language
+    lang2
+        Second language
+    parameters
+        Parameters of the algorithm, including:
+            - Parameters.TOP_K: (optional) number of variants (by probability) kept in each language
+            - Parameters.NUM_WORKERS: number of processes computing the rows of the distance matrix
+            (default: 1; None: number of CPUs)
+            - Parameters.BLOCK_SIZE: number of variants of each language that are compared together (default: 256)
+
+    Returns
+    ---------------
+    emd_dist
+        EMD distance
+    error_bound
+        Upper bound of the absolute error due to the truncation (0 if the languages are not truncated)
+    """
+    if parameters is None:
+        parameters = {}
+
+    top_k = exec_utils.get_param_value(Parameters.TOP_K, parameters, None)
+    num_workers = exec_utils.get_param_value(Parameters.NUM_WORKERS, parameters, 1)
+    if num_workers is None:
+        num_workers = os.cpu_count()
+    block_size = exec_utils.get_param_value(Parameters.BLOCK_SIZE, parameters, 256)
+
+    lang1, removed_mass1 = truncate_language(lang1, top_k)
+    lang2, removed_mass2 = truncate_language(lang2, top_k)
+
+    # each language should have the same keys, even if not present
+    variants = sorted(set(lang1).union(lang2))
+    first_histogram = np.array([float(lang1.get(x, 0.0)) for x in variants])
+    second_histogram = np.array([float(lang2.get(x, 0.0)) for x in variants])
+
+    activity_codes = {act: i for i, act in enumerate(sorted(set(y for x in variants for y in x)))}
+    encoded, lengths = encode_language(variants, activity_codes)
+
+    # no mass is moved from the variants that are not in the first language, or to the variants that are not
+    # in the second language, so only the distances between the two supports are computed
+    rows = np.nonzero(first_histogram > 0)[0]
+    columns = np.nonzero(second_histogram > 0)[0]
+    distance_matrix = np.zeros((len(variants), len(variants)))
+    distance_matrix[np.ix_(rows, columns)] = get_distance_matrix(encoded[rows], lengths[rows], encoded[columns],
+                                                                 lengths[columns], block_size=block_size,
+                                                                 num_workers=num_workers)
+
+    ret = emd(first_histogram, second_histogram, distance_matrix)
+
+    return ret, removed_mass1 + removed_mass2
+
+
+def apply(lang1, lang2, parameters=None):
+    """
+    Calculates the EMD distance between the two stochastic languages, computing the normalized Levenshtein
+    distances between the traces in batches on integer-encoded variants
+
+    Parameters
+    -------------
+    lang1
+        First language
+    lang2
+        Second language
+    parameters
+        Parameters of the algorithm, including:
+            - Parameters.TOP_K: (optional) number of variants (by probability) kept in each language
+            - Parameters.NUM_WORKERS: number of processes computing the rows of the distance matrix
+            (default: 1; None: number of CPUs)
+            - Parameters.BLOCK_SIZE: number of variants of each language that are compared together (default: 256)
+
+    Returns
+    ---------------
+    emd_dist
+        EMD distance
+    """
+    return apply_with_error_bound(lang1, lang2, parameters=parameters)[0]
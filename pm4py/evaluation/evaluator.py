@@ -1,13 +1,17 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
 import deprecation
 
 from pm4py import util as pmutil
-from pm4py.algo.conformance.tokenreplay.versions import token_replay
+from pm4py.algo.conformance.tokenreplay.versions import token_replay, compiled_token_replay
 from pm4py.evaluation.generalization.versions import token_based as generalization_token_based
-from pm4py.evaluation.precision.versions import etconformance_token as precision_token_based
+from pm4py.evaluation.precision import utils as precision_utils
 from pm4py.evaluation.replay_fitness.versions import token_replay as fitness_token_based
 from pm4py.evaluation.simplicity.versions import arc_degree as simplicity_arc_degree
 from pm4py.objects import log as log_lib
 from pm4py.objects.conversion.log import converter as log_conversion
+from pm4py.objects.petri.align_utils import get_visible_transitions_eventually_enabled_by_marking
 from pm4py.util import xes_constants as xes_util
 from pm4py.util import constants
 from enum import Enum
@@ -20,11 +24,107 @@ class Parameters(Enum):
     PARAM_PRECISION_WEIGHT = 'precision_weight'
     PARAM_SIMPLICITY_WEIGHT = 'simplicity_weight'
     PARAM_GENERALIZATION_WEIGHT = 'generalization_weight'
+    NUM_WORKERS = "num_workers"
+    TOKEN_REPLAY_CONTEXT = "token_replay_context"
+
+
+# context of the worker processes of the parallel replay (set by the initializer)
+__worker_context = {}
+
+
+def __replay_variant(cn, activities):
+    """
+    Replays a variant on the compiled net, recording the visible transitions enabled after each prefix
+
+    Returns
+    -------------
+    replay_result
+        Tuple (trace_is_fit, trace_fitness, indexes of the activated transitions, missing tokens, consumed tokens,
+        remaining tokens, produced tokens, labels of the visible transitions enabled after each proper prefix
+        (None for the prefixes that do not fit))
+    """
+    prefixes_enabled_transitions = []
+    is_fit, trace_fitness, act_trans, trans_probl, reached_marking, enabled_trans, missing, consumed, remaining, \
+        produced = compiled_token_replay.replay_trace(cn, activities,
+                                                      prefixes_enabled_transitions=prefixes_enabled_transitions)
+    trans_index = cn.trans_index
+    prefixes_enabled_labels = tuple(
+        None if enabled is None else frozenset(t.label for t in enabled if t.label is not None) for enabled in
+        prefixes_enabled_transitions)
+    return is_fit, trace_fitness, tuple(trans_index[t] for t in act_trans), missing, consumed, remaining, produced, \
+        prefixes_enabled_labels
+
+
+def __initialize_worker(cn):
+    """
+    Initializes a worker process of the parallel replay
+    """
+    __worker_context["compiled_net"] = cn
+
+
+def __replay_chunk_worker(chunk):
+    """
+    Replays a chunk of variants in a worker process of the parallel replay
+    """
+    cn = __worker_context["compiled_net"]
+    return [__replay_variant(cn, activities) for activities in chunk]
+
+
+def __replay_variants(cn, variants_activities, num_workers):
+    """
+    Replays the variants (lists of activities) once, sequentially or in a pool of processes
+    (the compiled net is sent once to each process, and the transitions come back by their index)
+    """
+    if num_workers <= 1 or len(variants_activities) <= 1:
+        return [__replay_variant(cn, activities) for activities in variants_activities]
+    num_workers = min(num_workers, len(variants_activities))
+    # more chunks than processes, so that the load is balanced
+    no_chunks = min(len(variants_activities), num_workers * 4)
+    chunks = [variants_activities[c::no_chunks] for c in range(no_chunks)]
+    replay_results = [None] * len(variants_activities)
+    with ProcessPoolExecutor(max_workers=num_workers, initializer=__initialize_worker, initargs=(cn,)) as executor:
+        for c, chunk_results in enumerate(executor.map(__replay_chunk_worker, chunks)):
+            for j, replay_result in enumerate(chunk_results):
+                replay_results[c + j * no_chunks] = replay_result
+    return replay_results
+
+
+def __get_precision(cn, initial_marking, variants_activities, variants_count, replay_results, no_traces):
+    """
+    Computes the ETConformance precision (as in etconformance_token) from the enabled transitions recorded
+    during the replay of the variants, instead of replaying each prefix of the log separately
+    """
+    start_activities = set(activities[0] for activities in variants_activities if activities)
+    trans_en_ini_marking = set(
+        [x.label for x in get_visible_transitions_eventually_enabled_by_marking(cn.net, initial_marking)])
+    diff = trans_en_ini_marking.difference(start_activities)
+    sum_at = no_traces * len(trans_en_ini_marking)
+    sum_ee = no_traces * len(diff)
+
+    trie = precision_utils.PrefixTrie()
+    enabled_labels = {}
+    for activities, count, replay_result in zip(variants_activities, variants_count, replay_results):
+        for node, labels in zip(trie.add_trace(activities, count=count), replay_result[7]):
+            enabled_labels[node] = labels
+
+    for node in range(1, len(trie)):
+        if enabled_labels[node] is not None:
+            sum_at += len(enabled_labels[node]) * trie.count[node]
+            sum_ee += len(enabled_labels[node].difference(trie.get_next_activities(node))) * trie.count[node]
+
+    precision = 1.0
+    if sum_at > 0:
+        precision = 1 - float(sum_ee) / float(sum_at)
+    return precision
 
 
 def apply(log, net, initial_marking, final_marking, parameters=None):
     """
-    Calculates all metrics based on token-based replay and returns a unified dictionary
+    Calculates all metrics based on token-based replay and returns a unified dictionary.
+
+    Each variant of the log is replayed once (on the compiled representation of the net), recording the
+    transitions enabled after each prefix: fitness, ETConformance precision and generalization are all
+    derived from this single replay
 
     Parameters
     -----------
@@ -37,7 +137,11 @@ def apply(log, net, initial_marking, final_marking, parameters=None):
     final_marking
         Final marking
     parameters
-        Parameters
+        Parameters, including:
+            Parameters.ACTIVITY_KEY -> activity key
+            Parameters.NUM_WORKERS -> number of processes replaying the variants (default: 1, sequential replay;
+            None: number of CPUs)
+            Parameters.TOKEN_REPLAY_CONTEXT -> (optional) TokenReplayContext bound to the net, reused across calls
 
     Returns
     -----------
@@ -54,6 +158,10 @@ def apply(log, net, initial_marking, final_marking, parameters=None):
     precision_weight = exec_utils.get_param_value(Parameters.PARAM_PRECISION_WEIGHT, parameters, 0.25)
     simplicity_weight = exec_utils.get_param_value(Parameters.PARAM_SIMPLICITY_WEIGHT, parameters, 0.25)
     generalization_weight = exec_utils.get_param_value(Parameters.PARAM_GENERALIZATION_WEIGHT, parameters, 0.25)
+    num_workers = exec_utils.get_param_value(Parameters.NUM_WORKERS, parameters, 1)
+    if num_workers is None:
+        num_workers = os.cpu_count()
+    context = exec_utils.get_param_value(Parameters.TOKEN_REPLAY_CONTEXT, parameters, None)
 
     sum_of_weights = (fitness_weight + precision_weight + simplicity_weight + generalization_weight)
     fitness_weight = fitness_weight / sum_of_weights
@@ -61,16 +169,24 @@ def apply(log, net, initial_marking, final_marking, parameters=None):
     simplicity_weight = simplicity_weight / sum_of_weights
     generalization_weight = generalization_weight / sum_of_weights
 
-    parameters_tr = {token_replay.Parameters.ACTIVITY_KEY: activity_key}
+    cn = compiled_token_replay.get_compiled_net(net, initial_marking, final_marking, context=context)
 
-    aligned_traces = token_replay.apply(log, net, initial_marking, final_marking, parameters=parameters_tr)
+    variants = token_replay.get_variants_from_log(log, activity_key)
+    variants_activities = [[x[activity_key] for x in traces[0]] for traces in variants.values()]
+    variants_count = [len(traces) for traces in variants.values()]
+    replay_results = __replay_variants(cn, variants_activities, num_workers)
 
-    parameters = {
-        token_replay.Parameters.ACTIVITY_KEY: activity_key
-    }
+    # the results of the replay of each variant are shared by the traces of the variant
+    aligned_traces = []
+    for count, replay_result in zip(variants_count, replay_results):
+        is_fit, trace_fitness, act_trans, missing, consumed, remaining, produced = replay_result[:7]
+        aligned_traces.extend([{"trace_is_fit": is_fit, "trace_fitness": trace_fitness,
+                                "activated_transitions": [cn.transitions[j] for j in act_trans],
+                                "missing_tokens": missing, "consumed_tokens": consumed,
+                                "remaining_tokens": remaining, "produced_tokens": produced}] * count)
 
     fitness = fitness_token_based.evaluate(aligned_traces)
-    precision = precision_token_based.apply(log, net, initial_marking, final_marking, parameters=parameters)
+    precision = __get_precision(cn, initial_marking, variants_activities, variants_count, replay_results, len(log))
     generalization = generalization_token_based.get_generalization(net, aligned_traces)
     simplicity = simplicity_arc_degree.apply(net)
 
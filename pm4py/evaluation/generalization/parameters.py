@@ -4,3 +4,4 @@ from pm4py.util import constants
 
 class Parameters(Enum):
     ACTIVITY_KEY = constants.PARAMETER_CONSTANT_ACTIVITY_KEY
+    TOKEN_REPLAY_CONTEXT = "token_replay_context"
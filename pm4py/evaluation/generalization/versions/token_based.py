@@ -81,7 +81,8 @@ def apply(log, petri_net, initial_marking, final_marking, parameters=None):
     final_marking
         Final marking
     parameters
-        Algorithm parameters
+        Algorithm parameters, including:
+            Parameters.TOKEN_REPLAY_CONTEXT -> (optional) TokenReplayContext bound to the net, reused across calls
 
     Returns
     -----------
@@ -92,7 +93,9 @@ def apply(log, petri_net, initial_marking, final_marking, parameters=None):
         parameters = {}
     activity_key = exec_utils.get_param_value(Parameters.ACTIVITY_KEY, parameters, pmutil.xes_constants.DEFAULT_NAME_KEY)
 
-    parameters_tr = {Parameters.ACTIVITY_KEY: activity_key}
+    token_replay_context = exec_utils.get_param_value(Parameters.TOKEN_REPLAY_CONTEXT, parameters, None)
+
+    parameters_tr = {Parameters.ACTIVITY_KEY: activity_key, Parameters.TOKEN_REPLAY_CONTEXT: token_replay_context}
 
     aligned_traces = token_replay.apply(log, petri_net, initial_marking, final_marking, parameters=parameters_tr)
 
@@ -86,6 +86,138 @@ def __search(sync_net, ini, fin, stop, cost_function, skip):
     return ret_markings
 
 
+class PrefixTrie(object):
+    """
+    Trie of the proper (non-empty) prefixes of the traces of a log. The activities are encoded by integer codes,
+    and each node of the trie is a prefix, identified by its index (the root, with index 0, is the empty prefix).
+    For each node, the trie stores the parent node, the code of the last activity of the prefix, the codes of the
+    activities following the prefix in the log and the number of occurrences of the prefix
+    """
+
+    def __init__(self):
+        self.activities = []
+        self.activity_codes = {}
+        self.parent = [-1]
+        self.activity = [-1]
+        self.children = [{}]
+        self.next_activities = [set()]
+        self.count = [0]
+
+    def __len__(self):
+        return len(self.parent)
+
+    def get_activity_code(self, activity):
+        """
+        Gets the code of an activity (assigning a new code if the activity has not been seen before)
+        """
+        code = self.activity_codes.get(activity)
+        if code is None:
+            code = len(self.activities)
+            self.activity_codes[activity] = code
+            self.activities.append(activity)
+        return code
+
+    def add_trace(self, activities, count=1):
+        """
+        Adds the proper prefixes of a trace to the trie
+
+        Parameters
+        -------------
+        activities
+            List of activities of the trace
+        count
+            Number of occurrences of the trace
+
+        Returns
+        -------------
+        nodes
+            Nodes of the prefixes of the trace (the i-th node is the prefix of length i + 1)
+        """
+        codes = [self.get_activity_code(act) for act in activities]
+        nodes = []
+        node = 0
+        for i in range(1, len(codes)):
+            child = self.children[node].get(codes[i - 1])
+            if child is None:
+                child = len(self.parent)
+                self.children[node][codes[i - 1]] = child
+                self.parent.append(node)
+                self.activity.append(codes[i - 1])
+                self.children.append({})
+                self.next_activities.append(set())
+                self.count.append(0)
+            node = child
+            self.next_activities[node].add(codes[i])
+            self.count[node] += count
+            nodes.append(node)
+        return nodes
+
+    def get_prefix(self, node):
+        """
+        Gets the list of activities of the prefix corresponding to a node
+        """
+        prefix = []
+        while node > 0:
+            prefix.append(self.activities[self.activity[node]])
+            node = self.parent[node]
+        prefix.reverse()
+        return prefix
+
+    def get_next_activities(self, node):
+        """
+        Gets the set of activities following the prefix corresponding to a node
+        """
+        return set(self.activities[code] for code in self.next_activities[node])
+
+
+def get_log_prefix_trie(log, activity_key=xes_util.DEFAULT_NAME_KEY):
+    """
+    Get the trie of the prefixes of the log (with the same prefixes, following activities and counts
+    as get_log_prefixes)
+
+    Parameters
+    ----------
+    log
+        Trace log
+    activity_key
+        Activity key (must be provided if different from concept:name)
+
+    Returns
+    ----------
+    trie
+        Prefix trie
+    """
+    trie = PrefixTrie()
+    variants = Counter(tuple(x[activity_key] for x in trace) for trace in log)
+    for activities, count in variants.items():
+        trie.add_trace(activities, count=count)
+    return trie
+
+
+def form_fake_log_from_trie(trie, nodes, activity_key=xes_util.DEFAULT_NAME_KEY):
+    """
+    Form fake log for replay, putting the prefix of each of the given nodes of the trie as separate trace
+
+    Parameters
+    ----------
+    trie
+        Prefix trie
+    nodes
+        Nodes of the trie (to form a log with a given order)
+    activity_key
+        Activity key (must be provided if different from concept:name)
+    """
+    fake_log = EventLog()
+    for node in nodes:
+        trace = Trace()
+        for activity in trie.get_prefix(node):
+            event = Event()
+            event[activity_key] = activity
+            trace.append(event)
+        fake_log.append(trace)
+    return fake_log
+
+
 def get_log_prefixes(log, activity_key=xes_util.DEFAULT_NAME_KEY):
     """
     Get log prefixes
@@ -1,3 +1,4 @@
+from pm4py.algo.conformance.alignments import cache as alignments_cache_module
 from pm4py.objects import log as log_lib
 from pm4py.evaluation.precision import utils as precision_utils
 from pm4py.objects import petri
@@ -8,6 +9,10 @@ from pm4py.evaluation.precision.parameters import Parameters
 from pm4py.util import exec_utils
 from pm4py.util import xes_constants
 
+# key (in the alignments cache) of the markings in which the alignments of the prefixes stop
+STOP_MARKINGS_CACHE_KEY = "align_etconformance_stop_markings"
+
+
 def apply(log, net, marking, final_marking, parameters=None):
     """
     Get Align-ET Conformance precision
@@ -25,6 +30,9 @@ def apply(log, net, marking, final_marking, parameters=None):
     parameters
         Parameters of the algorithm, including:
             Parameters.ACTIVITY_KEY -> Activity key
+            Parameters.ALIGNMENTS_CACHE -> (optional) path of the SQLite database of the alignments cache
+            (or :class:`pm4py.algo.conformance.alignments.cache.AlignmentsCache` object), in which the markings
+            reached by the alignments of the prefixes are looked up and stored
     """
 
     if parameters is None:
@@ -43,18 +51,18 @@ def apply(log, net, marking, final_marking, parameters=None):
     if not petri.check_soundness.check_relaxed_soundness_net_in_fin_marking(net, marking, final_marking):
         raise Exception("trying to apply Align-ETConformance on a Petri net that is not a relaxed sound net!!")
 
-    prefixes, prefix_count = precision_utils.get_log_prefixes(log, activity_key=activity_key)
-    prefixes_keys = list(prefixes.keys())
-    fake_log = precision_utils.form_fake_log(prefixes_keys, activity_key=activity_key)
+    trie = precision_utils.get_log_prefix_trie(log, activity_key=activity_key)
+    nodes = list(range(1, len(trie)))
+    fake_log = precision_utils.form_fake_log_from_trie(trie, nodes, activity_key=activity_key)
 
     align_stop_marking = align_fake_log_stop_marking(fake_log, net, marking, final_marking, parameters=parameters)
     all_markings = transform_markings_from_sync_to_original_net(align_stop_marking, net, parameters=parameters)
 
-    for i in range(len(prefixes)):
+    for i, node in enumerate(nodes):
         markings = all_markings[i]
 
         if markings is not None:
-            log_transitions = set(prefixes[prefixes_keys[i]])
+            log_transitions = trie.get_next_activities(node)
             activated_transitions_labels = set()
             for m in markings:
                 # add to the set of activated transitions in the model the activated transitions
@@ -64,17 +72,17 @@ def apply(log, net, marking, final_marking, parameters=None):
                     x.label is not None)
             escaping_edges = activated_transitions_labels.difference(log_transitions)
 
-            sum_at += len(activated_transitions_labels) * prefix_count[prefixes_keys[i]]
-            sum_ee += len(escaping_edges) * prefix_count[prefixes_keys[i]]
+            sum_at += len(activated_transitions_labels) * trie.count[node]
+            sum_ee += len(escaping_edges) * trie.count[node]
 
             if debug_level > 1:
                 print("")
-                print("prefix=", prefixes_keys[i])
+                print("prefix=", ",".join(trie.get_prefix(node)))
                 print("log_transitions=", log_transitions)
                 print("activated_transitions=", activated_transitions_labels)
                 print("escaping_edges=", escaping_edges)
         else:
-            unfit += prefix_count[prefixes_keys[i]]
+            unfit += trie.count[node]
 
     if debug_level > 0:
         print("\n")
@@ -163,7 +171,8 @@ def align_fake_log_stop_marking(fake_log, net, marking, final_marking, parameter
     final_marking
         Final marking
     parameters
-        Parameters of the algorithm
+        Parameters of the algorithm, including:
+            Parameters.ALIGNMENTS_CACHE -> (optional) alignments cache
 
     Returns
     -------------
@@ -172,6 +181,37 @@ def align_fake_log_stop_marking(fake_log, net, marking, final_marking, parameter
     """
     if parameters is None:
         parameters = {}
+
+    alignments_cache = exec_utils.get_param_value(Parameters.ALIGNMENTS_CACHE, parameters, None)
+    if alignments_cache is None:
+        return __align_fake_log_stop_marking(fake_log, net, marking, final_marking, parameters=parameters)
+
+    activity_key = exec_utils.get_param_value(Parameters.ACTIVITY_KEY, parameters, xes_constants.DEFAULT_NAME_KEY)
+    model_key = alignments_cache_module.get_model_fingerprint(net, marking, final_marking)
+    if model_key is None:
+        # the net cannot be identified (repeated names): the cache is not used
+        return __align_fake_log_stop_marking(fake_log, net, marking, final_marking, parameters=parameters)
+
+    alignments_cache, opened_cache = alignments_cache_module.get_cache(alignments_cache)
+    try:
+        activities = [tuple(x[activity_key] for x in trace if activity_key in x) for trace in fake_log]
+        cached = alignments_cache.get(model_key, STOP_MARKINGS_CACHE_KEY, activities)
+        to_align = [i for i in range(len(fake_log)) if activities[i] not in cached]
+        new_results = __align_fake_log_stop_marking([fake_log[i] for i in to_align], net, marking, final_marking,
+                                                    parameters=parameters)
+        alignments_cache.put(model_key, STOP_MARKINGS_CACHE_KEY,
+                             {activities[i]: res for i, res in zip(to_align, new_results)})
+    finally:
+        if opened_cache:
+            alignments_cache.close()
+    cached.update((activities[i], res) for i, res in zip(to_align, new_results))
+    return [cached[act] for act in activities]
+
+
+def __align_fake_log_stop_marking(fake_log, net, marking, final_marking, parameters=None):
+    """
+    Align the prefixes (without looking up the alignments cache), getting the markings in which the alignments stop
+    """
     align_result = []
     for i in range(len(fake_log)):
         trace = fake_log[i]
@@ -1,4 +1,4 @@
-from pm4py.algo.conformance.tokenreplay.versions import token_replay
+from pm4py.algo.conformance.tokenreplay.versions import token_replay, compiled_token_replay
 from pm4py.algo.conformance.tokenreplay import algorithm as executor
 
 from pm4py.objects import log as log_lib
@@ -20,6 +20,9 @@ For each prefix in the log, the reflected tasks are calculated (outgoing attribu
 Then, a token replay is done on the prefix in order to get activated transitions
 Escaping edges is the set difference between activated transitions and reflected tasks
 
+The prefixes are stored in a trie, that is visited depth-first: the marking reached by each prefix is obtained
+by replaying one event from the marking reached by its parent, instead of replaying each prefix from scratch
+
 Then, precision is calculated by the formula used in the paper
 
 At the moment, the precision value is different from the one provided by the ProM plug-in,
@@ -27,6 +30,38 @@ although the implementation seems to follow the paper concept
 """
 
 
+def __replay_prefix_trie(trie, cn):
+    """
+    Replays the prefixes of the trie on the compiled net, extending the marking reached by the parent of each
+    node by one event
+
+    Parameters
+    -------------
+    trie
+        Prefix trie
+    cn
+        Compiled net
+
+    Returns
+    -------------
+    enabled_labels
+        Dictionary associating to each node of a prefix that fits the labels of the visible transitions
+        eventually enabled by the reached marking (the prefixes that do not fit are not contained)
+    """
+    enabled_labels = {}
+    initial_marking = compiled_token_replay.MarkingVector(cn)
+    stack = [(child, initial_marking) for child in trie.children[0].values()]
+    while stack:
+        node, parent_marking = stack.pop()
+        marking = parent_marking.copy()
+        if compiled_token_replay.replay_activity(cn, marking, trie.activities[trie.activity[node]]):
+            enabled_labels[node] = set(x.label for x in compiled_token_replay.__get_enabled_transitions(cn, marking)
+                                       if x.label is not None)
+            # the descendants of a prefix that does not fit do not fit as well
+            stack.extend((child, marking) for child in trie.children[node].values())
+    return enabled_labels
+
+
 def apply(log, net, marking, final_marking, parameters=None):
     """
     Get ET Conformance precision
@@ -44,6 +79,10 @@ def apply(log, net, marking, final_marking, parameters=None):
     parameters
         Parameters of the algorithm, including:
             Parameters.ACTIVITY_KEY -> Activity key
+            Parameters.TOKEN_REPLAY_CONTEXT -> (optional) TokenReplayContext bound to the net, reused across calls
+            Parameters.TOKEN_REPLAY_VARIANT -> variant of the token-based replay. The prefixes are replayed
+            incrementally for the token-based replay and the compiled token-based replay (without cleaning of
+            the token flood), otherwise each prefix is replayed separately
     """
 
     if parameters is None:
@@ -53,6 +92,7 @@ def apply(log, net, marking, final_marking, parameters=None):
     token_replay_variant = exec_utils.get_param_value(Parameters.TOKEN_REPLAY_VARIANT, parameters,
                                                       executor.Variants.TOKEN_REPLAY)
     activity_key = exec_utils.get_param_value(Parameters.ACTIVITY_KEY, parameters, log_lib.util.xes.DEFAULT_NAME_KEY)
+    token_replay_context = exec_utils.get_param_value(Parameters.TOKEN_REPLAY_CONTEXT, parameters, None)
     # default value for precision, when no activated transitions (not even by looking at the initial marking) are found
     precision = 1.0
     sum_ee = 0
@@ -64,15 +104,24 @@ def apply(log, net, marking, final_marking, parameters=None):
         token_replay.Parameters.STOP_IMMEDIATELY_UNFIT: True,
         token_replay.Parameters.WALK_THROUGH_HIDDEN_TRANS: True,
         token_replay.Parameters.CLEANING_TOKEN_FLOOD: cleaning_token_flood,
-        token_replay.Parameters.ACTIVITY_KEY: activity_key
+        token_replay.Parameters.ACTIVITY_KEY: activity_key,
+        token_replay.Parameters.TOKEN_REPLAY_CONTEXT: token_replay_context
     }
 
-    prefixes, prefix_count = precision_utils.get_log_prefixes(log, activity_key=activity_key)
-    prefixes_keys = list(prefixes.keys())
-    fake_log = precision_utils.form_fake_log(prefixes_keys, activity_key=activity_key)
-
-    aligned_traces = executor.apply(fake_log, net, marking, final_marking, variant=token_replay_variant,
+    trie = precision_utils.get_log_prefix_trie(log, activity_key=activity_key)
+    if token_replay_variant in [token_replay, compiled_token_replay] and not cleaning_token_flood:
+        cn = compiled_token_replay.get_compiled_net(net, marking, final_marking, context=token_replay_context)
+        enabled_labels = __replay_prefix_trie(trie, cn)
+    else:
+        nodes = list(range(1, len(trie)))
+        fake_log = precision_utils.form_fake_log_from_trie(trie, nodes, activity_key=activity_key)
+        aligned_traces = executor.apply(fake_log, net, marking, final_marking, variant=token_replay_variant,
                                         parameters=parameters_tr)
+        enabled_labels = {}
+        for node, aligned_trace in zip(nodes, aligned_traces):
+            if aligned_trace["trace_is_fit"]:
+                enabled_labels[node] = set(
+                    [x.label for x in aligned_trace["enabled_transitions_in_marking"] if x.label is not None])
 
     # fix: also the empty prefix should be counted!
     start_activities = set(get_start_activities(log, parameters=parameters))
@@ -82,14 +131,11 @@ def apply(log, net, marking, final_marking, parameters=None):
     sum_ee += len(log) * len(diff)
     # end fix
 
-    for i in range(len(aligned_traces)):
-        if aligned_traces[i]["trace_is_fit"]:
-            log_transitions = set(prefixes[prefixes_keys[i]])
-            activated_transitions_labels = set(
-                [x.label for x in aligned_traces[i]["enabled_transitions_in_marking"] if x.label is not None])
-            sum_at += len(activated_transitions_labels) * prefix_count[prefixes_keys[i]]
-            escaping_edges = activated_transitions_labels.difference(log_transitions)
-            sum_ee += len(escaping_edges) * prefix_count[prefixes_keys[i]]
+    for node, activated_transitions_labels in enabled_labels.items():
+        log_transitions = trie.get_next_activities(node)
+        sum_at += len(activated_transitions_labels) * trie.count[node]
+        escaping_edges = activated_transitions_labels.difference(log_transitions)
+        sum_ee += len(escaping_edges) * trie.count[node]
 
     if sum_at > 0:
         precision = 1 - float(sum_ee) / float(sum_at)
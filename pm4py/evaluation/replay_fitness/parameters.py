@@ -8,3 +8,5 @@ class Parameters(Enum):
     ATTRIBUTE_KEY = constants.PARAMETER_CONSTANT_ATTRIBUTE_KEY
     TOKEN_REPLAY_VARIANT = "token_replay_variant"
     CLEANING_TOKEN_FLOOD = "cleaning_token_flood"
+    ALIGNMENTS_CACHE = "alignments_cache"
+    TOKEN_REPLAY_CONTEXT = "token_replay_context"
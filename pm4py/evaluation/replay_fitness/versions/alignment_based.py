@@ -61,7 +61,9 @@ def apply(log, petri_net, initial_marking, final_marking, align_variant=alignmen
     align_variant
         Variants of the alignments to apply
     parameters
-        Parameters of the algorithm
+        Parameters of the algorithm, including:
+            Parameters.ALIGNMENTS_CACHE -> (optional) path of the SQLite database of the alignments cache
+            (or :class:`pm4py.algo.conformance.alignments.cache.AlignmentsCache` object), provided to the alignments
 
     Returns
     ---------------
@@ -56,7 +56,8 @@ def apply(log, petri_net, initial_marking, final_marking, parameters=None):
     final_marking
         Final marking
     parameters
-        Parameters
+        Parameters, including:
+            Parameters.TOKEN_REPLAY_CONTEXT -> (optional) TokenReplayContext bound to the net, reused across calls
 
     Returns
     -----------
@@ -70,10 +71,12 @@ def apply(log, petri_net, initial_marking, final_marking, parameters=None):
     token_replay_variant = exec_utils.get_param_value(Parameters.TOKEN_REPLAY_VARIANT, parameters,
                                                       executor.Variants.TOKEN_REPLAY)
     cleaning_token_flood = exec_utils.get_param_value(Parameters.CLEANING_TOKEN_FLOOD, parameters, False)
+    token_replay_context = exec_utils.get_param_value(Parameters.TOKEN_REPLAY_CONTEXT, parameters, None)
 
     parameters_tr = {token_replay.Parameters.ACTIVITY_KEY: activity_key,
                      token_replay.Parameters.CONSIDER_REMAINING_IN_FITNESS: True,
-                     token_replay.Parameters.CLEANING_TOKEN_FLOOD: cleaning_token_flood}
+                     token_replay.Parameters.CLEANING_TOKEN_FLOOD: cleaning_token_flood,
+                     token_replay.Parameters.TOKEN_REPLAY_CONTEXT: token_replay_context}
 
     aligned_traces = executor.apply(log, petri_net, initial_marking, final_marking, variant=token_replay_variant,
                                         parameters=parameters_tr)
@@ -1 +1 @@
-from pm4py.objects.conversion.log.variants import to_data_frame, to_event_stream, to_event_log
+from pm4py.objects.conversion.log.variants import to_data_frame, to_event_stream, to_event_log, to_columnar_log
@@ -0,0 +1,150 @@
+from enum import Enum
+
+import numpy as np
+import pandas
+
+from pm4py.objects.conversion.log.variants import to_event_log
+from pm4py.objects.log import columnar
+from pm4py.objects.log.log import EventLog, EventStream
+from pm4py.util import xes_constants as xes
+
+
+class Parameters(Enum):
+    CASE_ID_KEY = 'case:concept:name'
+    CASE_ATTRIBUTE_PREFIX = 'case:'
+
+
+def apply(log, parameters=None):
+    """
+    Converts a log object (event log, event stream or Pandas dataframe) into a columnar event log.
+    The traces follow the order of the original log (for dataframes/streams, the order of appearance of the cases)
+
+    Parameters
+    -----------
+    log
+        Event log object, can either be an EventLog object, EventStream Object or Pandas dataframe
+    parameters
+        Parameters of the algorithm, including:
+            Parameters.CASE_ID_KEY -> Case identifier (for dataframes and event streams)
+            Parameters.CASE_ATTRIBUTE_PREFIX -> Prefix of the case attributes (for dataframes and event streams)
+
+    Returns
+    -----------
+    log : :class:`pm4py.objects.log.columnar.ColumnarEventLog`
+        Columnar event log
+    """
+    if parameters is None:
+        parameters = dict()
+    case_glue = parameters[Parameters.CASE_ID_KEY] if Parameters.CASE_ID_KEY in parameters \
+        else Parameters.CASE_ID_KEY.value
+    case_pref = parameters[Parameters.CASE_ATTRIBUTE_PREFIX] if Parameters.CASE_ATTRIBUTE_PREFIX in parameters \
+        else Parameters.CASE_ATTRIBUTE_PREFIX.value
+
+    if isinstance(log, columnar.ColumnarEventLog):
+        return log
+    if isinstance(log, pandas.core.frame.DataFrame):
+        return __transform_dataframe_to_columnar_log(log, case_glue=case_glue, case_attribute_prefix=case_pref)
+    if isinstance(log, EventStream) and not isinstance(log, EventLog):
+        log = to_event_log.apply(log, parameters={to_event_log.Parameters.CASE_ID_KEY: case_glue,
+                                                  to_event_log.Parameters.CASE_ATTRIBUTE_PREFIX: case_pref})
+    return __transform_event_log_to_columnar_log(log)
+
+
+def __transform_event_log_to_columnar_log(log):
+    """
+    Converts an event log into a columnar event log
+
+    Parameters
+    ----------
+    log: :class:`pm4py.log.log.EventLog`
+        Event log
+
+    Returns
+    -------
+    log : :class:`pm4py.objects.log.columnar.ColumnarEventLog`
+        Columnar event log
+    """
+    case_offsets = [0]
+    trace_attributes = []
+    positions = {}
+    values = {}
+    n = 0
+    for trace in log:
+        for event in trace:
+            for key, value in event.items():
+                if key not in positions:
+                    positions[key] = []
+                    values[key] = []
+                positions[key].append(n)
+                values[key].append(value)
+            n += 1
+        case_offsets.append(n)
+        trace_attributes.append(trace.attributes)
+
+    columns = {}
+    for key in positions:
+        column_values = [columnar.NOT_PRESENT] * n
+        for position, value in zip(positions[key], values[key]):
+            column_values[position] = value
+        columns[key] = columnar.build_column(column_values)
+
+    return columnar.ColumnarEventLog(case_offsets, columns, trace_attributes=trace_attributes,
+                                     attributes=log.attributes, extensions=log.extensions,
+                                     omni_present=log.omni_present, classifiers=log.classifiers)
+
+
+def __transform_dataframe_to_columnar_log(df, case_glue=Parameters.CASE_ID_KEY.value,
+                                          case_attribute_prefix=Parameters.CASE_ATTRIBUTE_PREFIX.value):
+    """
+    Converts a dataframe into a columnar event log, working on the columns of the dataframe
+
+    Parameters
+    ----------
+    df
+        Pandas dataframe
+    case_glue
+        Case identifier
+    case_attribute_prefix
+        Prefix of the case attributes
+
+    Returns
+    -------
+    log : :class:`pm4py.objects.log.columnar.ColumnarEventLog`
+        Columnar event log
+    """
+    case_codes, cases = pandas.factorize(df[case_glue])
+    # groups the events by case (in the order of appearance of the cases), keeping the order of the events
+    order = np.argsort(case_codes, kind="stable")
+    order = order[case_codes[order] != -1]
+    case_offsets = np.concatenate([[0], np.cumsum(np.bincount(case_codes[order], minlength=len(cases)))])
+    first_rows = order[case_offsets[:-1]]
+
+    trace_attributes = [{} for i in range(len(cases))]
+    for col in df.columns:
+        if col.startswith(case_attribute_prefix):
+            key = col.replace(case_attribute_prefix, '')
+            series = df[col]
+            not_null = series.notnull().values
+            for i, value in enumerate(series.iloc[first_rows].tolist()):
+                if not_null[first_rows[i]]:
+                    trace_attributes[i][key] = value
+    for i in range(len(cases)):
+        if xes.DEFAULT_TRACEID_KEY not in trace_attributes[i]:
+            trace_attributes[i][xes.DEFAULT_TRACEID_KEY] = cases[i]
+
+    columns = {}
+    for col in df.columns:
+        if col.startswith(case_attribute_prefix):
+            continue
+        series = df[col].iloc[order]
+        if pandas.api.types.is_datetime64_any_dtype(series):
+            not_null = series.notnull().values
+            values = series.values.astype("datetime64[us]").astype(np.int64)
+            values[~not_null] = columnar.MISSING_TIMESTAMP
+            columns[col] = columnar.TimestampColumn(values, series.dt.tz)
+        else:
+            codes, uniques = pandas.factorize(series)
+            columns[col] = columnar.DictionaryColumn(codes.astype(np.int32), list(uniques.tolist()))
+
+    return columnar.ColumnarEventLog(case_offsets, columns, trace_attributes=trace_attributes,
+                                     attributes={'origin': 'csv'})
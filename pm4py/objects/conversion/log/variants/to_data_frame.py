@@ -44,7 +44,7 @@ def apply(log, parameters=None):
         parameters = dict()
     if isinstance(log, pd.core.frame.DataFrame):
         return log
-    if type(log) is log_instance.EventLog:
+    if isinstance(log, log_instance.EventLog):
         log = to_event_stream.apply(log, parameters=__parse_params(parameters))
     transf_log = [dict(x) for x in log]
     df = pd.DataFrame.from_dict(transf_log)
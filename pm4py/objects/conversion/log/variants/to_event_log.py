@@ -2,6 +2,7 @@ from copy import copy
 from copy import deepcopy
 from enum import Enum
 
+import numpy as np
 import pandas
 
 import pm4py
@@ -50,6 +51,15 @@ def __generate_to_stream_parameters(parameters):
 def apply(log, parameters=None):
     parameters = dict() if parameters is None else __parse_parameters(parameters)
     if isinstance(log, pandas.core.frame.DataFrame):
+        glue = parameters[
+            Parameters.CASE_ID_KEY] if Parameters.CASE_ID_KEY in parameters else Parameters.CASE_ID_KEY.value
+        if glue in log.columns and not log[glue].isnull().any():
+            case_pref = parameters[
+                Parameters.CASE_ATTRIBUTE_PREFIX] if Parameters.CASE_ATTRIBUTE_PREFIX in parameters else Parameters.CASE_ATTRIBUTE_PREFIX.value
+            stream_post_processing = parameters[
+                Parameters.STREAM_POST_PROCESSING] if Parameters.STREAM_POST_PROCESSING in parameters else False
+            return __transform_dataframe_to_event_log(log, case_glue=glue, case_attribute_prefix=case_pref,
+                                                      stream_post_processing=stream_post_processing)
         log = to_event_stream.apply(log, parameters=__generate_to_stream_parameters(parameters))
     if isinstance(log, pm4py.objects.log.log.EventStream) and (not isinstance(log, pm4py.objects.log.log.EventLog)):
         glue = parameters[
@@ -112,3 +122,86 @@ def __transform_event_stream_to_event_log(log, case_glue=Parameters.CASE_ID_KEY.
         traces[glue].append(event)
     return log_instance.EventLog(traces.values(), attributes=log.attributes, classifiers=log.classifiers,
                                  omni_present=log.omni_present, extensions=log.extensions)
+
+
+def __postprocess_records(records):
+    """
+    Removes the NaN/NaT values from the records of a dataframe
+    """
+    for record in records:
+        for k in [k for k, v in record.items() if v is pandas.NaT or (type(v) is float and v != v)]:
+            del record[k]
+    return records
+
+
+def __to_records(df):
+    """
+    Gets the rows of a dataframe as dictionaries (as the 'records' orientation of DataFrame.to_dict),
+    converting the values column by column
+    """
+    columns = list(df.columns)
+    if not columns:
+        return [{} for i in range(len(df))]
+    values = [df[col].tolist() for col in columns]
+    return [dict(zip(columns, row)) for row in zip(*values)]
+
+
+def __transform_dataframe_to_event_log(df, case_glue=Parameters.CASE_ID_KEY.value,
+                                       case_attribute_prefix=Parameters.CASE_ATTRIBUTE_PREFIX.value,
+                                       stream_post_processing=False):
+    """
+    Converts a dataframe to an event log, without passing through an event stream.
+    The events are grouped by case working on the factorized case identifiers; the traces follow the order
+    of the first appearance of the cases, and the events keep the order of the rows of the dataframe
+    (as in the conversion of the corresponding event stream)
+
+    Parameters
+    ----------
+    df
+        Pandas dataframe
+    case_glue:
+        Case identifier. Default is 'case:concept:name'
+    case_attribute_prefix:
+        Default is 'case:'
+    stream_post_processing
+        Removes the NaN/NaT values from the events and the traces
+
+    Returns
+        -------
+    log : :class:`pm4py.log.log.EventLog`
+        An event log
+    """
+    case_codes, cases = pandas.factorize(df[case_glue])
+    case_offsets = np.concatenate([[0], np.cumsum(np.bincount(case_codes, minlength=len(cases)))])
+    if np.all(case_codes[1:] >= case_codes[:-1]):
+        # the rows are already grouped by case
+        order = None
+        first_rows = case_offsets[:-1]
+    else:
+        order = np.argsort(case_codes, kind="stable")
+        first_rows = order[case_offsets[:-1]]
+
+    case_columns = [col for col in df.columns if col.startswith(case_attribute_prefix)]
+    event_columns = [col for col in df.columns if not col.startswith(case_attribute_prefix)]
+
+    events_df = df[event_columns]
+    if order is not None:
+        events_df = events_df.iloc[order]
+    events = __to_records(events_df)
+    case_records = __to_records(df[case_columns].iloc[first_rows])
+    if stream_post_processing:
+        events = __postprocess_records(events)
+        case_records = __postprocess_records(case_records)
+    # the dictionaries of the records are fresh, hence they are adopted without copying them
+    for i in range(len(events)):
+        events[i] = log_instance.Event.from_dict(events[i])
+
+    cases = cases.tolist()
+    case_offsets = case_offsets.tolist()
+    traces = []
+    for i in range(len(cases)):
+        trace_attr = {k.replace(case_attribute_prefix, ''): v for k, v in case_records[i].items()}
+        if xes.DEFAULT_TRACEID_KEY not in trace_attr:
+            trace_attr[xes.DEFAULT_TRACEID_KEY] = cases[i]
+        traces.append(log_instance.Trace.from_list(events[case_offsets[i]:case_offsets[i + 1]], attributes=trace_attr))
+    return log_instance.EventLog.from_list(traces, attributes={'origin': 'csv'})
@@ -82,9 +82,10 @@ def apply(log, parameters=None):
         list_events = log.to_dict('records')
         if Parameters.STREAM_POST_PROCESSING in parameters and parameters[Parameters.STREAM_POST_PROCESSING]:
             list_events = __postprocess_stream(list_events)
+        # the dictionaries of the records are fresh, hence they are adopted without copying them
         for i in range(len(list_events)):
-            list_events[i] = Event(list_events[i])
-        log = log_instance.EventStream(list_events, attributes={'origin': 'csv'})
+            list_events[i] = Event.from_dict(list_events[i])
+        log = log_instance.EventStream.from_list(list_events, attributes={'origin': 'csv'})
     if isinstance(log, EventLog):
         case_pref = parameters[
             Parameters.CASE_ATTRIBUTE_PREFIX] if Parameters.CASE_ATTRIBUTE_PREFIX in parameters else Parameters.CASE_ATTRIBUTE_PREFIX.value
@@ -3,7 +3,9 @@ from collections import Counter
 from pm4py.util import xes_constants as xes_util
 from statistics import mean, median, stdev
 from pm4py.util import constants, exec_utils
+from pm4py.objects.log.columnar import ColumnarEventLog, MISSING_CODE
 from enum import Enum
+import numpy as np
 
 
 class Parameters(Enum):
@@ -47,7 +49,7 @@ def native(log, parameters=None):
     Parameters
     ----------
     log
-        Trace log
+        Trace log (or iterable of traces)
     parameters
         Possible parameters passed to the algorithms:
             activity_key -> Attribute to use as activity
@@ -61,8 +63,48 @@ def native(log, parameters=None):
         parameters = {}
     activity_key = exec_utils.get_param_value(Parameters.ACTIVITY_KEY, parameters, xes_util.DEFAULT_NAME_KEY)
     window = exec_utils.get_param_value(Parameters.WINDOW, parameters, 1)
-    dfgs = map((lambda t: [(t[i - window][activity_key], t[i][activity_key]) for i in range(window, len(t))]), log)
-    return Counter([dfg for lista in dfgs for dfg in lista])
+    if isinstance(log, ColumnarEventLog):
+        codes, vocabulary = log.get_codes(activity_key)
+        if codes is not None:
+            return __native_columnar(log, codes, vocabulary, window)
+    # the counter is updated trace by trace, so the log can also be an iterator of traces
+    dfg = Counter()
+    for t in log:
+        dfg.update((t[i - window][activity_key], t[i][activity_key]) for i in range(window, len(t)))
+    return dfg
+
+
+def __native_columnar(log, codes, vocabulary, window):
+    """
+    Counts the directly follows occurrences reading the activity codes of a columnar log
+
+    Parameters
+    ----------
+    log
+        Columnar log
+    codes
+        Activity codes of the events
+    vocabulary
+        Activities
+    window
+        Window
+
+    Returns
+    -------
+    dfg
+        DFG graph
+    """
+    dfg = Counter()
+    if len(codes) <= window:
+        return dfg
+    case_index = log.get_case_index()
+    source = codes[:-window].astype(np.int64)
+    target = codes[window:].astype(np.int64)
+    mask = (case_index[:-window] == case_index[window:]) & (source != MISSING_CODE) & (target != MISSING_CODE)
+    pairs, counts = np.unique(source[mask] * len(vocabulary) + target[mask], return_counts=True)
+    for pair, count in zip(pairs.tolist(), counts.tolist()):
+        dfg[(vocabulary[pair // len(vocabulary)], vocabulary[pair % len(vocabulary)])] = count
+    return dfg
 
 
 def performance(log, parameters=None):
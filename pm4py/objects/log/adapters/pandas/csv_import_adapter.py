@@ -5,6 +5,7 @@ import pandas as pd
 
 from pm4py.objects.conversion.log import factory as log_conversion
 from pm4py.util.versions import check_pandas_ge_024
+from pm4py.util.dt_parsing import vectorized as dt_vectorized
 
 
 def import_dataframe_from_path_wo_timeconversion(path, sep=',', quotechar=None, nrows=None, encoding=None):
@@ -130,16 +131,7 @@ def convert_timestamp_columns_in_df(df, timest_format=None, timest_columns=None)
         if timest_columns is None or col in timest_columns:
             if df[col].dtype == 'object':
                 try:
-                    if timest_format is None:
-                        if needs_conversion:
-                            df[col] = pd.to_datetime(df[col], utc=True)
-                        else:
-                            df[col] = pd.to_datetime(df[col])
-                    else:
-                        if needs_conversion:
-                            df[col] = pd.to_datetime(df[col], utc=True, format=timest_format)
-                        else:
-                            df[col] = pd.to_datetime(df[col])
+                    df[col] = dt_vectorized.apply(df[col], timest_format=timest_format, utc=needs_conversion)
                 except ValueError:
                     # print("exception converting column: "+str(col))
                     pass
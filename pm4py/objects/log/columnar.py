@@ -0,0 +1,421 @@
+import copy
+import datetime
+from collections.abc import Mapping, Sequence
+
+import numpy as np
+
+from pm4py.objects.log.log import EventLog, Trace, Event
+
+# code of the events that do not have a value for the attribute
+MISSING_CODE = -1
+# value of the timestamp columns for the events that do not have a value for the attribute
+MISSING_TIMESTAMP = np.iinfo(np.int64).min
+
+
+class _NotPresent(object):
+    def __repr__(self):
+        return "NOT_PRESENT"
+
+    def __reduce__(self):
+        # unpickled as the module singleton
+        return "NOT_PRESENT"
+
+
+# value of the object columns (and of the lists passed to build_column) for the events that do not have the attribute
+NOT_PRESENT = _NotPresent()
+
+_EPOCH = datetime.datetime(1970, 1, 1)
+_EPOCH_UTC = datetime.datetime(1970, 1, 1, tzinfo=datetime.timezone.utc)
+
+
+class DictionaryColumn(object):
+    """
+    Column storing, for each event, the code of its value in the vocabulary of the column
+    (MISSING_CODE if the event does not have the attribute)
+    """
+
+    def __init__(self, codes, vocabulary):
+        self.codes = codes
+        self.vocabulary = vocabulary
+        self._index = None
+
+    def contains(self, i):
+        return self.codes[i] != MISSING_CODE
+
+    def get(self, i):
+        code = self.codes[i]
+        if code == MISSING_CODE:
+            raise KeyError(i)
+        return self.vocabulary[code]
+
+    def set(self, i, value):
+        try:
+            key = (type(value), value)
+            if self._index is None:
+                self._index = {(type(v), v): c for c, v in enumerate(self.vocabulary)}
+            if key not in self._index:
+                self._index[key] = len(self.vocabulary)
+                self.vocabulary.append(value)
+        except TypeError:
+            # unhashable value
+            return False
+        if not self.codes.flags.writeable:
+            self.codes = np.array(self.codes)
+        self.codes[i] = self._index[key]
+        return True
+
+    def delete(self, i):
+        if not self.codes.flags.writeable:
+            self.codes = np.array(self.codes)
+        self.codes[i] = MISSING_CODE
+
+    def to_object_column(self):
+        values = np.empty(len(self.codes), dtype=object)
+        values[:] = NOT_PRESENT
+        present = np.nonzero(self.codes != MISSING_CODE)[0]
+        for i in present:
+            values[i] = self.vocabulary[self.codes[i]]
+        return ObjectColumn(values)
+
+
+class TimestampColumn(object):
+    """
+    Column storing, for each event, its timestamp as microseconds from the epoch
+    (UTC, if the timestamps are timezone-aware; in that case, they are returned in the timezone of the column)
+    """
+
+    def __init__(self, values, tz=None):
+        self.values = values
+        self.tz = tz
+
+    def contains(self, i):
+        return self.values[i] != MISSING_TIMESTAMP
+
+    def get(self, i):
+        value = self.values[i]
+        if value == MISSING_TIMESTAMP:
+            raise KeyError(i)
+        if self.tz is None:
+            return _EPOCH + datetime.timedelta(microseconds=int(value))
+        return (_EPOCH_UTC + datetime.timedelta(microseconds=int(value))).astimezone(self.tz)
+
+    def set(self, i, value):
+        if not isinstance(value, datetime.datetime) or (value.tzinfo is None) != (self.tz is None):
+            return False
+        if not self.values.flags.writeable:
+            self.values = np.array(self.values)
+        self.values[i] = to_microseconds(value)
+        return True
+
+    def delete(self, i):
+        if not self.values.flags.writeable:
+            self.values = np.array(self.values)
+        self.values[i] = MISSING_TIMESTAMP
+
+    def to_object_column(self):
+        values = np.empty(len(self.values), dtype=object)
+        values[:] = NOT_PRESENT
+        for i in np.nonzero(self.values != MISSING_TIMESTAMP)[0]:
+            values[i] = self.get(i)
+        return ObjectColumn(values)
+
+
+class ObjectColumn(object):
+    """
+    Column storing the values of the events as Python objects
+    (used for the attributes that cannot be encoded, e.g. nested attributes)
+    """
+
+    def __init__(self, values):
+        self.values = values
+
+    def contains(self, i):
+        return self.values[i] is not NOT_PRESENT
+
+    def get(self, i):
+        value = self.values[i]
+        if value is NOT_PRESENT:
+            raise KeyError(i)
+        return value
+
+    def set(self, i, value):
+        self.values[i] = value
+        return True
+
+    def delete(self, i):
+        self.values[i] = NOT_PRESENT
+
+    def to_object_column(self):
+        return self
+
+
+def to_microseconds(timestamp):
+    """
+    Gets the number of microseconds from the epoch of a timestamp
+    (if the timestamp is timezone-aware, the epoch is considered in UTC)
+    """
+    if timestamp.tzinfo is None:
+        delta = timestamp - _EPOCH
+    else:
+        delta = timestamp - _EPOCH_UTC
+    return (delta.days * 86400 + delta.seconds) * 1000000 + delta.microseconds
+
+
+def build_column(values):
+    """
+    Builds the most compact column for the provided values
+
+    Parameters
+    --------------
+    values
+        List containing, for each event, the value of the attribute (or NOT_PRESENT)
+
+    Returns
+    --------------
+    column
+        Column
+    """
+    present = [v for v in values if v is not NOT_PRESENT]
+    if present and all(isinstance(v, datetime.datetime) for v in present):
+        naive = [v.tzinfo is None for v in present]
+        if all(naive) or not any(naive):
+            return TimestampColumn(np.array([to_microseconds(v) if v is not NOT_PRESENT else
+                                             MISSING_TIMESTAMP for v in values], dtype=np.int64), present[0].tzinfo)
+    vocabulary = []
+    index = {}
+    codes = np.empty(len(values), dtype=np.int32)
+    try:
+        for i, v in enumerate(values):
+            if v is NOT_PRESENT:
+                codes[i] = MISSING_CODE
+                continue
+            # the type is part of the key, so that (for example) 1 and True are not merged
+            key = (type(v), v)
+            if key not in index:
+                index[key] = len(vocabulary)
+                vocabulary.append(v)
+            codes[i] = index[key]
+    except TypeError:
+        # unhashable values
+        object_values = np.empty(len(values), dtype=object)
+        for i, v in enumerate(values):
+            object_values[i] = v
+        return ObjectColumn(object_values)
+    return DictionaryColumn(codes, vocabulary)
+
+
+class ColumnarEvent(Event):
+    """
+    View on an event of a columnar log; the values are read from (and written to) the columns of the log
+    """
+    __slots__ = ('_log', '_position')
+
+    # the generic implementations of the mapping methods (the dictionary of the event does not exist)
+    get = Mapping.get
+    keys = Mapping.keys
+    items = Mapping.items
+    values = Mapping.values
+
+    def __init__(self, log, position):
+        self._log = log
+        self._position = position
+
+    def __getitem__(self, key):
+        column = self._log.columns.get(key)
+        if column is None:
+            raise KeyError(key)
+        try:
+            return column.get(self._position)
+        except KeyError:
+            raise KeyError(key)
+
+    def __contains__(self, key):
+        column = self._log.columns.get(key)
+        return column is not None and column.contains(self._position)
+
+    def __setitem__(self, key, value):
+        self._log.set_value(self._position, key, value)
+
+    def __delitem__(self, key):
+        if key not in self:
+            raise KeyError(key)
+        self._log.columns[key].delete(self._position)
+
+    def __iter__(self):
+        return iter([key for key, column in self._log.columns.items() if column.contains(self._position)])
+
+    def __len__(self):
+        return len([key for key, column in self._log.columns.items() if column.contains(self._position)])
+
+    def _get_dict(self):
+        return dict(self)
+
+    _dict = property(_get_dict)
+
+    def __copy__(self):
+        return Event(dict(self))
+
+    def __deepcopy__(self, memo):
+        return Event(copy.deepcopy(dict(self), memo))
+
+    def __reduce__(self):
+        return Event, (dict(self),)
+
+
+class _EventViews(Sequence):
+    __slots__ = ('_log', '_start', '_end')
+
+    def __init__(self, log, start, end):
+        self._log = log
+        self._start = start
+        self._end = end
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            return [ColumnarEvent(self._log, self._start + i) for i in range(*key.indices(len(self)))]
+        if key < 0:
+            key += len(self)
+        if key < 0 or key >= len(self):
+            raise IndexError(key)
+        return ColumnarEvent(self._log, self._start + key)
+
+    def __iter__(self):
+        log = self._log
+        for i in range(self._start, self._end):
+            yield ColumnarEvent(log, i)
+
+    def __len__(self):
+        return self._end - self._start
+
+
+class ColumnarTrace(Trace):
+    """
+    View on a trace of a columnar log
+    """
+    __slots__ = ('_log', '_case')
+
+    def __init__(self, log, case):
+        self._log = log
+        self._case = case
+        self._attributes = log.trace_attributes[case]
+        self._list = _EventViews(log, int(log.case_offsets[case]), int(log.case_offsets[case + 1]))
+
+    def __setitem__(self, key, value):
+        raise TypeError("the traces of a columnar log cannot be modified")
+
+    def insert(self, i, x):
+        raise TypeError("the traces of a columnar log cannot be modified")
+
+    def append(self, x):
+        raise TypeError("the traces of a columnar log cannot be modified")
+
+    def __copy__(self):
+        return Trace(list(self), attributes=copy.copy(self.attributes))
+
+    def __deepcopy__(self, memo):
+        return Trace([copy.deepcopy(event, memo) for event in self], attributes=copy.deepcopy(self.attributes, memo))
+
+    def __reduce__(self):
+        return Trace, ([copy.copy(event) for event in self],), (None, {"_attributes": self.attributes})
+
+
+class _TraceViews(Sequence):
+    __slots__ = ('_log',)
+
+    def __init__(self, log):
+        self._log = log
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            return [ColumnarTrace(self._log, i) for i in range(*key.indices(len(self)))]
+        if key < 0:
+            key += len(self)
+        if key < 0 or key >= len(self):
+            raise IndexError(key)
+        return ColumnarTrace(self._log, key)
+
+    def __iter__(self):
+        log = self._log
+        for i in range(len(self)):
+            yield ColumnarTrace(log, i)
+
+    def __len__(self):
+        return len(self._log.case_offsets) - 1
+
+
+class ColumnarEventLog(EventLog):
+    """
+    Event log storing the events in columns (NumPy arrays), ordered by case.
+    The events of the i-th trace are the ones in the positions case_offsets[i]:case_offsets[i+1] of the columns.
+
+    The traces and the events are lightweight views, created on demand, implementing the same protocols
+    of the Trace and Event classes. The values of the attributes can be modified, but the traces cannot be added
+    or removed (a shallow copy of the log is a standard EventLog containing the views, a deep copy is a standard
+    EventLog containing standard traces and events).
+    """
+    __slots__ = ('case_offsets', 'columns', 'trace_attributes')
+
+    def __init__(self, case_offsets, columns, trace_attributes=None, **kwargs):
+        super(ColumnarEventLog, self).__init__(**kwargs)
+        self.case_offsets = np.asarray(case_offsets, dtype=np.int64)
+        self.columns = columns
+        if trace_attributes is None:
+            trace_attributes = [{} for i in range(len(self.case_offsets) - 1)]
+        self.trace_attributes = trace_attributes
+        self._list = _TraceViews(self)
+
+    def get_codes(self, key):
+        """
+        Gets the codes and the vocabulary of a dictionary-encoded column
+
+        Parameters
+        -------------
+        key
+            Attribute key
+
+        Returns
+        -------------
+        codes
+            Codes of the values of the events (MISSING_CODE if not present); None if the column is not encoded
+        vocabulary
+            List of values of the attribute
+        """
+        column = self.columns.get(key)
+        if type(column) is DictionaryColumn:
+            return column.codes, column.vocabulary
+        return None, None
+
+    def get_case_index(self):
+        """
+        Gets, for each event, the index of its trace
+        """
+        return np.repeat(np.arange(len(self.case_offsets) - 1), np.diff(self.case_offsets))
+
+    def set_value(self, position, key, value):
+        """
+        Sets the value of an attribute for the event in the given position
+        """
+        if key not in self.columns:
+            self.columns[key] = DictionaryColumn(np.full(self.case_offsets[-1], MISSING_CODE, dtype=np.int32), [])
+        if not self.columns[key].set(position, value):
+            self.columns[key] = self.columns[key].to_object_column()
+            self.columns[key].set(position, value)
+
+    def append(self, x):
+        raise TypeError("traces cannot be added to a columnar log")
+
+    def __copy__(self):
+        return EventLog(list(self), attributes=copy.copy(self._attributes), extensions=copy.copy(self._extensions),
+                        omni_present=copy.copy(self._omni), classifiers=copy.copy(self._classifiers))
+
+    def __deepcopy__(self, memo):
+        return EventLog([copy.deepcopy(trace, memo) for trace in self],
+                        attributes=copy.deepcopy(self._attributes, memo),
+                        extensions=copy.deepcopy(self._extensions, memo),
+                        omni_present=copy.deepcopy(self._omni, memo),
+                        classifiers=copy.deepcopy(self._classifiers, memo))
+
+    def __reduce__(self):
+        return ColumnarEventLog, (self.case_offsets, self.columns, self.trace_attributes), (None, {
+            "_attributes": self._attributes, "_extensions": self._extensions, "_omni": self._omni,
+            "_classifiers": self._classifiers})
@@ -1,7 +1,6 @@
-import pyarrow
 import deprecation
 
-from pm4py.objects.log.deserialization.versions import parquet_dataframe, pyarrow_event_log, pyarrow_event_stream
+from pm4py.objects.log.deserialization.versions import parquet_dataframe, binary_event_log
 from pm4py.objects.log.log import EventLog, EventStream
 import pandas as pd
 
@@ -9,15 +8,30 @@ import pandas as pd
 PYARROW_EVENT_STREAM="pyarrow_event_stream"
 PYARROW_EVENT_LOG="pyarrow_event_log"
 PARQUET_DATAFRAME="parquet_dataframe"
+BINARY_EVENT_LOG="binary_event_log"
 
 DEFAULT_EVENT_STREAM=PYARROW_EVENT_STREAM
 DEFAULT_EVENT_LOG=PYARROW_EVENT_LOG
 DEFAULT_DATAFRAME=PARQUET_DATAFRAME
 
 
-VERSIONS_APPLY={PYARROW_EVENT_STREAM: pyarrow_event_stream.apply, PYARROW_EVENT_LOG: pyarrow_event_log.apply, PARQUET_DATAFRAME: parquet_dataframe.apply}
+VERSIONS_APPLY={PARQUET_DATAFRAME: parquet_dataframe.apply, BINARY_EVENT_LOG: binary_event_log.apply}
 
-VERSIONS_IMPORT_FILE={PYARROW_EVENT_STREAM: pyarrow_event_stream.import_from_file, PYARROW_EVENT_LOG: pyarrow_event_log.import_from_file, PARQUET_DATAFRAME: parquet_dataframe.import_from_file}
+VERSIONS_IMPORT_FILE={PARQUET_DATAFRAME: parquet_dataframe.import_from_file, BINARY_EVENT_LOG: binary_event_log.import_from_file}
+
+try:
+    import pyarrow
+    from pm4py.objects.log.deserialization.versions import pyarrow_event_log, pyarrow_event_stream
+
+    VERSIONS_APPLY[PYARROW_EVENT_STREAM] = pyarrow_event_stream.apply
+    VERSIONS_APPLY[PYARROW_EVENT_LOG] = pyarrow_event_log.apply
+    VERSIONS_IMPORT_FILE[PYARROW_EVENT_STREAM] = pyarrow_event_stream.import_from_file
+    VERSIONS_IMPORT_FILE[PYARROW_EVENT_LOG] = pyarrow_event_log.import_from_file
+except ImportError:
+    # Pyarrow is not installed (or cannot be imported)
+    DEFAULT_EVENT_LOG=BINARY_EVENT_LOG
+    # no variant is available for the event streams
+    DEFAULT_EVENT_STREAM=None
 
 @deprecation.deprecated(deprecated_in='1.3.0', removed_in='2.0.0', current_version='',
                         details='Use algorithm entrypoint instead')
@@ -30,7 +44,7 @@ def apply(bytes, variant, parameters=None):
     bytes
         Bytes
     variant
-        Deserialization variant that MUST be specified (values: pyarrow_event_stream, pyarrow_event_log, parquet_dataframe)
+        Deserialization variant that MUST be specified (values: pyarrow_event_stream, pyarrow_event_log, parquet_dataframe, binary_event_log)
     parameters
         Parameters of the algorithm
 
@@ -52,7 +66,7 @@ def import_from_file(file_path, variant, parameters=None):
     file_path
         File path
     variant
-        Deserialization variant that MUST be specified (values: pyarrow_event_stream, pyarrow_event_log, parquet_dataframe)
+        Deserialization variant that MUST be specified (values: pyarrow_event_stream, pyarrow_event_log, parquet_dataframe, binary_event_log)
     parameters
         Parameters of the algorithm
 
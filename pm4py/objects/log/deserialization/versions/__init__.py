@@ -1 +1,8 @@
-from pm4py.objects.log.deserialization.versions import parquet_dataframe, pyarrow_event_log, pyarrow_event_stream
+from pm4py.objects.log.deserialization.versions import parquet_dataframe, binary_event_log
+
+try:
+    import pyarrow
+    from pm4py.objects.log.deserialization.versions import pyarrow_event_log, pyarrow_event_stream
+except ImportError:
+    # Pyarrow is not installed (or cannot be imported)
+    pass
@@ -0,0 +1,201 @@
+import datetime
+import json
+from collections.abc import Sequence
+
+import numpy as np
+
+from pm4py.objects.log import columnar
+from pm4py.objects.log.serialization.versions import binary_event_log as binary_format
+
+
+class _LazySequence(Sequence):
+    """
+    Sequence whose values are decoded from a block on their first access.
+    Values can be appended (they are kept in memory), so that the sequence can act as vocabulary of a column
+    """
+
+    def __init__(self, length, decode):
+        self._length = length
+        self._decode = decode
+        self._values = {}
+        self._appended = []
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        if i < 0:
+            i += len(self)
+        if i < 0 or i >= len(self):
+            raise IndexError(i)
+        if i >= self._length:
+            return self._appended[i - self._length]
+        if i not in self._values:
+            self._values[i] = self._decode(i)
+        return self._values[i]
+
+    def __len__(self):
+        return self._length + len(self._appended)
+
+    def append(self, value):
+        self._appended.append(value)
+
+    def __reduce__(self):
+        return list, (list(self),)
+
+
+def decode_value(value):
+    """
+    Decodes a value encoded by binary_event_log.encode_value (serialization)
+
+    Parameters
+    --------------
+    value
+        JSON value
+
+    Returns
+    --------------
+    decoded_value
+        Value
+    """
+    if type(value) is not dict:
+        return value
+    tag, content = value[binary_format._TAG], value[binary_format._VALUE]
+    if tag == binary_format._DATETIME:
+        return datetime.datetime.fromisoformat(content)
+    if tag == binary_format._DICT:
+        return {decode_value(k): decode_value(v) for k, v in content}
+    if tag == binary_format._LIST:
+        return [decode_value(v) for v in content]
+    if tag == binary_format._TUPLE:
+        return tuple(decode_value(v) for v in content)
+    raise Exception("unknown value in the binary event log: " + str(tag))
+
+
+def decode_timezone(tz):
+    """
+    Decodes the timezone of a timestamp column encoded by binary_event_log.encode_timezone (serialization)
+    """
+    if tz is None:
+        return None
+    if "offset" in tz:
+        offset = datetime.timedelta(seconds=tz["offset"])
+        return datetime.timezone.utc if not offset else datetime.timezone(offset)
+    try:
+        import zoneinfo
+        return zoneinfo.ZoneInfo(tz["name"])
+    except ImportError:
+        import pytz
+        return pytz.timezone(tz["name"])
+
+
+def read(buffer, parameters=None):
+    """
+    Reads a log in the binary format from a buffer. The columns are views on the buffer, and the values of the
+    vocabularies and the trace attributes are decoded on their first access: hence, when the buffer is
+    memory-mapped, only the pages that are needed are read from the disk
+
+    Parameters
+    --------------
+    buffer
+        NumPy array of bytes (uint8)
+    parameters
+        Parameters of the algorithm
+
+    Returns
+    --------------
+    log : :class:`pm4py.objects.log.columnar.ColumnarEventLog`
+        Columnar event log
+    """
+    if bytes(buffer[:len(binary_format.MAGIC)]) != binary_format.MAGIC:
+        raise Exception("the content is not a binary event log")
+    header_offset, header_length = [int(x) for x in
+                                    buffer[len(binary_format.MAGIC):len(binary_format.MAGIC) + 16].view(np.uint64)]
+    if header_offset + header_length > len(buffer):
+        raise Exception("the binary event log is truncated")
+    header = json.loads(bytes(buffer[header_offset:header_offset + header_length]).decode("utf-8"))
+    if header["version"] != binary_format.FORMAT_VERSION:
+        raise Exception("unsupported version of the binary event log format: " + str(header["version"]))
+
+    def get_block(i):
+        offset, dtype, length = header["blocks"][i]
+        dtype = np.dtype(dtype)
+        if dtype.hasobject or offset + length * dtype.itemsize > header_offset:
+            raise Exception("invalid block in the binary event log: " + str(i))
+        return buffer[offset:offset + length * dtype.itemsize].view(dtype)
+
+    def get_sequence(offsets_block, data_block, decode):
+        offsets = get_block(offsets_block)
+        data = get_block(data_block)
+        return _LazySequence(len(offsets) - 1,
+                             lambda i: decode(bytes(data[int(offsets[i]):int(offsets[i + 1])])))
+
+    def decode_json(value):
+        return decode_value(json.loads(value.decode("utf-8")))
+
+    columns = {}
+    for key, column_type, *content in header["columns"]:
+        key = decode_value(key)
+        if column_type == binary_format.DICTIONARY_COLUMN:
+            vocabulary_type, *vocabulary_blocks = content[1]
+            if vocabulary_type == binary_format.NATIVE_VALUES:
+                values = get_block(vocabulary_blocks[0])
+                vocabulary = _LazySequence(len(values), lambda i, values=values: values[i].item())
+            elif vocabulary_type == binary_format.STRING_VALUES:
+                vocabulary = get_sequence(*vocabulary_blocks, lambda x: x.decode("utf-8", "surrogatepass"))
+            else:
+                vocabulary = get_sequence(*vocabulary_blocks, decode_json)
+            columns[key] = columnar.DictionaryColumn(get_block(content[0]), vocabulary)
+        elif column_type == binary_format.TIMESTAMP_COLUMN:
+            columns[key] = columnar.TimestampColumn(get_block(content[0]), decode_timezone(content[1]))
+        else:
+            encoded_values = get_sequence(*content, lambda x: decode_json(x) if x else columnar.NOT_PRESENT)
+            values = np.empty(len(encoded_values), dtype=object)
+            for i, value in enumerate(encoded_values):
+                values[i] = value
+            columns[key] = columnar.ObjectColumn(values)
+
+    return columnar.ColumnarEventLog(get_block(0), columns,
+                                     trace_attributes=get_sequence(*header["trace_attributes"], decode_json),
+                                     attributes=decode_value(header["attributes"]),
+                                     extensions=decode_value(header["extensions"]),
+                                     omni_present=decode_value(header["omni_present"]),
+                                     classifiers=decode_value(header["classifiers"]))
+
+
+def apply(bytes, parameters=None):
+    """
+    Apply the deserialization to the bytes produced by the binary serialization
+
+    Parameters
+    --------------
+    bytes
+        Bytes
+    parameters
+        Parameters of the algorithm
+
+    Returns
+    --------------
+    deser
+        Deserialized object
+    """
+    return read(np.frombuffer(bytes, dtype=np.uint8), parameters=parameters)
+
+
+def import_from_file(file_path, parameters=None):
+    """
+    Imports a file produced by the binary serialization. The file is memory-mapped (read-only): the content of
+    a trace or of a column is read from the disk only when it is accessed
+
+    Parameters
+    --------------
+    file_path
+        File path
+    parameters
+        Parameters of the algorithm
+
+    Returns
+    --------------
+    deser
+        Deserialized object
+    """
+    return read(np.memmap(file_path, dtype=np.uint8, mode="r"), parameters=parameters)
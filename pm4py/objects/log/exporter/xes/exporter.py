@@ -1,12 +1,13 @@
 from enum import Enum
 
 from pm4py.objects.conversion.log import converter as log_conversion
-from pm4py.objects.log.exporter.xes.variants import etree_xes_exp
+from pm4py.objects.log.exporter.xes.variants import etree_xes_exp, etree_xes_stream_exp
 from pm4py.util import exec_utils
 
 
 class Variants(Enum):
     ETREE = etree_xes_exp
+    ETREE_STREAM = etree_xes_stream_exp
 
 
 def __export_log_as_string(log, variant=Variants.ETREE, parameters=None):
@@ -1 +1 @@
-from pm4py.objects.log.exporter.xes.variants import etree_xes_exp
+from pm4py.objects.log.exporter.xes.variants import etree_xes_exp, etree_xes_stream_exp
@@ -230,6 +230,47 @@ def __export_traces(log, root):
         __export_traces_events(tr, trace)
 
 
+def export_log_header(log, root):
+    """
+    Export the content of a PM4Py log at the log level (attributes, extensions, globals, classifiers)
+
+    Parameters
+    ----------
+    log: :class:`pm4py.log.log.EventLog`
+        PM4PY log
+    root:
+        Output XML root element
+    """
+    # add attributes at the log level
+    __export_attributes(log, root)
+    # add extensions at the log level
+    __export_extensions(log, root)
+    # add globals at the log level
+    __export_globals(log, root)
+    # add classifiers at the log level
+    __export_classifiers(log, root)
+
+
+def get_trace_element(tr):
+    """
+    Get the XML element of a PM4Py trace (including its events)
+
+    Parameters
+    ----------
+    tr: :class:`pm4py.log.log.Trace`
+        PM4PY trace
+
+    Returns
+    ----------
+    trace
+        XML element
+    """
+    trace = etree.Element(xes_util.TAG_TRACE)
+    __export_attributes_element(tr, trace)
+    __export_traces_events(tr, trace)
+    return trace
+
+
 def __export_log_tree(log):
     """
     Get XES log XML tree from a PM4Py log
@@ -249,14 +290,8 @@ def __export_log_tree(log):
         log = log_converter.apply(log)
     root = etree.Element(xes_util.TAG_LOG)
 
-    # add attributes at the log level
-    __export_attributes(log, root)
-    # add extensions at the log level
-    __export_extensions(log, root)
-    # add globals at the log level
-    __export_globals(log, root)
-    # add classifiers at the log level
-    __export_classifiers(log, root)
+    # add the content at the log level
+    export_log_header(log, root)
     # add traces at the log level
     __export_traces(log, root)
 
@@ -0,0 +1,75 @@
+import gzip
+from enum import Enum
+
+from lxml import etree
+
+from pm4py.objects.conversion.log import converter as log_converter
+from pm4py.objects.log import log as log_instance
+from pm4py.objects.log.exporter.xes.variants import etree_xes_exp
+from pm4py.objects.log.util import xes as xes_util
+from pm4py.util import parameters as param_util
+
+
+class Parameters(Enum):
+    COMPRESS = False
+
+
+def export_to_file_object(log, F):
+    """
+    Export a PM4Py log (or an iterable of traces) to a file object, writing each trace as soon as it is visited
+    (the XML tree of the whole log is never built)
+
+    Parameters
+    -----------
+    log
+        PM4Py log, or iterable of traces (for which no content at the log level is written)
+    F
+        (Binary) file object
+    """
+    # If the log is in log_instance.EventStream, then transform it into log_instance.EventLog format
+    if type(log) is log_instance.EventStream:
+        log = log_converter.apply(log)
+
+    with etree.xmlfile(F, encoding="utf-8") as xf:
+        xf.write_declaration()
+        with xf.element(xes_util.TAG_LOG):
+            # the pretty-printed elements end with a newline
+            xf.write("\n")
+            if isinstance(log, log_instance.EventLog):
+                header = etree.Element(xes_util.TAG_LOG)
+                etree_xes_exp.export_log_header(log, header)
+                for element in header:
+                    xf.write(element, pretty_print=True)
+            for trace in log:
+                xf.write(etree_xes_exp.get_trace_element(trace), pretty_print=True)
+
+
+def __export_log(log, output_file_path, parameters=None):
+    """
+    Export XES log from a PM4PY log, writing the traces incrementally
+
+    Parameters
+    ----------
+    log: :class:`pm4py.log.log.EventLog`
+        PM4PY log (or iterable of traces)
+    output_file_path:
+        Output file path
+    parameters
+        Parameters of the algorithm:
+            Parameters.COMPRESS -> writes the XES directly in a gzip stream (to the output path plus the .gz suffix)
+    """
+    parameters = dict() if parameters is None else parameters
+
+    compress = param_util.fetch(Parameters.COMPRESS, parameters)
+    if compress:
+        F = gzip.open(output_file_path + ".gz", "wb")
+    else:
+        F = open(output_file_path, "wb")
+    try:
+        export_to_file_object(log, F)
+    finally:
+        F.close()
+
+
+def apply(log, output_file_path, parameters=None):
+    return __export_log(log, output_file_path, parameters)
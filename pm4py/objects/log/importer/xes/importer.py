@@ -2,7 +2,8 @@ from enum import Enum
 
 import deprecation
 
-from pm4py.objects.log.importer.xes.variants import iterparse, line_by_line
+from pm4py.objects.log.importer.xes.variants import iterparse, line_by_line, iterparse_single_pass, iterparse_stream, \
+    iterparse_parallel
 from pm4py.objects.log.util import compression
 from pm4py.objects.log.util import string_to_file
 from pm4py.util import exec_utils
@@ -11,6 +12,8 @@ from pm4py.util import exec_utils
 class Variants(Enum):
     ITERPARSE = iterparse
     LINE_BY_LINE = line_by_line
+    ITERPARSE_SINGLE_PASS = iterparse_single_pass
+    ITERPARSE_PARALLEL = iterparse_parallel
 
 
 # deprecated variant keys; remove in 2.0.0
@@ -38,6 +41,8 @@ def __import_log_from_string(log_string, parameters=None, variant=Variants.ITERP
         Variant of the algorithm to use, including:
             - Variants.ITERPARSE
             - Variants.LINE_BY_LINE
+            - Variants.ITERPARSE_SINGLE_PASS
+            - Variants.ITERPARSE_PARALLEL
 
     Returns
     -----------
@@ -70,6 +75,8 @@ def __import_log(path, parameters=None, variant=Variants.ITERPARSE):
         Variant of the algorithm to use, including:
             - Variants.ITERPARSE
             - Variants.LINE_BY_LINE
+            - Variants.ITERPARSE_SINGLE_PASS
+            - Variants.ITERPARSE_PARALLEL
 
     Returns
     -----------
@@ -109,6 +116,8 @@ def apply(path, parameters=None, variant=Variants.ITERPARSE):
         Variant of the algorithm to use, including:
             - Variants.ITERPARSE
             - Variants.LINE_BY_LINE
+            - Variants.ITERPARSE_SINGLE_PASS
+            - Variants.ITERPARSE_PARALLEL
 
     Returns
     -----------
@@ -126,3 +135,27 @@ def apply(path, parameters=None, variant=Variants.ITERPARSE):
         variant = Variants.ITERPARSE
 
     return variant.value.apply(path, parameters=parameters)
+
+
+def iterate(path, parameters=None):
+    """
+    Iterates over the traces of a XES log, without keeping the log in memory
+
+    Parameters
+    -----------
+    path
+        Log path (.xes or .xes.gz)
+    parameters
+        Parameters of the algorithm, including
+            Parameters.MAX_TRACES -> Specify the maximum number of traces to read
+            Parameters.BATCH_SIZE -> (if provided) yields lists of (at most) BATCH_SIZE traces instead of single traces
+            Parameters.SAMPLING_RATIO -> Probability for each trace of the log to be yielded (default: 1.0)
+            Parameters.RANDOM_SEED -> Seed of the random sampling of the traces
+        (see iterparse_stream.Parameters)
+
+    Returns
+    -----------
+    traces
+        Generator of traces (or of lists of traces)
+    """
+    return iterparse_stream.apply(path, parameters=parameters)
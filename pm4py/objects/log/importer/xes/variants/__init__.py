@@ -1 +1,2 @@
-from pm4py.objects.log.importer.xes.variants import iterparse, line_by_line
+from pm4py.objects.log.importer.xes.variants import iterparse, line_by_line, iterparse_single_pass, \
+    iterparse_stream, iterparse_parallel
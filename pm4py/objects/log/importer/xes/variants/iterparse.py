@@ -6,9 +6,11 @@ from lxml import etree
 from pm4py.objects.log.log import EventLog, Trace, Event
 from pm4py.objects.log.util import sorting, index_attribute
 from pm4py.objects.log.util import xes as xes_util
+from pm4py.util import exec_utils
 from pm4py.util import parameters as param_util
 from pm4py.util import xes_constants
 from pm4py.util.dt_parsing import parser as dt_parser
+from pm4py.util.dt_parsing import vectorized as dt_vectorized
 
 import pkgutil
 
@@ -19,6 +21,7 @@ class Parameters(Enum):
     REVERSE_SORT = False
     INSERT_TRACE_INDICES = False
     MAX_TRACES = 1000000000
+    VECTORIZED_DATES = "vectorized_dates"
 
 
 # ITERPARSE EVENTS
@@ -45,6 +48,8 @@ def import_log(filename, parameters=None):
             Parameters.REVERSE_SORT -> Specify in which direction the log should be sorted
             Parameters.INSERT_TRACE_INDICES -> Specify if trace indexes should be added as event attribute for each event
             Parameters.MAX_TRACES -> Specify the maximum number of traces to import from the log (read in order in the XML file)
+            Parameters.VECTORIZED_DATES -> Converts the dates of each attribute with Pandas (one call per offset)
+            after the traces are read, instead of parsing them one at a time (default: False)
 
     Returns
     -------
@@ -54,10 +59,6 @@ def import_log(filename, parameters=None):
 
     parameters = dict() if parameters is None else parameters
 
-    insert_trace_indexes = param_util.fetch(Parameters.INSERT_TRACE_INDICES, parameters)
-    max_no_traces_to_import = param_util.fetch(Parameters.MAX_TRACES, parameters)
-
-    date_parser = dt_parser.get()
     context = etree.iterparse(filename, events=[_EVENT_START, _EVENT_END])
 
     # check to see if log has a namespace before looking for traces  (but this might be more effort than worth)
@@ -74,7 +75,90 @@ def import_log(filename, parameters=None):
         from tqdm.auto import tqdm
         progress = tqdm(total=no_trace,desc="parsing log, completed traces :: ")
 
-    log = None
+    log = import_from_context(context, parameters=parameters, progress=progress)
+
+    #gracefully close progress bar
+    if progress is not None:
+        progress.close()
+    del context, progress
+
+    return log
+
+
+def import_from_context(context, parameters=None, progress=None):
+    """
+    Builds a log object from an iterparse context (over start and end events)
+
+    Parameters
+    ----------
+    context
+        lxml iterparse context
+    parameters
+        Parameters of the algorithm (see import_log)
+    progress
+        (if provided) object whose update() method is called every time a trace is completed
+
+    Returns
+    -------
+    log : :class:`pm4py.log.log.EventLog`
+        A log
+    """
+    if parameters is None:
+        parameters = {}
+
+    insert_trace_indexes = param_util.fetch(Parameters.INSERT_TRACE_INDICES, parameters)
+    max_no_traces_to_import = param_util.fetch(Parameters.MAX_TRACES, parameters)
+    date_collector = dt_vectorized.DateCollector() if exec_utils.get_param_value(Parameters.VECTORIZED_DATES,
+                                                                                parameters, False) else None
+
+    log = EventLog()
+    for trace in iterate_from_context(context, log, progress=progress,
+                                      max_no_traces_to_import=max_no_traces_to_import,
+                                      date_collector=date_collector):
+        log.append(trace)
+
+    if date_collector is not None:
+        date_collector.convert(dt_parser.get())
+
+    if Parameters.TIMESTAMP_SORT in parameters and parameters[Parameters.TIMESTAMP_SORT]:
+        log = sorting.sort_timestamp(log,
+                                     timestamp_key=param_util.fetch(Parameters.TIMESTAMP_KEY, parameters),
+                                     reverse_sort=param_util.fetch(Parameters.REVERSE_SORT, parameters))
+    if insert_trace_indexes:
+        log = index_attribute.insert_event_index_as_event_attribute(log)
+
+    return log
+
+
+def iterate_from_context(context, log, progress=None, max_no_traces_to_import=Parameters.MAX_TRACES.value,
+                         date_collector=None):
+    """
+    Iterates over the traces contained in an iterparse context (over start and end events).
+    The traces are yielded as soon as they are completed, and are not kept in memory by the parser
+
+    Parameters
+    ----------
+    context
+        lxml iterparse context
+    log
+        Log object in which the log-level attributes, extensions, globals and classifiers are stored
+    progress
+        (if provided) object whose update() method is called every time a trace is completed
+    max_no_traces_to_import
+        Maximum number of traces to read (in order in the XML file)
+    date_collector
+        (if provided) DateCollector to which the conversion of the (non-nested) date attributes is deferred:
+        until its convert() method is called, these attributes contain the date strings
+
+    Returns
+    -------
+    traces
+        Generator of traces
+    """
+    date_parser = dt_parser.get()
+
+    log_found = False
+    no_traces = 0
     trace = None
     event = None
 
@@ -90,6 +174,10 @@ def import_log(filename, parameters=None):
                 continue
 
             elif elem.tag.endswith(xes_constants.TAG_DATE):
+                if date_collector is not None and parent is not None and type(parent) is not list and len(
+                        elem.getchildren()) == 0:
+                    date_collector.add(parent, elem.get(xes_constants.KEY_KEY), elem.get(xes_constants.KEY_VALUE))
+                    continue
                 try:
                     dt = date_parser.apply(elem.get(xes_constants.KEY_VALUE))
                     tree = __parse_attribute(elem, parent, elem.get(xes_constants.KEY_KEY), dt, tree)
@@ -107,7 +195,7 @@ def import_log(filename, parameters=None):
                 continue
 
             elif elem.tag.endswith(xes_constants.TAG_TRACE):
-                if len(log) >= max_no_traces_to_import:
+                if no_traces >= max_no_traces_to_import:
                     break
                 if trace is not None:
                     raise SyntaxError('file contains <trace> in another <trace> tag')
@@ -158,7 +246,7 @@ def import_log(filename, parameters=None):
                 continue
 
             elif elem.tag.endswith(xes_constants.TAG_EXTENSION):
-                if log is None:
+                if not log_found:
                     raise SyntaxError('extension found outside of <log> tag')
                 if elem.get(xes_constants.KEY_NAME) is not None and elem.get(
                         xes_constants.KEY_PREFIX) is not None and elem.get(xes_constants.KEY_URI) is not None:
@@ -168,7 +256,7 @@ def import_log(filename, parameters=None):
                 continue
 
             elif elem.tag.endswith(xes_constants.TAG_GLOBAL):
-                if log is None:
+                if not log_found:
                     raise SyntaxError('global found outside of <log> tag')
                 if elem.get(xes_constants.KEY_SCOPE) is not None:
                     log.omni_present[elem.get(xes_constants.KEY_SCOPE)] = {}
@@ -176,7 +264,7 @@ def import_log(filename, parameters=None):
                 continue
 
             elif elem.tag.endswith(xes_constants.TAG_CLASSIFIER):
-                if log is None:
+                if not log_found:
                     raise SyntaxError('classifier found outside of <log> tag')
                 if elem.get(xes_constants.KEY_KEYS) is not None:
                     classifier_value = elem.get(xes_constants.KEY_KEYS)
@@ -188,21 +276,21 @@ def import_log(filename, parameters=None):
                 continue
 
             elif elem.tag.endswith(xes_constants.TAG_LOG):
-                if log is not None:
+                if log_found:
                     raise SyntaxError('file contains > 1 <log> tags')
-                log = EventLog()
+                log_found = True
                 tree[elem] = log.attributes
                 continue
 
         elif tree_event == _EVENT_END:
-            if elem in tree:
-                del tree[elem]
+            tree.pop(elem, None)
             elem.clear()
-            if elem.getprevious() is not None:
+            # drops the already processed siblings, so that the lxml tree stays small
+            while elem.getprevious() is not None:
                 try:
                     del elem.getparent()[0]
                 except TypeError:
-                    pass
+                    break
 
             if elem.tag.endswith(xes_constants.TAG_EVENT):
                 if trace is not None:
@@ -211,31 +299,19 @@ def import_log(filename, parameters=None):
                 continue
 
             elif elem.tag.endswith(xes_constants.TAG_TRACE):
-                log.append(trace)
+                no_traces += 1
 
                 #update progress bar as we have a completed trace
                 if progress is not None:
                     progress.update()
 
+                completed_trace = trace
                 trace = None
+                yield completed_trace
                 continue
 
             elif elem.tag.endswith(xes_constants.TAG_LOG):
                 continue
-            
-    #gracefully close progress bar
-    if progress is not None:
-        progress.close()
-    del context, progress
-
-    if Parameters.TIMESTAMP_SORT in parameters and parameters[Parameters.TIMESTAMP_SORT]:
-        log = sorting.sort_timestamp(log,
-                                     timestamp_key=param_util.fetch(Parameters.TIMESTAMP_KEY, parameters),
-                                     reverse_sort=param_util.fetch(Parameters.REVERSE_SORT, parameters))
-    if insert_trace_indexes:
-        log = index_attribute.insert_event_index_as_event_attribute(log)
-
-    return log
 
 
 def __parse_attribute(elem, store, key, value, tree):
@@ -0,0 +1,186 @@
+import io
+import mmap
+import os
+from concurrent.futures import ProcessPoolExecutor
+from enum import Enum
+
+from lxml import etree
+
+from pm4py.objects.log.importer.xes.variants import iterparse
+from pm4py.objects.log.util import sorting, index_attribute
+from pm4py.objects.log.util import xes as xes_util
+from pm4py.util import exec_utils
+from pm4py.util import parameters as param_util
+
+
+class Parameters(Enum):
+    TIMESTAMP_SORT = False
+    TIMESTAMP_KEY = xes_util.DEFAULT_TIMESTAMP_KEY
+    REVERSE_SORT = False
+    INSERT_TRACE_INDICES = False
+    MAX_TRACES = 1000000000
+    NUM_WORKERS = None
+    CHUNK_SIZE = 16 * 1024 * 1024
+    VECTORIZED_DATES = "vectorized_dates"
+
+
+# ITERPARSE EVENTS
+_EVENT_END = 'end'
+_EVENT_START = 'start'
+
+_TRACE_START = b"<trace"
+_TRACE_END = b"</trace>"
+# characters that could follow the name of the tag in a <trace> opening tag
+_TRACE_START_FOLLOWERS = {b" ", b"\t", b"\r", b"\n", b">", b"/"}
+
+
+def apply(filename, parameters=None):
+    return import_log(filename, parameters)
+
+
+def import_log(filename, parameters=None):
+    """
+    Imports an XES file into a log object, parsing chunks of traces in parallel.
+
+    The file is split at <trace> boundaries by a byte scan; each chunk is parsed in a separate process
+    (along with the header of the log, so extensions, globals and classifiers are known),
+    and the traces are merged in the order of the file.
+
+    Parameters
+    ----------
+    filename:
+        Absolute filename
+    parameters
+        Parameters of the algorithm, including
+            Parameters.TIMESTAMP_SORT -> Specify if we should sort log by timestamp
+            Parameters.TIMESTAMP_KEY -> If sort is enabled, then sort the log by using this key
+            Parameters.REVERSE_SORT -> Specify in which direction the log should be sorted
+            Parameters.INSERT_TRACE_INDICES -> Specify if trace indexes should be added as event attribute for each event
+            Parameters.MAX_TRACES -> Specify the maximum number of traces to import from the log (read in order in the XML file)
+            Parameters.NUM_WORKERS -> Number of processes used for the parsing (default: number of CPUs)
+            Parameters.CHUNK_SIZE -> Approximate size (in bytes) of the chunks of the file parsed by the processes
+            Parameters.VECTORIZED_DATES -> Converts the dates of each attribute with Pandas (one call per offset)
+            after the traces are read, instead of parsing them one at a time (default: False)
+
+    Returns
+    -------
+    log : :class:`pm4py.log.log.EventLog`
+        A log
+    """
+    parameters = dict() if parameters is None else parameters
+
+    max_no_traces_to_import = param_util.fetch(Parameters.MAX_TRACES, parameters)
+    num_workers = param_util.fetch(Parameters.NUM_WORKERS, parameters)
+    chunk_size = param_util.fetch(Parameters.CHUNK_SIZE, parameters)
+    vectorized_dates = exec_utils.get_param_value(Parameters.VECTORIZED_DATES, parameters, False)
+    if num_workers is None:
+        num_workers = os.cpu_count()
+
+    chunks = None
+    if max_no_traces_to_import >= Parameters.MAX_TRACES.value and num_workers > 1:
+        header, footer, chunks = __split_file(filename, chunk_size)
+
+    if not chunks or len(chunks) < 2:
+        # the file is too small to be split (or only a prefix of the traces is needed):
+        # the sequential importer is used
+        return iterparse.import_log(filename, parameters=__get_iterparse_parameters(parameters))
+
+    # the log-level information is read from the header and the footer of the file
+    log = __parse_bytes(header + footer, vectorized_dates)
+
+    with ProcessPoolExecutor(max_workers=min(num_workers, len(chunks))) as executor:
+        for traces in executor.map(__import_chunk, [(filename, header, footer, chunk, vectorized_dates)
+                                                    for chunk in chunks]):
+            for trace in traces:
+                log.append(trace)
+
+    if param_util.fetch(Parameters.TIMESTAMP_SORT, parameters):
+        log = sorting.sort_timestamp(log,
+                                     timestamp_key=param_util.fetch(Parameters.TIMESTAMP_KEY, parameters),
+                                     reverse_sort=param_util.fetch(Parameters.REVERSE_SORT, parameters))
+    if param_util.fetch(Parameters.INSERT_TRACE_INDICES, parameters):
+        log = index_attribute.insert_event_index_as_event_attribute(log)
+
+    return log
+
+
+def __get_iterparse_parameters(parameters):
+    iterparse_parameters = {}
+    for p in [iterparse.Parameters.TIMESTAMP_SORT, iterparse.Parameters.TIMESTAMP_KEY,
+              iterparse.Parameters.REVERSE_SORT, iterparse.Parameters.INSERT_TRACE_INDICES,
+              iterparse.Parameters.MAX_TRACES]:
+        iterparse_parameters[p] = param_util.fetch(Parameters[p.name], parameters)
+    iterparse_parameters[iterparse.Parameters.VECTORIZED_DATES] = exec_utils.get_param_value(
+        Parameters.VECTORIZED_DATES, parameters, False)
+    return iterparse_parameters
+
+
+def __split_file(filename, chunk_size):
+    """
+    Splits the file at <trace> boundaries
+
+    Parameters
+    -------------
+    filename
+        Path of the XES file
+    chunk_size
+        Approximate size of the chunks
+
+    Returns
+    -------------
+    header
+        Bytes preceding the first trace
+    footer
+        Bytes following the last trace
+    chunks
+        List of (start, end) offsets of the chunks of traces
+    """
+    with open(filename, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return None, None, None
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            first_trace = __find_trace_start(mm, 0)
+            last_trace_end = mm.rfind(_TRACE_END)
+            if first_trace < 0 or last_trace_end < first_trace:
+                return None, None, None
+            last_trace_end += len(_TRACE_END)
+
+            cuts = [first_trace]
+            while True:
+                cut = __find_trace_start(mm, cuts[-1] + chunk_size)
+                if cut < 0 or cut >= last_trace_end:
+                    break
+                cuts.append(cut)
+            cuts.append(last_trace_end)
+
+            return mm[:first_trace], mm[last_trace_end:], [(cuts[i], cuts[i + 1]) for i in range(len(cuts) - 1)]
+        finally:
+            mm.close()
+
+
+def __find_trace_start(mm, position):
+    while True:
+        position = mm.find(_TRACE_START, position)
+        if position < 0:
+            return position
+        following = position + len(_TRACE_START)
+        if mm[following:following + 1] in _TRACE_START_FOLLOWERS:
+            return position
+        position += len(_TRACE_START)
+
+
+def __parse_bytes(content, vectorized_dates):
+    context = etree.iterparse(io.BytesIO(content), events=[_EVENT_START, _EVENT_END])
+    log = iterparse.import_from_context(context,
+                                        parameters={iterparse.Parameters.VECTORIZED_DATES: vectorized_dates})
+    del context
+    return log
+
+
+def __import_chunk(args):
+    filename, header, footer, chunk, vectorized_dates = args
+    with open(filename, "rb") as f:
+        f.seek(chunk[0])
+        content = f.read(chunk[1] - chunk[0])
+    return list(__parse_bytes(header + content + footer, vectorized_dates))
@@ -0,0 +1,85 @@
+import os
+import pkgutil
+
+from lxml import etree
+
+from pm4py.objects.log.importer.xes.variants import iterparse
+from pm4py.objects.log.importer.xes.variants.iterparse import Parameters
+
+# ITERPARSE EVENTS
+_EVENT_END = 'end'
+_EVENT_START = 'start'
+
+
+class _FileProgress(object):
+    """
+    Adapts a byte-based progress bar to the per-trace update() calls of the iterparse importer,
+    advancing it by the number of bytes of the file consumed by the parser so far
+    """
+
+    def __init__(self, progress, file):
+        self.progress = progress
+        self.file = file
+        self.position = 0
+
+    def update(self):
+        position = self.file.tell()
+        if position > self.position:
+            self.progress.update(position - self.position)
+            self.position = position
+
+    def close(self):
+        self.progress.close()
+
+
+def apply(filename, parameters=None):
+    return import_log(filename, parameters)
+
+
+def import_log(filename, parameters=None):
+    """
+    Imports an XES file into a log object, parsing the file only once.
+    Differently from the iterparse variant, the traces are not counted in advance:
+    the progress is reported on the bytes of the file that have been consumed
+
+    Parameters
+    ----------
+    filename:
+        Absolute filename
+    parameters
+        Parameters of the algorithm, including
+            Parameters.TIMESTAMP_SORT -> Specify if we should sort log by timestamp
+            Parameters.TIMESTAMP_KEY -> If sort is enabled, then sort the log by using this key
+            Parameters.REVERSE_SORT -> Specify in which direction the log should be sorted
+            Parameters.INSERT_TRACE_INDICES -> Specify if trace indexes should be added as event attribute for each event
+            Parameters.MAX_TRACES -> Specify the maximum number of traces to import from the log (read in order in the XML file)
+            Parameters.VECTORIZED_DATES -> Converts the dates of each attribute with Pandas (one call per offset)
+            after the traces are read, instead of parsing them one at a time (default: False)
+
+    Returns
+    -------
+    log : :class:`pm4py.log.log.EventLog`
+        A log
+    """
+    parameters = dict() if parameters is None else parameters
+
+    file_size = os.stat(filename).st_size
+
+    with open(filename, "rb") as f:
+        context = etree.iterparse(f, events=[_EVENT_START, _EVENT_END])
+
+        # make tqdm facultative
+        progress = None
+        if pkgutil.find_loader("tqdm"):
+            from tqdm.auto import tqdm
+            progress = _FileProgress(tqdm(total=file_size, unit="B", unit_scale=True,
+                                          desc="parsing log, consumed bytes :: "), f)
+
+        log = iterparse.import_from_context(context, parameters=parameters, progress=progress)
+
+        if progress is not None:
+            progress.update()
+            progress.close()
+        del context, progress
+
+    return log
@@ -0,0 +1,91 @@
+import gzip
+import random
+from enum import Enum
+
+from lxml import etree
+
+from pm4py.objects.log.importer.xes.variants import iterparse
+from pm4py.objects.log.log import EventLog
+from pm4py.util import exec_utils
+
+# ITERPARSE EVENTS
+_EVENT_END = 'end'
+_EVENT_START = 'start'
+
+
+class Parameters(Enum):
+    MAX_TRACES = "max_no_traces_to_import"
+    BATCH_SIZE = "batch_size"
+    SAMPLING_RATIO = "sampling_ratio"
+    RANDOM_SEED = "random_seed"
+
+
+def apply(filename, parameters=None):
+    """
+    Iterates over the traces of a XES file, without building the log in memory.
+    The traces are yielded as soon as they are parsed (or in lists of traces, if a batch size is provided)
+
+    Parameters
+    ----------
+    filename
+        Path of the XES file (.xes or .xes.gz)
+    parameters
+        Parameters of the algorithm, including
+            Parameters.MAX_TRACES -> Specify the maximum number of traces to yield
+            Parameters.BATCH_SIZE -> (if provided) yields lists of (at most) BATCH_SIZE traces instead of single traces
+            Parameters.SAMPLING_RATIO -> Probability for each trace of the file to be yielded (default: 1.0)
+            Parameters.RANDOM_SEED -> Seed of the random sampling of the traces
+
+    Returns
+    -------
+    traces
+        Generator of traces (or of lists of traces)
+    """
+    if parameters is None:
+        parameters = {}
+
+    batch_size = exec_utils.get_param_value(Parameters.BATCH_SIZE, parameters, None)
+
+    traces = __iterate_traces(filename, parameters)
+    if batch_size is None:
+        return traces
+    return __iterate_batches(traces, batch_size)
+
+
+def __iterate_traces(filename, parameters):
+    max_no_traces_to_import = exec_utils.get_param_value(Parameters.MAX_TRACES, parameters,
+                                                         iterparse.Parameters.MAX_TRACES.value)
+    sampling_ratio = exec_utils.get_param_value(Parameters.SAMPLING_RATIO, parameters, 1.0)
+    random_seed = exec_utils.get_param_value(Parameters.RANDOM_SEED, parameters, None)
+
+    if max_no_traces_to_import < 1:
+        return
+
+    rand = random.Random(random_seed)
+    no_traces = 0
+
+    # supporting .xes.gz file types: the content is decompressed on the fly
+    f = gzip.open(filename, "rb") if filename.endswith("gz") else open(filename, "rb")
+    try:
+        context = etree.iterparse(f, events=[_EVENT_START, _EVENT_END])
+        for trace in iterparse.iterate_from_context(context, EventLog()):
+            if sampling_ratio < 1.0 and rand.random() >= sampling_ratio:
+                continue
+            yield trace
+            no_traces += 1
+            if no_traces >= max_no_traces_to_import:
+                break
+        del context
+    finally:
+        f.close()
+
+
+def __iterate_batches(traces, batch_size):
+    batch = []
+    for trace in traces:
+        batch.append(trace)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
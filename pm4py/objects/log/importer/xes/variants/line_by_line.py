@@ -5,8 +5,10 @@ from pm4py.objects.log.importer.xes.parameters import Parameters
 from pm4py.objects.log.log import EventLog, Trace, Event
 from pm4py.objects.log.util import sorting
 from pm4py.objects.log.util import xes as xes_util
+from pm4py.util import exec_utils
 from pm4py.util import parameters as param_util
 from pm4py.util.dt_parsing import parser as dt_parser
+from pm4py.util.dt_parsing import vectorized as dt_vectorized
 
 
 class Parameters(Enum):
@@ -17,6 +19,7 @@ class Parameters(Enum):
     MAX_TRACES = 1000000000
     MAX_BYTES = 10000000000
     SKYP_BYTES = 0
+    VECTORIZED_DATES = "vectorized_dates"
 
 
 def apply(filename, parameters=None):
@@ -45,6 +48,8 @@ def import_log(filename, parameters=None):
             Parameters.MAX_TRACES -> Specify the maximum number of traces to import from the log (read in order in the XML file)
             Parameters.MAX_BYTES -> Maximum number of bytes to read
             Parameters.SKYP_BYTES -> Number of bytes to skip
+            Parameters.VECTORIZED_DATES -> Converts the dates of each attribute with Pandas (one call per offset)
+            after the traces are read, instead of parsing them one at a time (default: False)
 
 
     Returns
@@ -63,6 +68,8 @@ def import_log(filename, parameters=None):
     max_no_traces_to_import = param_util.fetch(Parameters.MAX_TRACES, parameters)
     skip_bytes = param_util.fetch(Parameters.SKYP_BYTES, parameters)
     max_bytes_to_read = param_util.fetch(Parameters.MAX_BYTES, parameters)
+    date_collector = dt_vectorized.DateCollector() if exec_utils.get_param_value(Parameters.VECTORIZED_DATES,
+                                                                                parameters, False) else None
 
     file_size = os.stat(filename).st_size
 
@@ -87,7 +94,10 @@ def import_log(filename, parameters=None):
                         if tag.startswith("string"):
                             event[content[1]] = content[3]
                         elif tag.startswith("date"):
-                            event[content[1]] = date_parser.apply(content[3])
+                            if date_collector is not None:
+                                date_collector.add(event, content[1], content[3])
+                            else:
+                                event[content[1]] = date_parser.apply(content[3])
                         elif tag.startswith("int"):
                             event[content[1]] = int(content[3])
                         elif tag.startswith("float"):
@@ -103,7 +113,10 @@ def import_log(filename, parameters=None):
                     if tag.startswith("string"):
                         trace.attributes[content[1]] = content[3]
                     elif tag.startswith("date"):
-                        trace.attributes[content[1]] = date_parser.apply(content[3])
+                        if date_collector is not None:
+                            date_collector.add(trace.attributes, content[1], content[3])
+                        else:
+                            trace.attributes[content[1]] = date_parser.apply(content[3])
                     elif tag.startswith("int"):
                         trace.attributes[content[1]] = int(content[3])
                     elif tag.startswith("float"):
@@ -120,6 +133,9 @@ def import_log(filename, parameters=None):
                 trace = Trace()
     f.close()
 
+    if date_collector is not None:
+        date_collector.convert(date_parser)
+
     if timestamp_sort:
         log = sorting.sort_timestamp(log, timestamp_key=timestamp_key, reverse_sort=reverse_sort)
     if insert_trace_indexes:
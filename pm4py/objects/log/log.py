@@ -3,12 +3,38 @@ import copy
 
 
 class Event(Mapping):
+    __slots__ = ('_dict',)
+
     def __init__(self, *args, **kw):
         self._dict = dict(*args, **kw)
 
+    @classmethod
+    def from_dict(cls, dictionary):
+        """
+        Creates an event adopting the provided dictionary (without copying it)
+        """
+        event = cls.__new__(cls)
+        event._dict = dictionary
+        return event
+
     def __getitem__(self, key):
         return self._dict[key]
 
+    def __contains__(self, key):
+        return key in self._dict
+
+    def get(self, key, default=None):
+        return self._dict.get(key, default)
+
+    def keys(self):
+        return self._dict.keys()
+
+    def items(self):
+        return self._dict.items()
+
+    def values(self):
+        return self._dict.values()
+
     def __setitem__(self, key, value):
         self._dict[key] = value
 
@@ -34,6 +60,7 @@ class Event(Mapping):
 
 
 class EventStream(Sequence):
+    __slots__ = ('_attributes', '_extensions', '_omni', '_classifiers', '_list', '_vocabularies')
 
     def __init__(self, *args, **kwargs):
         self._attributes = kwargs['attributes'] if 'attributes' in kwargs else {}
@@ -42,6 +69,22 @@ class EventStream(Sequence):
             'globals'] if 'globals' in kwargs else {}
         self._classifiers = kwargs['classifiers'] if 'classifiers' in kwargs else {}
         self._list = list(*args)
+        # activity vocabularies (see pm4py.objects.log.util.vocabulary), cached per activity key
+        self._vocabularies = {}
+
+    @classmethod
+    def from_list(cls, elements, attributes=None, extensions=None, omni_present=None, classifiers=None):
+        """
+        Creates an object adopting the provided list (without copying it)
+        """
+        stream = cls.__new__(cls)
+        stream._attributes = attributes if attributes is not None else {}
+        stream._extensions = extensions if extensions is not None else {}
+        stream._omni = omni_present if omni_present is not None else {}
+        stream._classifiers = classifiers if classifiers is not None else {}
+        stream._list = elements
+        stream._vocabularies = {}
+        return stream
 
     def __hash__(self):
         return hash(tuple(self))
@@ -104,11 +147,22 @@ class EventStream(Sequence):
 
 
 class Trace(Sequence):
+    __slots__ = ('_attributes', '_list')
 
     def __init__(self, *args, **kwargs):
-        self._set_attributes(kwargs['attributes'] if 'attributes' in kwargs else {})
+        self._attributes = kwargs['attributes'] if 'attributes' in kwargs else {}
         self._list = list(*args)
 
+    @classmethod
+    def from_list(cls, events, attributes=None):
+        """
+        Creates a trace adopting the provided list of events (without copying it)
+        """
+        trace = cls.__new__(cls)
+        trace._attributes = attributes if attributes is not None else {}
+        trace._list = events
+        return trace
+
     def __hash__(self):
         return hash(tuple(self))
 
@@ -172,6 +226,8 @@ class Trace(Sequence):
 
 
 class EventLog(EventStream):
+    __slots__ = ()
+
     def __init__(self, *args, **kwargs):
         super(EventLog, self).__init__(*args, **kwargs)
 
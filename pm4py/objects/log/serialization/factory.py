@@ -1,27 +1,41 @@
-import pyarrow
 import deprecation
 
-from pm4py.objects.log.serialization.versions import parquet_dataframe, pyarrow_event_stream, pyarrow_event_log
+from pm4py.objects.log.serialization.versions import parquet_dataframe, binary_event_log
 from pm4py.objects.log.log import EventLog, EventStream
 import pandas as pd
 
 PYARROW_EVENT_STREAM="pyarrow_event_stream"
 PYARROW_EVENT_LOG="pyarrow_event_log"
 PARQUET_DATAFRAME="parquet_dataframe"
+BINARY_EVENT_LOG="binary_event_log"
 
 DEFAULT_EVENT_STREAM=PYARROW_EVENT_STREAM
 DEFAULT_EVENT_LOG=PYARROW_EVENT_LOG
 DEFAULT_DATAFRAME=PARQUET_DATAFRAME
 
 
-VERSIONS_APPLY_EVENT_STREAM={PYARROW_EVENT_STREAM: pyarrow_event_stream.apply}
-VERSIONS_APPLY_EVENT_LOG={PYARROW_EVENT_LOG: pyarrow_event_log.apply}
+VERSIONS_APPLY_EVENT_STREAM={}
+VERSIONS_APPLY_EVENT_LOG={BINARY_EVENT_LOG: binary_event_log.apply}
 VERSIONS_APPLY_DATAFRAME={PARQUET_DATAFRAME: parquet_dataframe.apply}
 
-VERSIONS_EXPORT_FILE_EVENT_STREAM={PYARROW_EVENT_STREAM: pyarrow_event_stream.export_to_file}
-VERSIONS_EXPORT_FILE_EVENT_LOG={PYARROW_EVENT_LOG: pyarrow_event_log.export_to_file}
+VERSIONS_EXPORT_FILE_EVENT_STREAM={}
+VERSIONS_EXPORT_FILE_EVENT_LOG={BINARY_EVENT_LOG: binary_event_log.export_to_file}
 VERSIONS_EXPORT_FILE_DATAFRAME={PARQUET_DATAFRAME: parquet_dataframe.export_to_file}
 
+try:
+    import pyarrow
+    from pm4py.objects.log.serialization.versions import pyarrow_event_stream, pyarrow_event_log
+
+    VERSIONS_APPLY_EVENT_STREAM[PYARROW_EVENT_STREAM] = pyarrow_event_stream.apply
+    VERSIONS_APPLY_EVENT_LOG[PYARROW_EVENT_LOG] = pyarrow_event_log.apply
+    VERSIONS_EXPORT_FILE_EVENT_STREAM[PYARROW_EVENT_STREAM] = pyarrow_event_stream.export_to_file
+    VERSIONS_EXPORT_FILE_EVENT_LOG[PYARROW_EVENT_LOG] = pyarrow_event_log.export_to_file
+except ImportError:
+    # Pyarrow is not installed (or cannot be imported): the event logs are serialized in the binary format
+    DEFAULT_EVENT_LOG=BINARY_EVENT_LOG
+    # no variant is available for the event streams
+    DEFAULT_EVENT_STREAM=None
+
 @deprecation.deprecated(deprecated_in='1.3.0', removed_in='2.0.0', current_version='',
                         details='Use serializer module instead.')
 def apply(log, variant=None, parameters=None):
@@ -33,7 +47,7 @@ def apply(log, variant=None, parameters=None):
     log
         Event log
     variant
-        Variant of the algorithm, possible values: pyarrow_event_stream, pyarrow_event_log, parquet_dataframe
+        Variant of the algorithm, possible values: pyarrow_event_stream, pyarrow_event_log, parquet_dataframe, binary_event_log
     parameters
         Possible parameters of the algorithm
 
@@ -42,13 +56,15 @@ def apply(log, variant=None, parameters=None):
     serialization
         Serialized bytes
     """
-    if type(log) is EventLog:
+    if isinstance(log, EventLog):
         if variant is None:
             variant=DEFAULT_EVENT_LOG
         return VERSIONS_APPLY_EVENT_LOG[variant](log, parameters=parameters)
     elif type(log) is EventStream:
         if variant is None:
             variant=DEFAULT_EVENT_STREAM
+            if variant is None:
+                raise Exception("no serialization variant is available for the event streams (Pyarrow is needed)")
         return VERSIONS_APPLY_EVENT_STREAM[variant](log, parameters=parameters)
     elif type(log) is pd.DataFrame:
         if variant is None:
@@ -68,7 +84,7 @@ def export_to_file(log, file_path, variant=None, parameters=None):
     file_path
         File path  (if None, then a temp file is targeted)
     variant
-        Variant of the algorithm, possible values: pyarrow_event_stream, pyarrow_event_log, parquet_dataframe
+        Variant of the algorithm, possible values: pyarrow_event_stream, pyarrow_event_log, parquet_dataframe, binary_event_log
     parameters
         Possible parameters of the algorithm
 
@@ -77,13 +93,15 @@ def export_to_file(log, file_path, variant=None, parameters=None):
     file_path
         File path
     """
-    if type(log) is EventLog:
+    if isinstance(log, EventLog):
         if variant is None:
             variant=DEFAULT_EVENT_LOG
         return VERSIONS_EXPORT_FILE_EVENT_LOG[variant](log, file_path, parameters=parameters)
     elif type(log) is EventStream:
         if variant is None:
             variant=DEFAULT_EVENT_STREAM
+            if variant is None:
+                raise Exception("no serialization variant is available for the event streams (Pyarrow is needed)")
         return VERSIONS_EXPORT_FILE_EVENT_STREAM[variant](log, file_path, parameters=parameters)
     elif type(log) is pd.DataFrame:
         if variant is None:
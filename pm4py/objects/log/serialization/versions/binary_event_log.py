@@ -0,0 +1,227 @@
+import datetime
+import io
+import json
+
+import numpy as np
+
+from pm4py.objects.conversion.log.variants import to_columnar_log
+from pm4py.objects.log import columnar
+
+# the file starts with the magic bytes, followed by the offset and the length (unsigned 64 bit integers) of the header.
+# the blocks (NumPy arrays) follow, each aligned to BLOCK_ALIGNMENT bytes, and then the header (JSON, UTF-8 encoded).
+# the header contains only the layout of the blocks and the log-level information: the content of the columns
+# and the attributes of the traces are stored in the blocks, hence no pickled data is contained in the file
+MAGIC = b"PM4PYBEL"
+FORMAT_VERSION = 2
+BLOCK_ALIGNMENT = 64
+
+DICTIONARY_COLUMN = "dictionary"
+TIMESTAMP_COLUMN = "timestamp"
+OBJECT_COLUMN = "object"
+
+# the vocabularies of the dictionary columns are stored as a block of integers/floats/booleans (native values),
+# or as a sequence of strings (UTF-8 encoded) or of JSON-encoded values (see encode_value)
+NATIVE_VALUES = "native"
+STRING_VALUES = "string"
+JSON_VALUES = "json"
+
+# types of the vocabularies that are stored as native blocks
+NATIVE_DTYPES = {bool: np.bool_, int: np.int64, float: np.float64}
+
+# tags of the JSON-encoded values that are not native JSON values
+_TAG = "t"
+_VALUE = "v"
+_DATETIME = "datetime"
+_DICT = "dict"
+_LIST = "list"
+_TUPLE = "tuple"
+
+
+def encode_value(value):
+    """
+    Encodes an attribute value as a JSON value. Strings, numbers, booleans and None are stored as they are;
+    datetimes, dictionaries, lists and tuples are stored as JSON objects tagged with their type
+
+    Parameters
+    --------------
+    value
+        Value
+
+    Returns
+    --------------
+    encoded_value
+        JSON-serializable value
+    """
+    if value is None or type(value) in (str, bool, int, float):
+        return value
+    if isinstance(value, datetime.datetime):
+        return {_TAG: _DATETIME, _VALUE: value.isoformat()}
+    if isinstance(value, dict):
+        return {_TAG: _DICT, _VALUE: [[encode_value(k), encode_value(v)] for k, v in value.items()]}
+    if isinstance(value, list):
+        return {_TAG: _LIST, _VALUE: [encode_value(v) for v in value]}
+    if isinstance(value, tuple):
+        return {_TAG: _TUPLE, _VALUE: [encode_value(v) for v in value]}
+    if isinstance(value, np.generic):
+        return encode_value(value.item())
+    raise TypeError("values of type " + type(value).__name__ + " cannot be stored in the binary event log")
+
+
+def encode_timezone(tz):
+    """
+    Encodes the timezone of a timestamp column: fixed offsets are stored as seconds from UTC,
+    the other timezones by their name
+    """
+    if tz is None:
+        return None
+    offset = tz.utcoffset(None)
+    if offset is not None:
+        return {"offset": offset.total_seconds()}
+    return {"name": str(tz)}
+
+
+def __write_block(F, array, position):
+    """
+    Writes a block (aligned to BLOCK_ALIGNMENT) and returns its descriptor and the position after the block
+    """
+    padding = (-position) % BLOCK_ALIGNMENT
+    F.write(b"\0" * padding)
+    position += padding
+    array = np.ascontiguousarray(array)
+    F.write(array.tobytes())
+    return [position, array.dtype.str, len(array)], position + array.nbytes
+
+
+def __add_sequence(arrays, values):
+    """
+    Adds the blocks of a sequence of byte strings (the offsets of the values, and their concatenation)
+    and returns the indexes of the blocks
+    """
+    arrays.append(np.cumsum([0] + [len(x) for x in values], dtype=np.int64))
+    arrays.append(np.frombuffer(b"".join(values), dtype=np.uint8))
+    return [len(arrays) - 2, len(arrays) - 1]
+
+
+def __add_vocabulary(arrays, vocabulary):
+    """
+    Adds the blocks of the vocabulary of a dictionary column, and returns its descriptor
+    """
+    types = set(type(v) for v in vocabulary)
+    if len(types) == 1:
+        t = next(iter(types))
+        if t in NATIVE_DTYPES:
+            try:
+                arrays.append(np.array(vocabulary, dtype=NATIVE_DTYPES[t]))
+                return [NATIVE_VALUES, len(arrays) - 1]
+            except OverflowError:
+                # integers not representable on 64 bits
+                pass
+        elif t is str:
+            return [STRING_VALUES] + __add_sequence(arrays, [v.encode("utf-8", "surrogatepass") for v in vocabulary])
+    return [JSON_VALUES] + __add_sequence(arrays, [json.dumps(encode_value(v)).encode("utf-8") for v in vocabulary])
+
+
+def write(log, F, parameters=None):
+    """
+    Writes a log in the binary format to a (binary) file object
+
+    Parameters
+    --------------
+    log
+        Event log (or event stream, or Pandas dataframe)
+    F
+        File object
+    parameters
+        Possible parameters of the algorithm
+    """
+    if parameters is None:
+        parameters = {}
+
+    log = to_columnar_log.apply(log, parameters=parameters)
+
+    header = {"version": FORMAT_VERSION, "attributes": encode_value(dict(log.attributes)),
+              "extensions": encode_value(dict(log.extensions)), "omni_present": encode_value(dict(log.omni_present)),
+              "classifiers": encode_value(dict(log.classifiers)), "columns": []}
+    arrays = [log.case_offsets]
+    # the attributes of each trace are encoded separately, so that they can be decoded on access
+    header["trace_attributes"] = __add_sequence(arrays, [json.dumps(encode_value(dict(attr))).encode("utf-8")
+                                                         for attr in log.trace_attributes])
+    for key, column in log.columns.items():
+        if type(column) is columnar.DictionaryColumn:
+            arrays.append(np.asarray(column.codes, dtype=np.int32))
+            header["columns"].append([encode_value(key), DICTIONARY_COLUMN, len(arrays) - 1,
+                                      __add_vocabulary(arrays, column.vocabulary)])
+        elif type(column) is columnar.TimestampColumn:
+            arrays.append(np.asarray(column.values, dtype=np.int64))
+            header["columns"].append([encode_value(key), TIMESTAMP_COLUMN, len(arrays) - 1,
+                                      encode_timezone(column.tz)])
+        else:
+            # the events that do not have the attribute have an empty value
+            values = [b"" if v is columnar.NOT_PRESENT else json.dumps(encode_value(v)).encode("utf-8")
+                      for v in column.values]
+            header["columns"].append([encode_value(key), OBJECT_COLUMN] + __add_sequence(arrays, values))
+
+    F.write(MAGIC)
+    F.write(b"\0" * 16)
+    position = len(MAGIC) + 16
+    blocks = []
+    for array in arrays:
+        descriptor, position = __write_block(F, array, position)
+        blocks.append(descriptor)
+    header["blocks"] = blocks
+    encoded_header = json.dumps(header).encode("utf-8")
+    F.write(encoded_header)
+    F.seek(len(MAGIC))
+    F.write(np.array([position, len(encoded_header)], dtype=np.uint64).tobytes())
+
+
+def apply(log, parameters=None):
+    """
+    Serialize a log object to bytes in the binary format
+
+    Parameters
+    --------------
+    log
+        Event log
+    parameters
+        Possible parameters of the algorithm
+
+    Returns
+    --------------
+    serialization
+        Serialized bytes
+    """
+    buffer = io.BytesIO()
+    write(log, buffer, parameters=parameters)
+    return buffer.getvalue()
+
+
+def export_to_file(log, file_path, parameters=None):
+    """
+    Serialize a log object to a file in the binary format (that can be memory-mapped on import)
+
+    Parameters
+    --------------
+    log
+        Event log
+    file_path
+        File path (if None, then a temp file is targeted)
+    parameters
+        Possible parameters of the algorithm
+
+    Returns
+    --------------
+    file_path
+        File path
+    """
+    if file_path is None:
+        import tempfile
+        file_path = tempfile.NamedTemporaryFile(suffix=".bel")
+        file_path.close()
+        file_path = file_path.name
+
+    F = open(file_path, "wb")
+    write(log, F, parameters=parameters)
+    F.close()
+
+    return file_path
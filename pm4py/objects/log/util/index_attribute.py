@@ -13,7 +13,7 @@ def insert_event_index_as_event_attribute(stream, event_index_attr_name="@@event
         Attribute name given to the event index
     """
 
-    if not type(stream) is EventLog:
+    if not isinstance(stream, EventLog):
         for i in range(0, len(stream._list)):
             stream._list[i][event_index_attr_name] = i + 1
 
@@ -30,7 +30,7 @@ def insert_time_from_previous(log, parameters=None):
     worktiming = parameters["worktiming"] if "worktiming" in parameters else [7, 17]
     weekends = parameters["weekends"] if "weekends" in parameters else [6, 7]
 
-    if not type(log) is EventLog:
+    if not isinstance(log, EventLog):
         log = log_converter.apply(log)
 
     log = sorting.sort_timestamp_log(log, timestamp_key)
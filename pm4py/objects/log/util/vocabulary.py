@@ -0,0 +1,112 @@
+from pm4py.objects.log.columnar import ColumnarEventLog, MISSING_CODE
+from pm4py.objects.log.log import EventStream
+from pm4py.util import xes_constants as xes
+
+
+def get_vocabulary(log, activity_key=xes.DEFAULT_NAME_KEY):
+    """
+    Gets the vocabulary of the activities of the log, i.e. a dictionary associating to each activity an integer code.
+    The vocabulary is computed once and cached on the log object; it is append-only (activities that are not yet
+    in the vocabulary get the next code when they are encoded), hence the codes stay valid when the log changes
+
+    Parameters
+    -------------
+    log
+        Log (or iterable of traces)
+    activity_key
+        Attribute to use as activity
+
+    Returns
+    -------------
+    vocabulary
+        Dictionary associating to each activity its code
+    """
+    if isinstance(log, ColumnarEventLog):
+        codes, activities = log.get_codes(activity_key)
+        if codes is not None:
+            return {activity: code for code, activity in enumerate(activities)}
+    elif isinstance(log, EventStream):
+        if activity_key not in log._vocabularies:
+            log._vocabularies[activity_key] = {}
+        return log._vocabularies[activity_key]
+    return {}
+
+
+def get_activities(vocabulary):
+    """
+    Gets the list of activities of a vocabulary (the i-th element is the activity having code i)
+    """
+    activities = [None] * len(vocabulary)
+    for activity, code in vocabulary.items():
+        activities[code] = activity
+    return activities
+
+
+def encode_trace(trace, vocabulary, activity_key=xes.DEFAULT_NAME_KEY):
+    """
+    Encodes a trace as the tuple of the codes of its activities (the events without the activity are skipped)
+
+    Parameters
+    -------------
+    trace
+        Trace
+    vocabulary
+        Vocabulary (activities that are not contained are added)
+    activity_key
+        Attribute to use as activity
+
+    Returns
+    -------------
+    encoded_trace
+        Tuple of activity codes
+    """
+    encoded = []
+    for event in trace:
+        if activity_key in event:
+            activity = event[activity_key]
+            code = vocabulary.get(activity)
+            if code is None:
+                code = len(vocabulary)
+                vocabulary[activity] = code
+            encoded.append(code)
+    return tuple(encoded)
+
+
+def get_encoded_variants_trace_idx(log, activity_key=xes.DEFAULT_NAME_KEY):
+    """
+    Gets the variants of the log, expressed as tuples of activity codes, along with the indexes of their traces
+
+    Parameters
+    -------------
+    log
+        Log (or iterable of traces)
+    activity_key
+        Attribute to use as activity
+
+    Returns
+    -------------
+    variants
+        Dictionary associating to each encoded variant the list of indexes of its traces
+    activities
+        List of activities (the i-th element is the activity having code i)
+    """
+    variants = {}
+    if isinstance(log, ColumnarEventLog):
+        codes, activities = log.get_codes(activity_key)
+        if codes is not None:
+            # the codes of the column are read directly
+            offsets = log.case_offsets.tolist()
+            for trace_idx in range(len(offsets) - 1):
+                trace_codes = codes[offsets[trace_idx]:offsets[trace_idx + 1]]
+                variant = tuple(trace_codes[trace_codes != MISSING_CODE].tolist())
+                if variant not in variants:
+                    variants[variant] = []
+                variants[variant].append(trace_idx)
+            return variants, activities
+    vocabulary = get_vocabulary(log, activity_key=activity_key)
+    for trace_idx, trace in enumerate(log):
+        variant = encode_trace(trace, vocabulary, activity_key=activity_key)
+        if variant not in variants:
+            variants[variant] = []
+        variants[variant].append(trace_idx)
+    return variants, get_activities(vocabulary)
@@ -170,6 +170,182 @@ def __compute_exact_heuristic_new_version(sync_net, a_matrix, h_cvx, g_matrix, c
     return prim_obj, points
 
 
+class StateEquationHeuristic(object):
+    """
+    State equation of a synchronous product net, built once and solved for the different markings reached
+    during the search: the constraint matrices and the costs are kept, and only the right-hand side
+    (final marking minus the current marking) changes between the problems. The solutions are cached by marking
+    """
+
+    def __init__(self, sync_net, incidence_matrix, cost_vec, fin_vec, variant, use_cvxopt=False):
+        """
+        Constructor
+
+        Parameters
+        -------------
+        sync_net
+            Synchronous product net
+        incidence_matrix
+            Incidence matrix of the synchronous product net
+        cost_vec
+            Vector of the costs of the transitions (ordered as in the incidence matrix)
+        fin_vec
+            Final marking (encoded as in the incidence matrix)
+        variant
+            Variant of the LP solver
+        use_cvxopt
+            Boolean value that tells if the constraints shall be provided as CVXOPT matrices
+        """
+        n = len(sync_net.transitions)
+        self.incidence_matrix = incidence_matrix
+        self.fin_vec = np.asarray(fin_vec, dtype=np.float64)
+        self.variant = variant
+        self.use_cvxopt = use_cvxopt
+        self.n_transitions = n
+        self.cache = {}
+        a_matrix = np.asarray(incidence_matrix.a_matrix, dtype=np.float64)
+        if variant == lp_solver.SCIPY_SOLVER:
+            # the sparse representation is built once and is then provided as it is to the solver
+            from scipy import sparse
+            self.a_matrix = sparse.csr_matrix(a_matrix)
+            self.g_matrix = -sparse.identity(n, dtype=np.float64, format="csr")
+            self.h_cvx = np.zeros(n)
+            self.cost_vec = np.asarray(cost_vec, dtype=np.float64)
+        elif use_cvxopt:
+            # not available in the latest version of PM4Py
+            from cvxopt import matrix
+            self.a_matrix = matrix(np.asmatrix(a_matrix))
+            self.g_matrix = matrix(-np.eye(n))
+            self.h_cvx = matrix(np.matrix(np.zeros(n)).transpose())
+            self.cost_vec = matrix([x * 1.0 for x in cost_vec])
+        else:
+            self.a_matrix = np.asmatrix(a_matrix)
+            self.g_matrix = -np.eye(n)
+            self.h_cvx = np.matrix(np.zeros(n)).transpose()
+            self.cost_vec = [x * 1.0 for x in cost_vec]
+
+    def compute(self, marking):
+        """
+        Computes the exact heuristics (solution of the state equation) for the given marking
+
+        Parameters
+        -------------
+        marking
+            Marking of the synchronous product net (or tuple of token counts, indexed as the places
+            of the incidence matrix)
+
+        Returns
+        -------------
+        h
+            Heuristics value (sys.maxsize if the final marking cannot be reached according to the state equation)
+        x
+            Solution vector
+        """
+        if marking in self.cache:
+            h, x = self.cache[marking]
+            return h, list(x)
+
+        m_vec = self.incidence_matrix.encode_marking(marking) if isinstance(marking, Marking) else marking
+        b_term = self.fin_vec - np.asarray(m_vec, dtype=np.float64)
+        if self.variant != lp_solver.SCIPY_SOLVER:
+            b_term = np.matrix(b_term).transpose()
+            if self.use_cvxopt:
+                from cvxopt import matrix
+                b_term = matrix(b_term)
+
+        parameters_solving = {"solver": "glpk"}
+
+        sol = lp_solver.apply(self.cost_vec, self.g_matrix, self.h_cvx, self.a_matrix, b_term,
+                              parameters=parameters_solving, variant=self.variant)
+        prim_obj = lp_solver.get_prim_obj_from_sol(sol, variant=self.variant)
+        points = lp_solver.get_points_from_sol(sol, variant=self.variant)
+
+        prim_obj = prim_obj if prim_obj is not None else sys.maxsize
+        points = points if points is not None else [0.0] * self.n_transitions
+
+        self.cache[marking] = (prim_obj, tuple(points))
+        return prim_obj, points
+
+
+class VectorizedNet(object):
+    """
+    Representation of a (decorated) Petri net for the search of alignments: the markings are tuples of token counts
+    (indexed by place), and each transition is associated to its preset and to its (sparse) delta vector,
+    so that checking the enabling and firing a transition do not require to build intermediate markings.
+    The transitions are identified by their index in the transitions list; the conversion from/to Marking objects
+    happens only at the boundaries of the search
+    """
+
+    def __init__(self, net, place_indices=None, transition_indices=None):
+        """
+        Constructor
+
+        Parameters
+        -------------
+        net
+            Petri net (the transitions shall be decorated with sub_marking and add_marking)
+        place_indices
+            (If provided) index of each place in the vectors (e.g. as in the incidence matrix)
+        transition_indices
+            (If provided) index of each transition (e.g. as in the incidence matrix)
+        """
+        if place_indices is None:
+            place_indices = {p: i for i, p in enumerate(net.places)}
+        if transition_indices is None:
+            transition_indices = {t: i for i, t in enumerate(net.transitions)}
+        self.place_indices = place_indices
+        self.places = [None] * len(place_indices)
+        for p, i in place_indices.items():
+            self.places[i] = p
+        self.transitions = [None] * len(transition_indices)
+        for t, i in transition_indices.items():
+            self.transitions[i] = t
+        self.pre = [tuple((place_indices[p], n) for p, n in t.sub_marking.items()) for t in self.transitions]
+        self.delta = [tuple((place_indices[p], n) for p, n in t.add_marking.items() if n != 0) for t in
+                      self.transitions]
+        consumers = [[] for p in self.places]
+        for j, pre in enumerate(self.pre):
+            for i, n in pre:
+                consumers[i].append(j)
+        self.consumers = [tuple(c) for c in consumers]
+        self.empty_preset = tuple(j for j, pre in enumerate(self.pre) if len(pre) == 0)
+
+    def encode(self, marking):
+        """
+        Encodes a marking as tuple of token counts
+        """
+        m = [0] * len(self.places)
+        for p, n in marking.items():
+            m[self.place_indices[p]] = n
+        return tuple(m)
+
+    def decode(self, m):
+        """
+        Decodes a tuple of token counts to a marking
+        """
+        return Marking({self.places[i]: n for i, n in enumerate(m) if n > 0})
+
+    def enabled_transitions(self, m):
+        """
+        Gets the indexes of the transitions that are enabled in the marking
+        """
+        candidates = set(self.empty_preset)
+        for i, n in enumerate(m):
+            if n > 0:
+                candidates.update(self.consumers[i])
+        pre = self.pre
+        return [j for j in candidates if all(m[i] >= n for i, n in pre[j])]
+
+    def fire(self, m, j):
+        """
+        Fires the transition (of the given index) in the marking, returning the new marking
+        """
+        m = list(m)
+        for i, n in self.delta[j]:
+            m[i] += n
+        return tuple(m)
+
+
 def __get_tuple_from_queue(marking, queue):
     for t in queue:
         if t.m == marking:
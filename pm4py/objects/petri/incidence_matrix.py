@@ -1,7 +1,11 @@
 class IncidenceMatrix(object):
 
-    def __init__(self, net):
-        self.__A, self.__place_indices, self.__transition_indices = self.__construct_matrix(net)
+    def __init__(self, net, a_matrix=None, place_indices=None, transition_indices=None):
+        if a_matrix is not None:
+            # the matrix (and the indices of the places and the transitions) is already known
+            self.__A, self.__place_indices, self.__transition_indices = a_matrix, place_indices, transition_indices
+        else:
+            self.__A, self.__place_indices, self.__transition_indices = self.__construct_matrix(net)
 
     def encode_marking(self, marking):
         x = [0 for i in range(len(self.places))]
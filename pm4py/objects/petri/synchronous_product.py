@@ -1,3 +1,7 @@
+import weakref
+
+import numpy as np
+
 from pm4py.objects import petri
 
 
@@ -131,3 +135,241 @@ def __copy_into(source_net, target_net, upper, skip):
             petri.utils.add_arc_from_to(t_map[t], p_map[a.target], target_net)
 
     return t_map, p_map
+
+
+class SyncProductSkeleton(object):
+    """
+    Model half of the synchronous product nets of a Petri net (along with the incidence columns, the costs and
+    the pre/post sets of the model moves), computed once and reused for every trace: the synchronous product net
+    of a trace is obtained adding only the trace part and the synchronous transitions.
+
+    The skeleton stores only the indexes, the names and the costs of the places and of the transitions of the
+    Petri net (along with weak references to the Petri net and to its places and transitions), and is not modified
+    after its construction: the places and the transitions of each synchronous product net are created by construct.
+    The transitions of the returned nets are already decorated (sub_marking, add_marking) as well as the places
+    (ass_trans), while the arcs are not materialized
+    """
+
+    def __init__(self, net, im, fm, skip, model_costs, sync_costs):
+        """
+        Constructor
+
+        Parameters
+        -------------
+        net
+            Petri net
+        im
+            Initial marking
+        fm
+            Final marking
+        skip
+            Symbol to be used as skip
+        model_costs
+            Dictionary mapping the transitions of the Petri net to the costs of the model moves
+        sync_costs
+            Dictionary mapping the transitions of the Petri net to the costs of the sync moves
+        """
+        places = list(net.places)
+        transitions = list(net.transitions)
+        place_index = {p: i for i, p in enumerate(places)}
+        self.net = weakref.ref(net)
+        self.places_refs = [weakref.ref(p) for p in places]
+        self.transitions_refs = [weakref.ref(t) for t in transitions]
+        self.no_arcs = len(net.arcs)
+        self.skip = skip
+        self.im = self.__encode_marking(im, place_index)
+        self.fm = self.__encode_marking(fm, place_index)
+        self.model_costs = tuple(model_costs.get(t) for t in transitions)
+        self.sync_costs = tuple(sync_costs.get(t) for t in transitions)
+
+        self.places_names = [p.name for p in places]
+        self.transitions_names = [t.name for t in transitions]
+        self.transitions_labels = [t.label for t in transitions]
+        self.preset = []
+        self.postset = []
+        self.a_matrix = np.zeros((len(places), len(transitions)))
+        self.transitions_by_label = {}
+        for j, t in enumerate(transitions):
+            self.preset.append(tuple(place_index[a.source] for a in t.in_arcs))
+            self.postset.append(tuple(place_index[a.target] for a in t.out_arcs))
+            for i in self.preset[j]:
+                self.a_matrix[i, j] -= 1
+            for i in self.postset[j]:
+                self.a_matrix[i, j] += 1
+            if t.label not in self.transitions_by_label:
+                self.transitions_by_label[t.label] = []
+            self.transitions_by_label[t.label].append(j)
+
+    @staticmethod
+    def __encode_marking(marking, place_index):
+        """
+        Encodes a marking as a sorted tuple of (place index, tokens) pairs (None if a place is not in the net)
+        """
+        if any(p not in place_index for p in marking):
+            return None
+        return tuple(sorted((place_index[p], n) for p, n in marking.items()))
+
+    def is_valid_for(self, net, im, fm, skip, model_costs, sync_costs):
+        """
+        Checks if the skeleton can be used for the given Petri net, markings and costs
+        """
+        if self.net() is not net or self.skip != skip or self.no_arcs != len(net.arcs) or \
+                len(self.places_refs) != len(net.places) or len(self.transitions_refs) != len(net.transitions):
+            return False
+        places = list(net.places)
+        transitions = list(net.transitions)
+        if any(r() is not p for r, p in zip(self.places_refs, places)) or \
+                any(r() is not t for r, t in zip(self.transitions_refs, transitions)):
+            return False
+        place_index = {p: i for i, p in enumerate(places)}
+        return self.im == self.__encode_marking(im, place_index) and self.fm == self.__encode_marking(
+            fm, place_index) and self.model_costs == tuple(model_costs.get(t) for t in transitions) and \
+               self.sync_costs == tuple(sync_costs.get(t) for t in transitions)
+
+    def construct(self, trace_net, trace_im, trace_fm, trace_costs):
+        """
+        Constructs the synchronous product net between a trace net and the Petri net of the skeleton.
+        All the places and the transitions of the synchronous product net are new objects, so the skeleton
+        can be used concurrently
+
+        Parameters
+        -------------
+        trace_net
+            Trace net
+        trace_im
+            Initial marking of the trace net
+        trace_fm
+            Final marking of the trace net
+        trace_costs
+            Dictionary mapping the transitions of the trace net to the costs of the log moves
+
+        Returns
+        -------------
+        sync_net
+            Synchronous product net (decorated, without arcs)
+        sync_im
+            Initial marking of the synchronous product net
+        sync_fm
+            Final marking of the synchronous product net
+        costs
+            Dictionary mapping the transitions of the synchronous product net to their costs
+        incidence_matrix
+            Incidence matrix of the synchronous product net
+        """
+        skip = self.skip
+        model_places = [petri.petrinet.PetriNet.Place((skip, name)) for name in self.places_names]
+        trace_places_map = {p: petri.petrinet.PetriNet.Place((p.name, skip)) for p in trace_net.places}
+        places = model_places + list(trace_places_map.values())
+        place_index = {p: i for i, p in enumerate(places)}
+        for p in places:
+            p.ass_trans = set()
+
+        # columns of the model moves, of the trace part and of the synchronous transitions:
+        # (transition, preset, postset, model index)
+        columns = []
+        costs = {}
+        for j in range(len(self.transitions_names)):
+            model_move = petri.petrinet.PetriNet.Transition((skip, self.transitions_names[j]),
+                                                            (skip, self.transitions_labels[j]))
+            costs[model_move] = self.model_costs[j]
+            columns.append((model_move, [model_places[i] for i in self.preset[j]],
+                            [model_places[i] for i in self.postset[j]], j))
+        for t1 in trace_net.transitions:
+            preset = [trace_places_map[a.source] for a in t1.in_arcs]
+            postset = [trace_places_map[a.target] for a in t1.out_arcs]
+            trace_move = petri.petrinet.PetriNet.Transition((t1.name, skip), (t1.label, skip))
+            costs[trace_move] = trace_costs[t1]
+            columns.append((trace_move, preset, postset, None))
+            for j in self.transitions_by_label.get(t1.label, []):
+                sync = petri.petrinet.PetriNet.Transition((t1.name, self.transitions_names[j]),
+                                                          (t1.label, self.transitions_labels[j]))
+                costs[sync] = self.sync_costs[j]
+                columns.append((sync, preset + [model_places[i] for i in self.preset[j]],
+                                postset + [model_places[i] for i in self.postset[j]], j))
+
+        transitions = []
+        a_matrix = np.zeros((len(places), len(columns)))
+        for t, preset, postset, j in columns:
+            col = len(transitions)
+            transitions.append(t)
+            if j is not None:
+                a_matrix[:len(model_places), col] = self.a_matrix[:, j]
+            for p in preset:
+                p.ass_trans.add(t)
+                if place_index[p] >= len(model_places):
+                    a_matrix[place_index[p], col] -= 1
+            for p in postset:
+                if place_index[p] >= len(model_places):
+                    a_matrix[place_index[p], col] += 1
+            self.__decorate_transition(t, preset, postset)
+
+        net = self.net()
+        sync_net = petri.petrinet.PetriNet('synchronous_product_net of %s and %s' % (
+            trace_net.name, net.name if net is not None else ""), places=set(places), transitions=set(transitions))
+        sync_im = petri.petrinet.Marking({model_places[i]: n for i, n in self.im})
+        sync_fm = petri.petrinet.Marking({model_places[i]: n for i, n in self.fm})
+        for p in trace_im:
+            sync_im[trace_places_map[p]] = trace_im[p]
+        for p in trace_fm:
+            sync_fm[trace_places_map[p]] = trace_fm[p]
+        incidence_matrix = petri.incidence_matrix.IncidenceMatrix(
+            sync_net, a_matrix=a_matrix, place_indices=place_index,
+            transition_indices={t: i for i, t in enumerate(transitions)})
+
+        return sync_net, sync_im, sync_fm, costs, incidence_matrix
+
+    @staticmethod
+    def __decorate_transition(t, preset, postset):
+        """
+        Decorates a transition of the synchronous product net with the sub and addition markings
+        (as decorate_transitions_prepostset, for arcs of weight 1)
+        """
+        sub_marking = petri.petrinet.Marking()
+        add_marking = petri.petrinet.Marking()
+        for p in preset:
+            sub_marking[p] = 1
+            add_marking[p] = -1
+        for p in postset:
+            if p in add_marking:
+                add_marking[p] = 1 + add_marking[p]
+            else:
+                add_marking[p] = 1
+        t.sub_marking = sub_marking
+        t.add_marking = add_marking
+
+
+# skeletons of the synchronous product nets, computed for each Petri net (the skeletons hold only weak references
+# to the Petri nets, so an entry is discarded when its Petri net is garbage collected)
+__skeletons = weakref.WeakKeyDictionary()
+
+
+def get_skeleton(net, im, fm, skip, model_costs, sync_costs):
+    """
+    Gets the skeleton of the synchronous product nets of a Petri net (computed on the first request, and
+    recomputed only when the Petri net, the markings or the costs change)
+
+    Parameters
+    -------------
+    net
+        Petri net
+    im
+        Initial marking
+    fm
+        Final marking
+    skip
+        Symbol to be used as skip
+    model_costs
+        Dictionary mapping the transitions of the Petri net to the costs of the model moves
+    sync_costs
+        Dictionary mapping the transitions of the Petri net to the costs of the sync moves
+
+    Returns
+    -------------
+    skeleton
+        Skeleton of the synchronous product nets
+    """
+    skeleton = __skeletons.get(net)
+    if skeleton is None or not skeleton.is_valid_for(net, im, fm, skip, model_costs, sync_costs):
+        skeleton = SyncProductSkeleton(net, im, fm, skip, model_costs, sync_costs)
+        __skeletons[net] = skeleton
+    return skeleton
@@ -141,7 +141,7 @@ def get_kde_numeric_attribute(log, attribute, parameters=None):
         Y-axis values to represent
     """
 
-    if type(log) is EventLog:
+    if isinstance(log, EventLog):
         event_log = log_conversion.apply(log, variant=log_conversion.TO_EVENT_STREAM)
     else:
         event_log = log
@@ -175,7 +175,7 @@ def get_kde_numeric_attribute_json(log, attribute, parameters=None):
         Y-axis values to represent
     """
 
-    if type(log) is EventLog:
+    if isinstance(log, EventLog):
         event_log = log_conversion.apply(log, variant=log_conversion.TO_EVENT_STREAM)
     else:
         event_log = log
@@ -208,7 +208,7 @@ def get_kde_date_attribute(log, attribute=DEFAULT_TIMESTAMP_KEY, parameters=None
         Y-axis values to represent
     """
 
-    if type(log) is EventLog:
+    if isinstance(log, EventLog):
         event_log = log_conversion.apply(log, variant=log_conversion.TO_EVENT_STREAM)
     else:
         event_log = log
@@ -242,7 +242,7 @@ def get_kde_date_attribute_json(log, attribute=DEFAULT_TIMESTAMP_KEY, parameters
         Y-axis values to represent
     """
 
-    if type(log) is EventLog:
+    if isinstance(log, EventLog):
         event_log = log_conversion.apply(log, variant=log_conversion.TO_EVENT_STREAM)
     else:
         event_log = log
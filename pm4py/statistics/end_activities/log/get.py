@@ -1,6 +1,8 @@
 from pm4py.util.xes_constants import DEFAULT_NAME_KEY
 from pm4py.statistics.parameters import Parameters
 from pm4py.util import exec_utils
+from pm4py.objects.log.columnar import ColumnarEventLog, MISSING_CODE
+import numpy as np
 
 
 def get_end_activities(log, parameters=None):
@@ -24,6 +26,16 @@ def get_end_activities(log, parameters=None):
         parameters = {}
     attribute_key = exec_utils.get_param_value(Parameters.ACTIVITY_KEY, parameters, DEFAULT_NAME_KEY)
 
+    if isinstance(log, ColumnarEventLog):
+        codes, vocabulary = log.get_codes(attribute_key)
+        if codes is not None:
+            # reads the activity of the last event of the non-empty traces
+            lengths = np.diff(log.case_offsets)
+            activity_codes = codes[(log.case_offsets[1:] - 1)[lengths > 0]]
+            activity_codes = activity_codes[activity_codes != MISSING_CODE]
+            counts = np.bincount(activity_codes, minlength=len(vocabulary))
+            return {vocabulary[i]: int(counts[i]) for i in np.nonzero(counts)[0]}
+
     end_activities = {}
 
     for trace in log:
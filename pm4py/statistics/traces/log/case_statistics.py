@@ -54,14 +54,18 @@ def get_variant_statistics(log, parameters=None):
     if parameters is None:
         parameters = {}
     max_variants_to_return = exec_utils.get_param_value(Parameters.MAX_VARIANTS_TO_RETURN, parameters, None)
-    varnt = exec_utils.get_param_value(Parameters.VARIANTS, parameters, variants_get.get_variants(log,
-                                                                                              parameters=parameters))
+    varnt = exec_utils.get_param_value(Parameters.VARIANTS, parameters, None)
+    if varnt is None:
+        # only the count of the variants is needed: the log is read only once
+        var_count = variants_get.get_variants_count(log, parameters=parameters)
+    else:
+        var_count = {var: len(varnt[var]) for var in varnt}
     var_durations = exec_utils.get_param_value(Parameters.VAR_DURATIONS, parameters, None)
     if var_durations is None:
         var_durations = {}
     variants_list = []
-    for var in varnt:
-        var_el = {"variant": var, "count": len(varnt[var])}
+    for var in var_count:
+        var_el = {"variant": var, "count": var_count[var]}
         if var in var_durations:
             average = np.mean(var_durations[var])
             var_el["caseDuration"] = average
@@ -4,6 +4,7 @@ from pm4py.statistics.traces.common import case_duration as case_duration_common
 from pm4py.util.constants import CASE_CONCEPT_NAME
 from pm4py.util import exec_utils, constants
 from enum import Enum
+import numpy as np
 import pandas as pd
 
 
@@ -176,9 +177,25 @@ def get_variants_df(df, parameters=None):
     case_id_glue = exec_utils.get_param_value(Parameters.CASE_ID_KEY, parameters, CASE_CONCEPT_NAME)
     activity_key = exec_utils.get_param_value(Parameters.ACTIVITY_KEY, parameters, xes.DEFAULT_NAME_KEY)
 
-    new_df = df.groupby(case_id_glue)[activity_key].agg(lambda col: ",".join(pd.Series.to_list(col))).to_frame()
-    new_cols = list(new_df.columns)
-    new_df = new_df.rename(columns={new_cols[0]: "variant"})
+    # the activities are dictionary-encoded, and the events are grouped by case working on the codes;
+    # each distinct sequence of codes is decoded (joined) only once
+    case_codes, cases = pd.factorize(df[case_id_glue], sort=True)
+    activity_codes, activities = pd.factorize(df[activity_key])
+    activities = activities.tolist()
+    positions = np.nonzero(case_codes != -1)[0]
+    order = positions[np.argsort(case_codes[positions], kind="stable")]
+    groups = np.split(activity_codes[order], np.cumsum(np.bincount(case_codes[order], minlength=len(cases)))[:-1])
+
+    decoded = {}
+    variants = []
+    for group in groups:
+        group = group[group != -1]
+        key = group.tobytes()
+        if key not in decoded:
+            decoded[key] = ",".join([activities[x] for x in group.tolist()])
+        variants.append(decoded[key])
+
+    new_df = pd.DataFrame({"variant": variants}, index=pd.Index(cases, name=case_id_glue))
 
     return new_df
 
@@ -211,9 +228,7 @@ def get_variants_df_with_case_duration(df, parameters=None):
 
     grouped_df = df[[case_id_glue, timestamp_key, activity_key]].groupby(df[case_id_glue])
 
-    df1 = grouped_df[activity_key].agg(lambda col: ",".join(pd.Series.to_list(col))).to_frame()
-    new_cols = list(df1.columns)
-    df1 = df1.rename(columns={new_cols[0]: "variant"})
+    df1 = get_variants_df(df, parameters=parameters)
 
     first_eve_df = grouped_df.first()
     last_eve_df = grouped_df.last()
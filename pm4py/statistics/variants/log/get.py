@@ -2,6 +2,7 @@ from pm4py.util.xes_constants import DEFAULT_NAME_KEY, DEFAULT_TIMESTAMP_KEY
 from pm4py.statistics.parameters import Parameters
 from pm4py.util import exec_utils
 from pm4py.util.constants import DEFAULT_VARIANT_SEP
+from pm4py.objects.log.util import vocabulary
 
 import numpy as np
 
@@ -23,8 +24,8 @@ def get_language(log, parameters=None):
         Dictionary containing the stochastic language of the log
         (variant associated to a number between 0 and 1; the sum is 1)
     """
-    vars = get_variants(log, parameters=parameters)
-    vars = {tuple(x.split(DEFAULT_VARIANT_SEP)): len(y) for x,y in vars.items()}
+    vars = get_variants_count(log, parameters=parameters)
+    vars = {tuple(x.split(DEFAULT_VARIANT_SEP)): y for x,y in vars.items()}
     all_values_sum = sum(vars.values())
     for x in vars:
         vars[x] = vars[x] / all_values_sum
@@ -97,6 +98,50 @@ def get_variants_along_with_case_durations(log, parameters=None):
     return all_var, all_durations
 
 
+def get_variants_count(log, parameters=None):
+    """
+    Gets a dictionary whose key is the variant and as value there
+    is the number of traces that share the variant.
+    The log is read only once, hence also an iterator of traces (e.g. a streaming importer) is accepted
+
+    Parameters
+    ----------
+    log
+        Log (or iterable of traces)
+    parameters
+        Parameters of the algorithm, including:
+            Parameters.ACTIVITY_KEY -> Attribute identifying the activity in the log
+
+    Returns
+    ----------
+    variants
+        Dictionary with variant as the key and the number of traces as the value
+    """
+    if parameters is None:
+        parameters = {}
+
+    attribute_key = exec_utils.get_param_value(Parameters.ACTIVITY_KEY, parameters, DEFAULT_NAME_KEY)
+
+    encoded_variants = {}
+    vocab = vocabulary.get_vocabulary(log, activity_key=attribute_key)
+    for trace in log:
+        variant = vocabulary.encode_trace(trace, vocab, activity_key=attribute_key)
+        if variant not in encoded_variants:
+            encoded_variants[variant] = 0
+        encoded_variants[variant] += 1
+
+    # the variants are decoded once
+    activities = vocabulary.get_activities(vocab)
+    variants = {}
+    for variant, count in encoded_variants.items():
+        variant = DEFAULT_VARIANT_SEP.join([activities[x] for x in variant])
+        if variant not in variants:
+            variants[variant] = 0
+        variants[variant] += count
+
+    return variants
+
+
 def get_variants_from_log_trace_idx(log, parameters=None):
     """
     Gets a dictionary whose key is the variant and as value there
@@ -120,12 +165,16 @@ def get_variants_from_log_trace_idx(log, parameters=None):
 
     attribute_key = exec_utils.get_param_value(Parameters.ACTIVITY_KEY, parameters, DEFAULT_NAME_KEY)
 
+    # the traces are grouped by their tuple of activity codes, and each variant is decoded once
+    encoded_variants, activities = vocabulary.get_encoded_variants_trace_idx(log, activity_key=attribute_key)
     variants = {}
-    for trace_idx, trace in enumerate(log):
-        variant = DEFAULT_VARIANT_SEP.join([x[attribute_key] for x in trace if attribute_key in x])
+    for variant, traces_idx in encoded_variants.items():
+        variant = DEFAULT_VARIANT_SEP.join([activities[x] for x in variant])
         if variant not in variants:
-            variants[variant] = []
-        variants[variant].append(trace_idx)
+            variants[variant] = traces_idx
+        else:
+            # different activities sequences could collide on the separator
+            variants[variant] = sorted(variants[variant] + traces_idx)
 
     return variants
 
@@ -1 +1 @@
-from pm4py.util.dt_parsing import parser, versions
+from pm4py.util.dt_parsing import parser, versions, vectorized
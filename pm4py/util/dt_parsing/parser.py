@@ -27,6 +27,13 @@ if sys.version_info >= (3, 7):
     # (at least we can drop ciso8601 somewhen)
     DEFAULT_VARIANT = STRPFROMISO
 
+# the cached variant memoizes the results of the best available parser
+from pm4py.util.dt_parsing.versions import cached
+
+CACHED = "cached"
+VERSIONS[CACHED] = cached
+DEFAULT_VARIANT = CACHED
+
 
 def get(variant=DEFAULT_VARIANT):
     """
@@ -36,7 +43,7 @@ def get(variant=DEFAULT_VARIANT):
     Parameters
     --------------
     variant
-        Variant of the algorithm. Possible values: ciso8601
+        Variant of the algorithm. Possible values: ciso8601, strpfromiso, cached
 
     Returns
     -------------
@@ -0,0 +1,141 @@
+import logging
+
+import numpy as np
+import pandas as pd
+
+from pm4py.util import versions
+
+# number of (non-null) values that are converted before the whole column
+SAMPLE_SIZE = 1000
+
+# ISO dates (with milliseconds or microseconds, if any) that are converted by to_pydatetimes:
+# the first group is the local date and time, the second one is the offset
+ISO_DATE_PATTERN = r"^(\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}(?:\.\d{3}|\.\d{6})?)(Z|[+-]\d{2}:\d{2})?$"
+# date to which an offset is appended to get its timezone object from the fallback parser
+REFERENCE_DATE = "2000-01-01T00:00:00"
+
+
+def apply(series, timest_format=None, utc=True):
+    """
+    Converts a column of date strings to timestamps with a single (vectorized) call to Pandas.
+    A sample of the values is converted first, so that the columns that do not contain dates are discarded
+    without trying to parse all their values; when no format is provided, the format of the dates is inferred
+    from the first value (and the remaining values are parsed with it, when possible)
+
+    Parameters
+    --------------
+    series
+        Pandas series
+    timest_format
+        (If provided) Format of the dates
+    utc
+        Converts the timestamps to UTC
+
+    Returns
+    --------------
+    series
+        Series of timestamps (a ValueError is raised if the values are not dates)
+    """
+    kwargs = {"utc": utc}
+    if timest_format is not None:
+        kwargs["format"] = timest_format
+    elif not versions.check_pandas_ge_200():
+        # from Pandas 2.0, the format is always inferred
+        kwargs["infer_datetime_format"] = True
+    pd.to_datetime(series.head(SAMPLE_SIZE).dropna(), **kwargs)
+    return pd.to_datetime(series, **kwargs)
+
+
+def to_pydatetimes(values, fallback_parser):
+    """
+    Converts a list of date strings to datetimes, giving the same results of the (per-string) fallback parser:
+    the dates without offset stay naive, and the other dates keep their own offset.
+    The ISO dates are grouped by offset, and the local times of each group are converted with a single call
+    to Pandas; the timezone of the group is the one returned by the fallback parser for its offset
+
+    Parameters
+    --------------
+    values
+        List of date strings
+    fallback_parser
+        Date parser (see pm4py.util.dt_parsing.parser)
+
+    Returns
+    --------------
+    dates
+        List of datetimes (None for the values that are not converted, e.g. the values that are not ISO dates
+        or that are out of the range of the Pandas timestamps)
+    """
+    dates = [None] * len(values)
+    parts = pd.Series(values, dtype=object).str.extract(ISO_DATE_PATTERN)
+    matched = parts[0].notna().values
+    offsets = parts[1].fillna("").values
+    for offset in pd.unique(offsets[matched]):
+        indexes = np.nonzero(matched & (offsets == offset))[0]
+        try:
+            # the timezone object is the same that the fallback parser returns for the offset
+            tz = fallback_parser.apply(REFERENCE_DATE + offset).tzinfo if offset else None
+        except (TypeError, ValueError):
+            continue
+        converted = pd.to_datetime(parts[0].values[indexes], errors="coerce")
+        missing = converted.isna()
+        for i, date, m in zip(indexes, converted.to_pydatetime(), missing):
+            if not m:
+                dates[i] = date if tz is None else date.replace(tzinfo=tz)
+    return dates
+
+
+class DateCollector(object):
+    """
+    Collects the date strings of a log while it is parsed, grouped by attribute key,
+    so that the strings of each key are converted with a single call to Pandas (see to_pydatetimes)
+    once the parsing is completed. The strings are stored as provisional values of the attributes
+    """
+
+    def __init__(self):
+        self.columns = {}
+
+    def add(self, store, key, value):
+        """
+        Stores the date string as value of the attribute, deferring its conversion
+
+        Parameters
+        --------------
+        store
+            Dictionary of attributes
+        key
+            Attribute key
+        value
+            Date string
+        """
+        store[key] = value
+        if key not in self.columns:
+            self.columns[key] = ([], [])
+        self.columns[key][0].append(store)
+        self.columns[key][1].append(value)
+
+    def convert(self, fallback_parser):
+        """
+        Converts the collected date strings and replaces them in the attributes.
+        The strings that are not converted by to_pydatetimes are parsed one at a time with the fallback parser;
+        the attributes that cannot be parsed are removed
+
+        Parameters
+        --------------
+        fallback_parser
+            Date parser (see pm4py.util.dt_parsing.parser)
+        """
+        for key, (stores, values) in self.columns.items():
+            for store, value, date in zip(stores, values, to_pydatetimes(values, fallback_parser)):
+                if store.get(key) is not value:
+                    # the attribute has been overwritten in the meanwhile
+                    continue
+                if date is None:
+                    try:
+                        date = fallback_parser.apply(value)
+                    except (TypeError, ValueError):
+                        logging.info("failed to parse date: " + str(value))
+                        del store[key]
+                        continue
+                store[key] = date
+        self.columns = {}
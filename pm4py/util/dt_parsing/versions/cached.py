@@ -0,0 +1,29 @@
+import functools
+import sys
+
+if sys.version_info >= (3, 7):
+    from pm4py.util.dt_parsing.versions.strpfromiso import apply as parse
+else:
+    from pm4py.util.dt_parsing.versions.cs8601 import apply as parse
+
+# maximum number of distinct date strings whose parsed value is kept in memory
+CACHE_SIZE = 1 << 16
+
+
+@functools.lru_cache(maxsize=CACHE_SIZE)
+def apply(dt):
+    """
+    Parses the string to a datetime object, memoizing the results
+    (the same timestamps occur many times in a log, and datetime objects are immutable, hence they can be shared)
+
+    Parameters
+    --------------
+    dt
+        Date string
+
+    Returns
+    --------------
+    datetime
+        Datetime object
+    """
+    return parse(dt)
@@ -9,6 +9,7 @@ PULP = "pulp"
 CVXOPT_SOLVER_CUSTOM_ALIGN = "cvxopt_solver_custom_align"
 CVXOPT_SOLVER_CUSTOM_ALIGN_ILP = "cvxopt_solver_custom_align_ilp"
 ORTOOLS_SOLVER = "ortools_solver"
+SCIPY_SOLVER = "scipy_solver"
 
 VERSIONS_APPLY = {PULP: pulp_solver.apply}
 VERSIONS_GET_PRIM_OBJ = {PULP: pulp_solver.get_prim_obj_from_sol}
@@ -31,6 +32,19 @@ except:
     # in this case, ortools is not installed since it is broken
     pass
 
+try:
+    # in the case a recent SciPy (providing the HiGHS solvers) is installed, the problems are solved in-process
+    from pm4py.util.lp.versions import scipy_solver
+
+    VERSIONS_APPLY[SCIPY_SOLVER] = scipy_solver.apply
+    VERSIONS_GET_PRIM_OBJ[SCIPY_SOLVER] = scipy_solver.get_prim_obj_from_sol
+    VERSIONS_GET_POINTS_FROM_SOL[SCIPY_SOLVER] = scipy_solver.get_points_from_sol
+
+    DEFAULT_LP_SOLVER_VARIANT = SCIPY_SOLVER
+except:
+    # SciPy is too old
+    pass
+
 def apply(c, Aub, bub, Aeq, beq, parameters=None, variant=DEFAULT_LP_SOLVER_VARIANT):
     """
     Gets the overall solution of the problem
@@ -50,7 +64,7 @@ def apply(c, Aub, bub, Aeq, beq, parameters=None, variant=DEFAULT_LP_SOLVER_VARI
     parameters
         Possible parameters of the algorithm
     variant
-        Variant of the algorithm, possible values: pulp, ortools
+        Variant of the algorithm, possible values: pulp, ortools, scipy_solver
 
     Returns
     -------------
@@ -71,7 +85,7 @@ def get_prim_obj_from_sol(sol, parameters=None, variant=DEFAULT_LP_SOLVER_VARIAN
     parameters
         Possible parameters of the algorithm
     variant
-        Variant of the algorithm, possible values: pulp, ortools
+        Variant of the algorithm, possible values: pulp, ortools, scipy_solver
 
     Returns
     -------------
@@ -92,7 +106,7 @@ def get_points_from_sol(sol, parameters=None, variant=DEFAULT_LP_SOLVER_VARIANT)
     parameters
         Possible parameters of the algorithm
     variant
-        Variant of the algorithm, possible values: pulp, ortools
+        Variant of the algorithm, possible values: pulp, ortools, scipy_solver
 
     Returns
     -------------
@@ -4,3 +4,8 @@ try:
     from pm4py.util.lp.versions import ortools_solver
 except:
     pass
+
+try:
+    from pm4py.util.lp.versions import scipy_solver
+except:
+    pass
@@ -0,0 +1,151 @@
+import sys
+
+import numpy as np
+import scipy
+from scipy import sparse
+from scipy.optimize import linprog
+
+from pm4py.util import exec_utils
+from pm4py.util.lp.parameters import Parameters
+
+if tuple(int(x) for x in scipy.__version__.split(".")[:2]) < (1, 9):
+    # the HiGHS solvers support integrality constraints from SciPy 1.9
+    raise ImportError("SciPy >= 1.9 is required by the SciPy LP solver")
+
+MIN_THRESHOLD = 10 ** -12
+
+
+def __to_sparse(matrix):
+    """
+    Transforms a (dense or sparse) matrix into a CSR sparse matrix, removing the coefficients that are
+    negligible (in absolute value)
+    """
+    if sparse.isspmatrix_csr(matrix) and matrix.dtype == np.float64 and not np.any(
+            np.abs(matrix.data) <= MIN_THRESHOLD):
+        # already in the target representation: no copy is needed (useful when the same matrix is
+        # provided to many problems)
+        return matrix
+    if sparse.issparse(matrix):
+        matrix = sparse.csr_matrix(matrix, dtype=np.float64, copy=True)
+    else:
+        matrix = sparse.csr_matrix(np.asarray(matrix, dtype=np.float64))
+    matrix.data[np.abs(matrix.data) <= MIN_THRESHOLD] = 0.0
+    matrix.eliminate_zeros()
+    return matrix
+
+
+def __to_vector(vector):
+    """
+    Transforms a vector (list, column matrix, NumPy array) into a flat NumPy array
+    """
+    if sparse.issparse(vector):
+        vector = vector.toarray()
+    return np.asarray(vector, dtype=np.float64).reshape(-1)
+
+
+def apply(c, Aub, bub, Aeq, beq, parameters=None):
+    """
+    Gets the overall solution of the problem, solving it in-process with the HiGHS solvers of SciPy.
+    The constraint matrices can be provided directly as SciPy sparse matrices
+    (dense matrices are converted to the sparse representation)
+
+    Parameters
+    ------------
+    c
+        c parameter of the algorithm
+    Aub
+        A_ub parameter of the algorithm
+    bub
+        b_ub parameter of the algorithm
+    Aeq
+        A_eq parameter of the algorithm
+    beq
+        b_eq parameter of the algorithm
+    parameters
+        Possible parameters of the algorithm:
+            Parameters.REQUIRE_ILP => the variables are required to be binary (as in the PuLP solver)
+
+    Returns
+    -------------
+    sol
+        Solution of the LP problem by the given algorithm
+    """
+    if parameters is None:
+        parameters = {}
+
+    require_ilp = exec_utils.get_param_value(Parameters.REQUIRE_ILP, parameters, False)
+
+    c = __to_vector(c)
+    c[np.abs(c) <= MIN_THRESHOLD] = 0.0
+    Aub = __to_sparse(Aub)
+    bub = __to_vector(bub)
+    if Aeq is not None and beq is not None:
+        Aeq = __to_sparse(Aeq)
+        beq = __to_vector(beq)
+    else:
+        Aeq = None
+        beq = None
+
+    if require_ilp:
+        sol = linprog(c, A_ub=Aub, b_ub=bub, A_eq=Aeq, b_eq=beq, bounds=(0, 1), method="highs",
+                      integrality=np.ones(len(c)))
+    else:
+        # the variables are free (the bounds are expressed as constraints, as in the other solvers)
+        sol = linprog(c, A_ub=Aub, b_ub=bub, A_eq=Aeq, b_eq=beq, bounds=(None, None), method="highs")
+
+    return sol
+
+
+def get_prim_obj_from_sol(sol, parameters=None):
+    """
+    Gets the primal objective from the solution of the LP problem
+
+    Parameters
+    -------------
+    sol
+        Solution of the ILP problem by the given algorithm
+    parameters
+        Possible parameters of the algorithm
+
+    Returns
+    -------------
+    prim_obj
+        Primal objective
+    """
+    if parameters is None:
+        parameters = {}
+
+    if sol is not None and sol.status == 0:
+        return sol.fun
+
+
+def get_points_from_sol(sol, parameters=None):
+    """
+    Gets the points from the solution
+
+    Parameters
+    -------------
+    sol
+        Solution of the LP problem by the given algorithm
+    parameters
+        Possible parameters of the algorithm
+
+    Returns
+    -------------
+    points
+        Point of the solution
+    """
+    if parameters is None:
+        parameters = {}
+
+    maximize = parameters["maximize"] if "maximize" in parameters else False
+    return_when_none = parameters["return_when_none"] if "return_when_none" in parameters else False
+    var_corr = parameters["var_corr"] if "var_corr" in parameters else {}
+
+    if sol is not None and sol.status == 0:
+        return sol.x.tolist()
+    else:
+        if return_when_none:
+            if maximize:
+                return [sys.float_info.max] * len(list(var_corr.keys()))
+            return [sys.float_info.min] * len(list(var_corr.keys()))
@@ -13,3 +13,13 @@ def check_pandas_ge_024():
         return True
 
     return False
+
+
+def check_pandas_ge_200():
+    """
+    Checks if the Pandas version is >= 2.0
+    :return:
+    """
+    MAJOR = int(pd.__version__.split(".")[0])
+
+    return MAJOR >= 2
@@ -46,6 +46,75 @@ class AlgorithmTest(unittest.TestCase):
         from pm4py.algo.conformance.log_skeleton import algorithm as lsk_conformance
         conf = lsk_conformance.apply(log, model)
 
+    def test_log_skeleton_long_traces(self):
+        from pm4py.algo.discovery.log_skeleton import trace_skel
+        from pm4py.algo.discovery.log_skeleton import algorithm as lsk_discovery
+        from pm4py.algo.conformance.log_skeleton import algorithm as lsk_conformance
+        from pm4py.objects.log.log import EventLog, Trace, Event
+        trace = ["a", "b", "c", "a", "d", "b", "e", "e", "c", "f"]
+        self.assertEqual(trace_skel.after(trace),
+                         set((trace[i], trace[j]) for i in range(len(trace)) for j in range(len(trace)) if j > i))
+        self.assertEqual(trace_skel.before(trace),
+                         set((trace[i], trace[j]) for i in range(len(trace)) for j in range(len(trace)) if j < i))
+        self.assertEqual(trace_skel.equivalence(trace), {("a", "b"), ("b", "a"), ("a", "c"), ("c", "a"), ("a", "e"),
+                                                         ("e", "a"), ("b", "c"), ("c", "b"), ("b", "e"), ("e", "b"),
+                                                         ("c", "e"), ("e", "c"), ("d", "f"), ("f", "d")})
+        # traces with thousands of events
+        log = EventLog()
+        for i in range(3):
+            log.append(Trace([Event({"concept:name": act}) for act in (trace * 250)[i:]]))
+        model = lsk_discovery.apply(log)
+        conf = lsk_conformance.apply(log, model)
+        self.assertTrue(all(x["is_fit"] for x in conf))
+
+    def test_log_skeleton_vectorized(self):
+        from pm4py.algo.discovery.log_skeleton import algorithm as lsk_discovery
+        from pm4py.algo.conformance.log_skeleton import algorithm as lsk_conformance
+        from pm4py.algo.conformance.log_skeleton.versions import vectorized
+        from pm4py.objects.log.log import EventLog
+        log = xes_importer.apply(os.path.join("input_data", "reviewing.xes"))
+        model = lsk_discovery.apply(EventLog(log[:50]), parameters={"noise_threshold": 0.2})
+
+        def normalize(res):
+            # the order of the pairs inside each deviation is not relevant
+            return [(x["is_fit"], x["no_dev_total"], x["no_constr_total"], x["dev_fitness"],
+                     [(d[0], sorted(d[1]) if d[0] != "activ_freq" else d[1]) for d in x["deviations"]]) for x in res]
+
+        for constraints in [["equivalence", "always_after", "always_before", "never_together", "directly_follows",
+                             "activ_freq"], ["never_together", "activ_freq"]]:
+            parameters = {"considered_constraints": constraints}
+            classic_conf = normalize(lsk_conformance.apply(log, model, variant=lsk_conformance.Variants.CLASSIC,
+                                                           parameters=parameters))
+            compiled_model = vectorized.compile_model(model)
+            conf = lsk_conformance.apply(log, compiled_model, variant=lsk_conformance.Variants.VECTORIZED,
+                                         parameters=dict(parameters, block_size=7))
+            self.assertEqual(normalize(conf), classic_conf)
+            self.assertFalse(all(x["is_fit"] for x in conf))
+            # the results are memoized in the compiled model, and copies are returned
+            for x in conf:
+                x["deviations"].append(None)
+            conf2 = lsk_conformance.apply(log, compiled_model, variant=lsk_conformance.Variants.VECTORIZED,
+                                          parameters=parameters)
+            self.assertEqual(normalize(conf2), classic_conf)
+            # the bitset path gives the same results (in the same order) as the vectorized path
+            bitset_conf = [vectorized.apply_actlist([e["concept:name"] for e in trace], model,
+                                                    parameters=parameters) for trace in log]
+            self.assertEqual(bitset_conf, conf2)
+            # with a small memo, the least recently used variants are discarded
+            small_model = vectorized.compile_model(model, max_memo_size=3)
+            conf3 = vectorized.apply_log(log, small_model, parameters=dict(parameters, block_size=7))
+            self.assertEqual(len(small_model.memo), 3)
+            self.assertEqual(conf3, conf2)
+            conf3 = [vectorized.apply_actlist([e["concept:name"] for e in trace], small_model,
+                                              parameters=parameters) for trace in log]
+            self.assertEqual(len(small_model.memo), 3)
+            self.assertEqual(conf3, conf2)
+            # a model containing only the considered relations is accepted
+            partial_model = {x: y for x, y in model.items() if x in constraints}
+            partial_conf = lsk_conformance.apply(log, partial_model, variant=lsk_conformance.Variants.CLASSIC,
+                                                 parameters=parameters)
+            self.assertEqual(normalize(partial_conf), classic_conf)
+
     def test_alignment(self):
         log = xes_importer.apply(os.path.join("input_data", "running-example.xes"))
         from pm4py.algo.discovery.alpha import algorithm as alpha_miner
@@ -84,6 +153,78 @@ class AlgorithmTest(unittest.TestCase):
         generalization = generalization_evaluation.apply(log, net, im, fm,
                                                          variant=generalization_evaluation.Variants.GENERALIZATION_TOKEN)
 
+    def test_tokenreplay_parallel(self):
+        log = xes_importer.apply(os.path.join("input_data", "running-example.xes"))
+        from pm4py.algo.discovery.inductive import algorithm as inductive_miner
+        net, im, fm = inductive_miner.apply(log)
+        from pm4py.algo.conformance.tokenreplay import algorithm as token_replay
+        from pm4py.algo.conformance.tokenreplay.versions.token_replay import Parameters
+        sequential = token_replay.apply(log, net, im, fm, parameters={Parameters.RETURN_NAMES: True})
+        parallel = token_replay.apply(log, net, im, fm, parameters={Parameters.RETURN_NAMES: True,
+                                                                    Parameters.NUM_WORKERS: 2})
+        for x, y in zip(sequential, parallel):
+            self.assertEqual(x["activated_transitions"], y["activated_transitions"])
+            self.assertEqual(x["reached_marking"], y["reached_marking"])
+            self.assertEqual(x["trace_fitness"], y["trace_fitness"])
+            self.assertEqual(sorted(x["enabled_transitions_in_marking"]), sorted(y["enabled_transitions_in_marking"]))
+
+    def test_tokenreplay_compiled(self):
+        log = xes_importer.apply(os.path.join("input_data", "reviewing.xes"))
+        from pm4py.algo.discovery.inductive import algorithm as inductive_miner
+        net, im, fm = inductive_miner.apply(log)
+        from pm4py.algo.conformance.tokenreplay import algorithm as token_replay
+        reference = token_replay.apply(log, net, im, fm, variant=token_replay.Variants.TOKEN_REPLAY)
+        compiled = token_replay.apply(log, net, im, fm, variant=token_replay.Variants.COMPILED_TOKEN_REPLAY)
+        self.assertEqual(len(reference), len(compiled))
+        for x, y in zip(reference, compiled):
+            self.assertEqual(set(x.keys()), set(y.keys()))
+            self.assertEqual(x["activated_transitions"], y["activated_transitions"])
+            self.assertEqual(x["reached_marking"], y["reached_marking"])
+            self.assertEqual(x["enabled_transitions_in_marking"], y["enabled_transitions_in_marking"])
+            self.assertEqual((x["trace_fitness"], x["missing_tokens"], x["remaining_tokens"]),
+                             (y["trace_fitness"], y["missing_tokens"], y["remaining_tokens"]))
+
+    def test_tokenreplay_context(self):
+        log = xes_importer.apply(os.path.join("input_data", "reviewing.xes"))
+        from pm4py.algo.discovery.inductive import algorithm as inductive_miner
+        net, im, fm = inductive_miner.apply(log)
+        from pm4py.algo.conformance.tokenreplay import algorithm as token_replay
+        from pm4py.algo.conformance.tokenreplay.versions.token_replay import TokenReplayContext, Parameters
+        from pm4py.evaluation import evaluator
+        from pm4py.evaluation.replay_fitness import evaluator as replay_fitness
+        from pm4py.evaluation.precision import evaluator as precision_evaluator
+        context = TokenReplayContext(net, im, fm, max_cache_size=2)
+        for is_reduction in [False, True]:
+            for variant in [token_replay.Variants.TOKEN_REPLAY, token_replay.Variants.COMPILED_TOKEN_REPLAY]:
+                reference = token_replay.apply(log, net, im, fm, variant=variant,
+                                               parameters={Parameters.IS_REDUCTION: is_reduction})
+                # the results of a replay reusing the context are the same as the results of a fresh replay
+                for i in range(2):
+                    replayed = token_replay.apply(log, net, im, fm, variant=variant,
+                                                  parameters={Parameters.TOKEN_REPLAY_CONTEXT: context,
+                                                              Parameters.IS_REDUCTION: is_reduction})
+                    self.assertEqual(reference, replayed)
+        self.assertIsNotNone(context.places_shortest_path_by_hidden)
+        fitness = replay_fitness.apply(log, net, im, fm, variant=replay_fitness.Variants.TOKEN_BASED,
+                                       parameters={"token_replay_context": context})
+        self.assertEqual(fitness, replay_fitness.apply(log, net, im, fm, variant=replay_fitness.Variants.TOKEN_BASED))
+        precision = precision_evaluator.apply(log, net, im, fm, variant=precision_evaluator.Variants.ETCONFORMANCE_TOKEN,
+                                              parameters={"token_replay_context": context})
+        self.assertEqual(precision, precision_evaluator.apply(log, net, im, fm,
+                                                              variant=precision_evaluator.Variants.ETCONFORMANCE_TOKEN))
+        self.assertEqual(evaluator.apply(log, net, im, fm, parameters={"token_replay_context": context}),
+                         evaluator.apply(log, net, im, fm))
+        # the markings exceeding the size of the cache of the compiled net have been discarded
+        unbounded_context = TokenReplayContext(net, im, fm, max_cache_size=None)
+        precision_evaluator.apply(log, net, im, fm, variant=precision_evaluator.Variants.ETCONFORMANCE_TOKEN,
+                                  parameters={"token_replay_context": unbounded_context})
+        self.assertGreater(len(unbounded_context.compiled_net.enabled_cache), 2)
+        self.assertEqual(len(context.compiled_net.enabled_cache), 2)
+        other_net, other_im, other_fm = inductive_miner.apply(log)
+        with self.assertRaises(Exception):
+            token_replay.apply(log, other_net, other_im, other_fm,
+                               parameters={Parameters.TOKEN_REPLAY_CONTEXT: context})
+
     def test_evaluation(self):
         log = xes_importer.apply(os.path.join("input_data", "running-example.xes"))
         from pm4py.algo.discovery.alpha import algorithm as alpha_miner
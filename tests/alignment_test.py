@@ -48,6 +48,248 @@ class AlignmentTest(unittest.TestCase):
             if not is_fit:
                 raise Exception("should be fit")
 
+    def test_lp_solvers(self):
+        # to avoid static method warnings in tests,
+        # that by construction of the unittest package have to be expressed in such way
+        self.dummy_variable = "dummy_value"
+        import numpy as np
+        from scipy import sparse
+        from pm4py.util.lp import solver as lp_solver
+        # min x0 + 2 x1 s.t. x0 + x1 == 1, x0 - x1 == 0.5, x >= 0
+        c = [1.0, 2.0]
+        Aub = -np.eye(2)
+        bub = np.matrix(np.zeros(2)).transpose()
+        Aeq = np.matrix([[1.0, 1.0], [1.0, -1.0]])
+        beq = np.matrix([1.0, 0.5]).transpose()
+        for variant in lp_solver.VERSIONS_APPLY:
+            sol = lp_solver.apply(c, Aub, bub, Aeq, beq, variant=variant)
+            self.assertAlmostEqual(lp_solver.get_prim_obj_from_sol(sol, variant=variant), 1.25)
+            points = lp_solver.get_points_from_sol(sol, variant=variant)
+            self.assertAlmostEqual(points[0], 0.75)
+            self.assertAlmostEqual(points[1], 0.25)
+        if lp_solver.SCIPY_SOLVER in lp_solver.VERSIONS_APPLY:
+            sol = lp_solver.apply(c, sparse.csr_matrix(Aub), bub, sparse.csr_matrix(Aeq), beq,
+                                  variant=lp_solver.SCIPY_SOLVER)
+            self.assertAlmostEqual(lp_solver.get_prim_obj_from_sol(sol, variant=lp_solver.SCIPY_SOLVER), 1.25)
+
+    def test_alignment_state_equation(self):
+        # to avoid static method warnings in tests,
+        # that by construction of the unittest package have to be expressed in such way
+        self.dummy_variable = "dummy_value"
+        log = xes_importer.apply(os.path.join(INPUT_DATA_DIR, "running-example.xes"))
+        net, marking, final_marking = alpha_alg.apply(log)
+        final_marking = petri.petrinet.Marking()
+        for p in net.places:
+            if not p.out_arcs:
+                final_marking[p] = 1
+        for trace in log:
+            cost_dijkstra = align_alg.apply(trace, net, marking, final_marking,
+                                            variant=align_alg.VERSION_DIJKSTRA_NO_HEURISTICS)["cost"]
+            cost_a_star = align_alg.apply(trace, net, marking, final_marking,
+                                          variant=align_alg.VERSION_STATE_EQUATION_A_STAR)["cost"]
+            self.assertEqual(cost_dijkstra, cost_a_star)
+
+    def test_state_equation_heuristic(self):
+        # to avoid static method warnings in tests,
+        # that by construction of the unittest package have to be expressed in such way
+        self.dummy_variable = "dummy_value"
+        from pm4py.objects.petri import align_utils, synchronous_product
+        from pm4py.objects.petri.utils import construct_trace_net
+        from pm4py.util.lp import solver as lp_solver
+        log = xes_importer.apply(os.path.join(INPUT_DATA_DIR, "running-example.xes"))
+        net, marking, final_marking = inductive_miner.apply(log)
+        trace_net, trace_im, trace_fm = construct_trace_net(log[0])
+        sync_net, sync_im, sync_fm = synchronous_product.construct(trace_net, trace_im, trace_fm, net, marking,
+                                                                   final_marking, align_utils.SKIP)
+        cost_function = align_utils.construct_standard_cost_function(sync_net, align_utils.SKIP)
+        incidence_matrix = petri.incidence_matrix.construct(sync_net)
+        fin_vec = incidence_matrix.encode_marking(sync_fm)
+        cost_vec = [0] * len(cost_function)
+        for t in cost_function:
+            cost_vec[incidence_matrix.transitions[t]] = cost_function[t]
+        values = []
+        for variant in lp_solver.VERSIONS_APPLY:
+            state_equation = align_utils.StateEquationHeuristic(sync_net, incidence_matrix, cost_vec, fin_vec,
+                                                                variant)
+            h, x = state_equation.compute(sync_im)
+            self.assertEqual(len(x), len(sync_net.transitions))
+            # the second computation is served by the cache
+            self.assertEqual(state_equation.compute(sync_im), (h, x))
+            self.assertEqual(len(state_equation.cache), 1)
+            self.assertAlmostEqual(state_equation.compute(sync_fm)[0], 0.0)
+            values.append(h)
+        for h in values:
+            self.assertAlmostEqual(h, values[0])
+
+    def test_alignment_parallel(self):
+        # to avoid static method warnings in tests,
+        # that by construction of the unittest package have to be expressed in such way
+        self.dummy_variable = "dummy_value"
+        log = xes_importer.apply(os.path.join(INPUT_DATA_DIR, "running-example.xes"))
+        net, marking, final_marking = inductive_miner.apply(log)
+        for variant in [align_alg.DEFAULT_VARIANT, align_alg.VERSION_STATE_EQUATION_A_STAR]:
+            sequential = align_alg.apply(log, net, marking, final_marking, variant=variant)
+            parallel = align_alg.apply(log, net, marking, final_marking, variant=variant,
+                                       parameters={align_alg.Parameters.NUM_WORKERS: 2})
+            self.assertEqual([(x["cost"], x["fitness"]) for x in sequential],
+                             [(x["cost"], x["fitness"]) for x in parallel])
+
+    def test_alignments_cache(self):
+        # to avoid static method warnings in tests,
+        # that by construction of the unittest package have to be expressed in such way
+        self.dummy_variable = "dummy_value"
+        from pm4py.algo.conformance.alignments import cache as alignments_cache
+        from pm4py.evaluation.precision.versions import align_etconformance
+        log = xes_importer.apply(os.path.join(INPUT_DATA_DIR, "running-example.xes"))
+        net, marking, final_marking = inductive_miner.apply(log)
+        cache = alignments_cache.AlignmentsCache(":memory:")
+        parameters = {align_alg.Parameters.ALIGNMENTS_CACHE: cache}
+        computed = align_alg.apply(log, net, marking, final_marking, parameters=parameters)
+        reference = align_alg.apply(log, net, marking, final_marking)
+        self.assertEqual([(x["cost"], x["fitness"]) for x in reference],
+                         [(x["cost"], x["fitness"]) for x in computed])
+        # the alignments are now served by the cache
+        model_key = alignments_cache.get_model_fingerprint(net, marking, final_marking)
+        variant_key = align_alg.DEFAULT_VARIANT.value.__name__
+        activities = tuple(x["concept:name"] for x in log[0])
+        cache.put(model_key, variant_key, {activities: {"alignment": [], "cost": 0}})
+        cached = align_alg.apply(log, net, marking, final_marking, parameters=parameters)
+        self.assertEqual(cached[0]["cost"], 0)
+        self.assertEqual([(x["cost"], x["fitness"]) for x in reference[1:]],
+                         [(x["cost"], x["fitness"]) for x in cached[1:]])
+        precision = align_etconformance.apply(log, net, marking, final_marking)
+        for i in range(2):
+            self.assertEqual(precision, align_etconformance.apply(log, net, marking, final_marking,
+                                                                  parameters=parameters))
+        # the results are stored as JSON, and read back unchanged
+        import json
+        for result, in cache.connection.execute("SELECT result FROM results"):
+            json.loads(result)
+        self.assertEqual(computed[1:], align_alg.apply(log, net, marking, final_marking, parameters=parameters)[1:])
+        # nets with repeated names cannot be identified, hence the cache is not used for them
+        for place in net.places:
+            place.name = "p"
+        self.assertIsNone(alignments_cache.get_model_fingerprint(net, marking, final_marking))
+        self.assertEqual(align_etconformance.apply(log, net, marking, final_marking),
+                         align_etconformance.apply(log, net, marking, final_marking, parameters=parameters))
+        cache.close()
+
+    def test_alignment_prefix_trie(self):
+        # to avoid static method warnings in tests,
+        # that by construction of the unittest package have to be expressed in such way
+        self.dummy_variable = "dummy_value"
+        log = xes_importer.apply(os.path.join(INPUT_DATA_DIR, "running-example.xes"))
+        net, marking, final_marking = inductive_miner.apply(log)
+        reference = align_alg.apply(log, net, marking, final_marking,
+                                    variant=align_alg.VERSION_DIJKSTRA_NO_HEURISTICS)
+        trie = align_alg.apply(log, net, marking, final_marking,
+                               variant=align_alg.Variants.VERSION_DIJKSTRA_PREFIX_TRIE)
+        self.assertEqual([(x["cost"], x["fitness"]) for x in reference],
+                         [(x["cost"], x["fitness"]) for x in trie])
+        for trace, alignment in zip(log, trie):
+            self.assertEqual([x["concept:name"] for x in trace],
+                             [move[0] for move in alignment["alignment"] if move[0] != ">>"])
+        # non-uniform costs of the log moves, on a model that does not fit all the traces
+        net, marking, final_marking = inductive_miner.apply(log[:2])
+        parameters = {align_alg.Parameters.PARAM_TRACE_COST_FUNCTION: [10000 * (i + 1) for i in
+                                                                       range(max(len(trace) for trace in log))]}
+        reference = align_alg.apply(log, net, marking, final_marking, parameters=dict(parameters),
+                                    variant=align_alg.VERSION_DIJKSTRA_NO_HEURISTICS)
+        trie = align_alg.apply(log, net, marking, final_marking, parameters=dict(parameters),
+                               variant=align_alg.Variants.VERSION_DIJKSTRA_PREFIX_TRIE)
+        self.assertEqual([x["cost"] for x in reference], [x["cost"] for x in trie])
+        self.assertNotEqual([x["cost"] for x in trie],
+                            [x["cost"] for x in align_alg.apply(log, net, marking, final_marking,
+                                                                variant=align_alg.Variants.VERSION_DIJKSTRA_PREFIX_TRIE)])
+
+    def test_sync_product_skeleton(self):
+        # to avoid static method warnings in tests,
+        # that by construction of the unittest package have to be expressed in such way
+        self.dummy_variable = "dummy_value"
+        from pm4py.objects.petri import align_utils, synchronous_product
+        from pm4py.objects.petri.utils import construct_trace_net_cost_aware
+        log = xes_importer.apply(os.path.join(INPUT_DATA_DIR, "running-example.xes"))
+        net, marking, final_marking = inductive_miner.apply(log)
+        model_costs = {t: align_utils.STD_MODEL_LOG_MOVE_COST if t.label is not None else 1 for t in
+                       net.transitions}
+        sync_costs = {t: 0 for t in net.transitions if t.label is not None}
+        skeleton = synchronous_product.get_skeleton(net, marking, final_marking, align_utils.SKIP, model_costs,
+                                                    sync_costs)
+        for trace in log:
+            trace_net, trace_im, trace_fm, trace_costs = construct_trace_net_cost_aware(
+                trace, [align_utils.STD_MODEL_LOG_MOVE_COST] * len(trace))
+            revised_sync = {(t1, t2): sync_costs[t2] for t1 in trace_net.transitions for t2 in net.transitions if
+                            t1.label == t2.label}
+            sync_net, sync_im, sync_fm, costs = synchronous_product.construct_cost_aware(
+                trace_net, trace_im, trace_fm, net, marking, final_marking, align_utils.SKIP, trace_costs,
+                model_costs, revised_sync)
+            # the skeleton is computed once for the Petri net
+            self.assertIs(synchronous_product.get_skeleton(net, marking, final_marking, align_utils.SKIP,
+                                                           dict(model_costs), dict(sync_costs)), skeleton)
+            sk_net, sk_im, sk_fm, sk_costs, incidence_matrix = skeleton.construct(trace_net, trace_im, trace_fm,
+                                                                                  trace_costs)
+            self.assertEqual({(t.name, t.label, costs[t]) for t in sync_net.transitions},
+                             {(t.name, t.label, sk_costs[t]) for t in sk_net.transitions})
+            self.assertEqual({(p.name, n) for p, n in sync_im.items()}, {(p.name, n) for p, n in sk_im.items()})
+            self.assertEqual({(p.name, n) for p, n in sync_fm.items()}, {(p.name, n) for p, n in sk_fm.items()})
+            reference = petri.incidence_matrix.construct(sync_net)
+            places = {p.name: p for p in sync_net.places}
+            transitions = {t.name: t for t in sync_net.transitions}
+            for p in sk_net.places:
+                for t in sk_net.transitions:
+                    self.assertEqual(reference.a_matrix[reference.places[places[p.name]]][
+                                         reference.transitions[transitions[t.name]]],
+                                     incidence_matrix.a_matrix[incidence_matrix.places[p]][
+                                         incidence_matrix.transitions[t]])
+        # the synchronous product nets do not share places or transitions, and the Petri net is not decorated
+        sk_net2 = skeleton.construct(trace_net, trace_im, trace_fm, trace_costs)[0]
+        self.assertFalse(set(sk_net.places) & set(sk_net2.places))
+        self.assertFalse(set(sk_net.transitions) & set(sk_net2.transitions))
+        self.assertFalse(any(hasattr(p, "ass_trans") for p in net.places))
+        # the skeletons are discarded along with their Petri nets
+        import gc
+        import weakref
+        skeletons = []
+        for i in range(5):
+            other_net, other_im, other_fm = inductive_miner.apply(log)
+            skeletons.append(weakref.ref(synchronous_product.get_skeleton(
+                other_net, other_im, other_fm, align_utils.SKIP,
+                {t: 1 for t in other_net.transitions}, {t: 0 for t in other_net.transitions})))
+            del other_net, other_im, other_fm
+        gc.collect()
+        self.assertTrue(all(x() is None for x in skeletons))
+        self.assertIs(synchronous_product.get_skeleton(net, marking, final_marking, align_utils.SKIP, model_costs,
+                                                       sync_costs), skeleton)
+
+    def test_vectorized_net(self):
+        # to avoid static method warnings in tests,
+        # that by construction of the unittest package have to be expressed in such way
+        self.dummy_variable = "dummy_value"
+        from pm4py.objects.petri import align_utils, semantics
+        from pm4py.objects.petri.utils import decorate_transitions_prepostset
+        log = xes_importer.apply(os.path.join(INPUT_DATA_DIR, "running-example.xes"))
+        net, marking, final_marking = inductive_miner.apply(log)
+        decorate_transitions_prepostset(net)
+        vect_net = align_utils.VectorizedNet(net)
+        m = vect_net.encode(marking)
+        self.assertEqual(vect_net.decode(m), marking)
+        self.assertEqual(vect_net.decode(vect_net.encode(final_marking)), final_marking)
+        # explores some markings, checking the enabling and the firing against the semantics of the Petri net
+        visited = set()
+        to_visit = [marking]
+        while to_visit and len(visited) < 50:
+            marking = to_visit.pop()
+            m = vect_net.encode(marking)
+            if m in visited:
+                continue
+            visited.add(m)
+            enabled = semantics.enabled_transitions(net, marking)
+            self.assertEqual(set(vect_net.transitions[j] for j in vect_net.enabled_transitions(m)), set(enabled))
+            for j in vect_net.enabled_transitions(m):
+                new_marking = semantics.execute(vect_net.transitions[j], net, marking)
+                self.assertEqual(vect_net.fire(m, j), vect_net.encode(new_marking))
+                to_visit.append(new_marking)
+
 
 if __name__ == "__main__":
     unittest.main()
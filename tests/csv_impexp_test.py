@@ -56,6 +56,18 @@ class CsvImportExportTest(unittest.TestCase):
         self.assertEqual(len(log), len(log_imported_after_export))
         os.remove(os.path.join(OUTPUT_DATA_DIR, "running-example-exported.csv"))
 
+    def test_dataframeToEventLog(self):
+        df = pd.read_csv(os.path.join(INPUT_DATA_DIR, "running-example.csv"))
+        df = dataframe_utils.convert_timestamp_columns_in_df(df)
+        df = df.sample(frac=1, random_state=0)
+        log = log_conversion.apply(df, variant=log_conversion.TO_EVENT_LOG)
+        log_from_stream = log_conversion.apply(log_conversion.apply(df, variant=log_conversion.TO_EVENT_STREAM),
+                                               variant=log_conversion.TO_EVENT_LOG)
+        self.assertEqual(len(log), len(log_from_stream))
+        for trace, trace_from_stream in zip(log, log_from_stream):
+            self.assertEqual(trace.attributes, trace_from_stream.attributes)
+            self.assertEqual([dict(ev) for ev in trace], [dict(ev) for ev in trace_from_stream])
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -17,6 +17,21 @@ class ETCTest(unittest.TestCase):
         precision = etc_alg.apply(log, net, marking, final_marking, variant=etc_alg.ETCONFORMANCE_TOKEN)
         del precision
 
+    def test_etc_prefix_trie(self):
+        log = xes_importer.apply(os.path.join(INPUT_DATA_DIR, "reviewing.xes"))
+        net, marking, final_marking = inductive_miner.apply(log)
+        from pm4py.evaluation.precision import utils as precision_utils
+        trie = precision_utils.get_log_prefix_trie(log)
+        prefixes, prefix_count = precision_utils.get_log_prefixes(log)
+        self.assertEqual(len(trie) - 1, len(prefixes))
+        for node in range(1, len(trie)):
+            prefix = ",".join(trie.get_prefix(node))
+            self.assertEqual(trie.get_next_activities(node), prefixes[prefix])
+            self.assertEqual(trie.count[node], prefix_count[prefix])
+        # value obtained replaying each prefix of the log separately
+        precision = etc_alg.apply(log, net, marking, final_marking, variant=etc_alg.ETCONFORMANCE_TOKEN)
+        self.assertAlmostEqual(precision, 0.21732175502742235)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -36,6 +36,23 @@ class ProcessModelEvaluationTests(unittest.TestCase):
         metrics = evaluation_alg.apply(log, net, marking, final_marking)
         del metrics
 
+    def test_evaluation_single_replay(self):
+        log = xes_importer.apply(os.path.join(INPUT_DATA_DIR, "reviewing.xes"))
+        net, marking, final_marking = inductive_miner.apply(log)
+        metrics = evaluation_alg.apply(log, net, marking, final_marking)
+        fitness = fitness_alg.apply(log, net, marking, final_marking, variant=fitness_alg.Variants.TOKEN_BASED)
+        precision = precision_alg.apply(log, net, marking, final_marking,
+                                        variant=precision_alg.Variants.ETCONFORMANCE_TOKEN)
+        generalization = generalization_alg.apply(log, net, marking, final_marking,
+                                                  variant=generalization_alg.Variants.GENERALIZATION_TOKEN)
+        for key in fitness:
+            self.assertAlmostEqual(metrics["fitness"][key], fitness[key])
+        self.assertAlmostEqual(metrics["precision"], precision)
+        self.assertAlmostEqual(metrics["generalization"], generalization)
+        parallel_metrics = evaluation_alg.apply(log, net, marking, final_marking,
+                                                parameters={evaluation_alg.Parameters.NUM_WORKERS: 2})
+        self.assertEqual(metrics, parallel_metrics)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,82 @@
+import inspect
+import os
+import sys
+import timeit
+import tracemalloc
+
+NO_TRACES = 2000
+NO_EVENTS_PER_TRACE = 20
+NO_REPETITIONS = 5
+
+
+def build_log():
+    from pm4py.objects.log.log import EventLog, Trace, Event
+    log = EventLog()
+    for i in range(NO_TRACES):
+        trace = Trace(attributes={"concept:name": str(i)})
+        for j in range(NO_EVENTS_PER_TRACE):
+            trace.append(Event({"concept:name": "activity" + str(j % 7), "org:resource": "resource" + str(j % 3),
+                                "time:timestamp": j, "cost": float(j)}))
+        log.append(trace)
+    return log
+
+
+def build_log_without_copies():
+    from pm4py.objects.log.log import EventLog, Trace, Event
+    traces = []
+    for i in range(NO_TRACES):
+        events = []
+        for j in range(NO_EVENTS_PER_TRACE):
+            events.append(Event.from_dict({"concept:name": "activity" + str(j % 7),
+                                           "org:resource": "resource" + str(j % 3),
+                                           "time:timestamp": j, "cost": float(j)}))
+        traces.append(Trace.from_list(events, attributes={"concept:name": str(i)}))
+    return EventLog.from_list(traces)
+
+
+def attribute_access(log):
+    for trace in log:
+        for event in trace:
+            event["concept:name"]
+            event.get("cost")
+            "org:resource" in event
+
+
+def log_iteration(log):
+    for trace in log:
+        trace.attributes
+        for i in range(len(trace)):
+            trace[i]
+
+
+def memory_per_event():
+    """
+    Gets the number of bytes allocated for each event (including its share of the traces and of the log)
+    """
+    tracemalloc.start()
+    snapshot_before = tracemalloc.take_snapshot()
+    log = build_log()
+    snapshot_after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    allocated = sum(stat.size_diff for stat in snapshot_after.compare_to(snapshot_before, "filename"))
+    del log
+    return allocated / (NO_TRACES * NO_EVENTS_PER_TRACE)
+
+
+def execute_benchmark():
+    log = build_log()
+    no_events = NO_TRACES * NO_EVENTS_PER_TRACE
+    construction = min(timeit.repeat(build_log, number=1, repeat=NO_REPETITIONS))
+    access = min(timeit.repeat(lambda: attribute_access(log), number=1, repeat=NO_REPETITIONS))
+    iteration = min(timeit.repeat(lambda: log_iteration(log), number=1, repeat=NO_REPETITIONS))
+    print("log construction (ns/event):", construction / no_events * 1e9)
+    construction = min(timeit.repeat(build_log_without_copies, number=1, repeat=NO_REPETITIONS))
+    print("log construction without copies (ns/event):", construction / no_events * 1e9)
+    print("attribute access (ns/event):", access / no_events * 1e9)
+    print("log iteration (ns/event):", iteration / no_events * 1e9)
+    print("memory footprint (bytes/event):", memory_per_event())
+
+
+if __name__ == "__main__":
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(inspect.getfile(inspect.currentframe())))))
+    execute_benchmark()
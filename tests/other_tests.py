@@ -41,6 +41,28 @@ class OtherPartsTests(unittest.TestCase):
                             parameters={simulator.Variants.STOCHASTIC_PLAYOUT.value.Parameters.LOG: log}))
         emd = earth_mover_distance.apply(lang_model1, lang_log)
 
+    def test_emd_fast(self):
+        from pm4py.evaluation.earth_mover_distance import evaluator as earth_mover_distance
+        from pm4py.evaluation.earth_mover_distance.versions import fast_pyemd
+        log = xes_importer.apply(os.path.join("input_data", "running-example.xes"))
+        lang_log = variants_get.get_language(log)
+        net1, im1, fm1 = inductive_miner.apply(log)
+        lang_model1 = variants_get.get_language(
+            simulator.apply(net1, im1, fm1, variant=simulator.Variants.STOCHASTIC_PLAYOUT,
+                            parameters={simulator.Variants.STOCHASTIC_PLAYOUT.value.Parameters.LOG: log}))
+        emd = earth_mover_distance.apply(lang_model1, lang_log)
+        emd_fast = earth_mover_distance.apply(lang_model1, lang_log, variant=earth_mover_distance.Variants.FAST_PYEMD,
+                                              parameters={fast_pyemd.Parameters.BLOCK_SIZE: 4})
+        self.assertAlmostEqual(emd, emd_fast)
+        emd_parallel = earth_mover_distance.apply(lang_model1, lang_log,
+                                                  variant=earth_mover_distance.Variants.FAST_PYEMD,
+                                                  parameters={fast_pyemd.Parameters.BLOCK_SIZE: 4,
+                                                              fast_pyemd.Parameters.NUM_WORKERS: 2})
+        self.assertAlmostEqual(emd, emd_parallel)
+        emd_top_k, error_bound = fast_pyemd.apply_with_error_bound(lang_model1, lang_log,
+                                                                   parameters={fast_pyemd.Parameters.TOP_K: 3})
+        self.assertLessEqual(abs(emd - emd_top_k), error_bound + 1e-9)
+
     def test_importing_dfg(self):
         dfg, sa, ea = dfg_importer.apply(os.path.join("input_data", "running-example.dfg"))
 
@@ -148,6 +170,104 @@ class OtherPartsTests(unittest.TestCase):
         from pm4py.simulation.tree_playout import algorithm as tree_playout
         new_log = tree_playout.apply(tree, variant=tree_playout.Variants.EXTENSIVE)
 
+    def test_columnar_log(self):
+        import copy
+        import pickle
+        from pm4py.objects.log import columnar
+        from pm4py.algo.conformance.tokenreplay import algorithm as token_replay
+        log = xes_importer.apply(os.path.join("input_data", "running-example.xes"))
+        col_log = converter.apply(log, variant=converter.Variants.TO_COLUMNAR_LOG)
+        self.assertTrue(isinstance(col_log, columnar.ColumnarEventLog))
+        self.assertEqual(len(log), len(col_log))
+        for trace, col_trace in zip(log, col_log):
+            self.assertEqual(trace.attributes, col_trace.attributes)
+            self.assertEqual([dict(ev) for ev in trace], [dict(ev) for ev in col_trace])
+        self.assertEqual(dfg_discovery.apply(log), dfg_discovery.apply(col_log))
+        self.assertEqual(start_activities.get_start_activities(log), start_activities.get_start_activities(col_log))
+        self.assertEqual(end_activities.get_end_activities(log), end_activities.get_end_activities(col_log))
+        self.assertEqual(variants_get.get_variants_count(log), variants_get.get_variants_count(col_log))
+        net, im, fm = inductive_miner.apply(log)
+        self.assertEqual([x["trace_fitness"] for x in token_replay.apply(log, net, im, fm)],
+                         [x["trace_fitness"] for x in token_replay.apply(col_log, net, im, fm)])
+        col_log[0][0]["new_attribute"] = 1
+        self.assertEqual(col_log[0][0]["new_attribute"], 1)
+        self.assertFalse("new_attribute" in col_log[0][1])
+        copied_log = copy.deepcopy(col_log)
+        self.assertEqual(copied_log[0][0]["new_attribute"], 1)
+        unpickled_log = pickle.loads(pickle.dumps(col_log))
+        self.assertEqual([dict(ev) for ev in unpickled_log[1]], [dict(ev) for ev in col_log[1]])
+        df = csv_import_adapter.import_dataframe_from_path(os.path.join("input_data", "running-example.csv"))
+        col_log_df = converter.apply(df, variant=converter.Variants.TO_COLUMNAR_LOG)
+        log_df = converter.apply(df, variant=converter.Variants.TO_EVENT_LOG)
+        self.assertEqual(len(log_df), len(col_log_df))
+        self.assertEqual(dfg_discovery.apply(log_df), dfg_discovery.apply(col_log_df))
+
+    def test_activity_vocabulary(self):
+        from pm4py.objects.log.util import vocabulary
+        from pm4py.statistics.traces.pandas import case_statistics
+        log = xes_importer.apply(os.path.join("input_data", "running-example.xes"))
+        variants_idx, activities = vocabulary.get_encoded_variants_trace_idx(log)
+        self.assertEqual(sorted(",".join(activities[x] for x in variant) for variant in variants_idx),
+                         sorted(",".join(ev["concept:name"] for ev in log[idx[0]]) for idx in variants_idx.values()))
+        self.assertIs(vocabulary.get_vocabulary(log), vocabulary.get_vocabulary(log))
+        self.assertEqual(variants_get.get_variants_count(log),
+                         {variant: len(traces) for variant, traces in variants_get.get_variants(log).items()})
+        df = csv_import_adapter.import_dataframe_from_path(os.path.join("input_data", "running-example.csv"))
+        variants_df = case_statistics.get_variants_df(df)
+        self.assertEqual(sorted(variants_df["variant"].tolist()),
+                         sorted(",".join(ev["concept:name"] for ev in trace) for trace in log))
+
+    def test_binary_event_log(self):
+        from pm4py.objects.log.serialization import serializer
+        from pm4py.objects.log.deserialization import algorithm as deserializer
+        log = xes_importer.apply(os.path.join("input_data", "running-example.xes"))
+        path = serializer.export_to_file(log, None, variant=serializer.BINARY_EVENT_LOG)
+        binary_log = deserializer.import_from_file(path, deserializer.BINARY_EVENT_LOG)
+        self.assertEqual(len(log), len(binary_log))
+        self.assertEqual(log[2].attributes, binary_log[2].attributes)
+        self.assertEqual([dict(ev) for ev in log[2]], [dict(ev) for ev in binary_log[2]])
+        self.assertEqual(variants_get.get_variants_count(log), variants_get.get_variants_count(binary_log))
+        binary_log[0][0]["concept:name"] = "changed"
+        self.assertEqual(binary_log[0][0]["concept:name"], "changed")
+        del binary_log
+        os.remove(path)
+        binary_log = deserializer.apply(serializer.apply(log, variant=serializer.BINARY_EVENT_LOG),
+                                        deserializer.BINARY_EVENT_LOG)
+        self.assertEqual(dfg_discovery.apply(log), dfg_discovery.apply(binary_log))
+        # the values of the columns (also of high-cardinality ones) are stored in the blocks, not in the header
+        import json
+        import numpy as np
+        from pm4py.objects.log.log import EventLog, Trace, Event
+        from pm4py.objects.log.serialization.versions import binary_event_log as binary_format
+        log = EventLog([Trace([Event({"concept:name": "A", "id": "event-%d" % (10 * i + j), "cost": i + j,
+                                      "weight": 0.5 * j, "flag": j % 2 == 0, "nested": {"k": [i, j]}})
+                               for j in range(3)], attributes={"concept:name": str(i), "number": i})
+                        for i in range(10)], attributes={"source": "test"})
+        content = serializer.apply(log, variant=serializer.BINARY_EVENT_LOG)
+        offset, length = [int(x) for x in np.frombuffer(content[8:24], dtype=np.uint64)]
+        header = json.loads(content[offset:offset + length].decode("utf-8"))
+        self.assertEqual(header["version"], binary_format.FORMAT_VERSION)
+        self.assertNotIn("event-17", json.dumps(header))
+        binary_log = deserializer.apply(content, deserializer.BINARY_EVENT_LOG)
+        self.assertEqual(binary_log.attributes, log.attributes)
+        for i in range(len(log)):
+            self.assertEqual(log[i].attributes, binary_log[i].attributes)
+            self.assertEqual([dict(ev) for ev in log[i]], [dict(ev) for ev in binary_log[i]])
+        self.assertIs(type(binary_log[0][0]["cost"]), int)
+        with self.assertRaises(IndexError):
+            binary_log.trace_attributes[-len(log) - 1]
+
+    def test_dt_parsing(self):
+        from pm4py.util.dt_parsing import parser, vectorized
+        date_parser = parser.get()
+        dt = date_parser.apply("2011-04-13T14:02:31.199+02:00")
+        self.assertIs(dt, date_parser.apply("2011-04-13T14:02:31.199+02:00"))
+        self.assertEqual(dt, parser.get(parser.STRPFROMISO).apply("2011-04-13T14:02:31.199+02:00"))
+        series = pd.Series(["01/02/2020 10:00:00", "01/03/2020 11:30:00", None])
+        self.assertEqual(list(vectorized.apply(series, utc=False).dt.month)[:2], [1, 1])
+        with self.assertRaises(ValueError):
+            vectorized.apply(pd.Series(["register request", "check ticket"]))
+
 
 if __name__ == "__main__":
     unittest.main()
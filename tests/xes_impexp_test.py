@@ -51,6 +51,107 @@ class XesImportExportTest(unittest.TestCase):
         log = xes_importer.apply(os.path.join(COMPRESSED_INPUT_DATA, "01_running-example.xes.gz"))
         del log
 
+    def test_importXESsinglePass(self):
+        # to avoid static method warnings in tests,
+        # that by construction of the unittest package have to be expressed in such way
+        self.dummy_variable = "dummy_value"
+        log = xes_importer.apply(os.path.join(INPUT_DATA_DIR, "running-example.xes"))
+        log_single_pass = xes_importer.apply(os.path.join(INPUT_DATA_DIR, "running-example.xes"),
+                                             variant=xes_importer.Variants.ITERPARSE_SINGLE_PASS)
+        self.assertEqual(len(log), len(log_single_pass))
+        self.assertEqual(log.extensions, log_single_pass.extensions)
+        for i in range(len(log)):
+            self.assertEqual(log[i].attributes, log_single_pass[i].attributes)
+            self.assertEqual([dict(ev) for ev in log[i]], [dict(ev) for ev in log_single_pass[i]])
+
+    def test_iterateXES(self):
+        # to avoid static method warnings in tests,
+        # that by construction of the unittest package have to be expressed in such way
+        self.dummy_variable = "dummy_value"
+        from pm4py.algo.discovery.dfg.versions import native as dfg_native
+        from pm4py.statistics.variants.log import get as variants_get
+        log = xes_importer.apply(os.path.join(INPUT_DATA_DIR, "running-example.xes"))
+        traces = list(xes_importer.iterate(os.path.join(INPUT_DATA_DIR, "running-example.xes")))
+        self.assertEqual(len(log), len(traces))
+        self.assertEqual(dfg_native.apply(log),
+                         dfg_native.apply(xes_importer.iterate(os.path.join(INPUT_DATA_DIR, "running-example.xes"))))
+        self.assertEqual(variants_get.get_variants_count(log), variants_get.get_variants_count(
+            xes_importer.iterate(os.path.join(COMPRESSED_INPUT_DATA, "01_running-example.xes.gz"))))
+        parameters = {xes_importer.iterparse_stream.Parameters.BATCH_SIZE: 4,
+                      xes_importer.iterparse_stream.Parameters.MAX_TRACES: 5}
+        batches = list(xes_importer.iterate(os.path.join(INPUT_DATA_DIR, "running-example.xes"),
+                                            parameters=parameters))
+        self.assertEqual([len(batch) for batch in batches], [4, 1])
+
+    def test_importXESparallel(self):
+        # to avoid static method warnings in tests,
+        # that by construction of the unittest package have to be expressed in such way
+        self.dummy_variable = "dummy_value"
+        log = xes_importer.apply(os.path.join(INPUT_DATA_DIR, "roadtraffic100traces.xes"))
+        parameters = {xes_importer.Variants.ITERPARSE_PARALLEL.value.Parameters.NUM_WORKERS: 2,
+                      xes_importer.Variants.ITERPARSE_PARALLEL.value.Parameters.CHUNK_SIZE: 4096}
+        log_parallel = xes_importer.apply(os.path.join(INPUT_DATA_DIR, "roadtraffic100traces.xes"),
+                                          variant=xes_importer.Variants.ITERPARSE_PARALLEL, parameters=parameters)
+        self.assertEqual(len(log), len(log_parallel))
+        self.assertEqual(log.attributes, log_parallel.attributes)
+        self.assertEqual(log.extensions, log_parallel.extensions)
+        self.assertEqual(log.omni_present, log_parallel.omni_present)
+        self.assertEqual(log.classifiers, log_parallel.classifiers)
+        for i in range(len(log)):
+            self.assertEqual(log[i].attributes, log_parallel[i].attributes)
+            self.assertEqual([dict(ev) for ev in log[i]], [dict(ev) for ev in log_parallel[i]])
+
+    def test_importXESvectorizedDates(self):
+        # to avoid static method warnings in tests,
+        # that by construction of the unittest package have to be expressed in such way
+        self.dummy_variable = "dummy_value"
+        from pm4py.util.dt_parsing import parser as dt_parser
+        from pm4py.util.dt_parsing import vectorized as dt_vectorized
+        log = xes_importer.apply(os.path.join(INPUT_DATA_DIR, "reviewing.xes"))
+        parameters = {xes_importer.Variants.ITERPARSE.value.Parameters.VECTORIZED_DATES: True}
+        log_vectorized = xes_importer.apply(os.path.join(INPUT_DATA_DIR, "reviewing.xes"), parameters=parameters)
+        self.assertEqual(len(log), len(log_vectorized))
+        for i in range(len(log)):
+            self.assertEqual(log[i].attributes, log_vectorized[i].attributes)
+            self.assertEqual([dict(ev) for ev in log[i]], [dict(ev) for ev in log_vectorized[i]])
+        # the results are the same of the per-string parser (naive dates stay naive, the offsets are kept)
+        values = ["2011-04-13T14:02:31.199+02:00", "2011-04-13T14:02:31", "2011-04-13T14:02:31.123456Z",
+                  "2999-01-01T00:00:00+01:00", "2011-04-13", "2011-13-13T00:00:00", "register"]
+        events = [{} for value in values]
+        collector = dt_vectorized.DateCollector()
+        for event, value in zip(events, values):
+            collector.add(event, "time:timestamp", value)
+        collector.convert(dt_parser.get())
+        for event, value in zip(events, values):
+            try:
+                expected = repr(dt_parser.get().apply(value))
+            except ValueError:
+                expected = None
+            self.assertEqual(repr(event["time:timestamp"]) if "time:timestamp" in event else None, expected)
+
+    def test_exportXESstream(self):
+        # to avoid static method warnings in tests,
+        # that by construction of the unittest package have to be expressed in such way
+        self.dummy_variable = "dummy_value"
+        log = xes_importer.apply(os.path.join(INPUT_DATA_DIR, "roadtraffic100traces.xes"))
+        path = os.path.join(OUTPUT_DATA_DIR, "roadtraffic100traces-exported.xes")
+        xes_exporter.apply(log, path, variant=xes_exporter.Variants.ETREE_STREAM)
+        log_imported_after_export = xes_importer.apply(path)
+        os.remove(path)
+        self.assertEqual(len(log), len(log_imported_after_export))
+        self.assertEqual(log.extensions, log_imported_after_export.extensions)
+        self.assertEqual(log.classifiers, log_imported_after_export.classifiers)
+        for i in range(len(log)):
+            self.assertEqual(log[i].attributes, log_imported_after_export[i].attributes)
+            self.assertEqual([dict(ev) for ev in log[i]], [dict(ev) for ev in log_imported_after_export[i]])
+        # exports an iterator of traces directly into a gzip stream
+        parameters = {xes_exporter.Variants.ETREE_STREAM.value.Parameters.COMPRESS: True}
+        xes_exporter.apply((trace for trace in log if len(trace) > 3), path, variant=xes_exporter.Variants.ETREE_STREAM,
+                           parameters=parameters)
+        log_imported_after_export = xes_importer.apply(path + ".gz")
+        os.remove(path + ".gz")
+        self.assertEqual(len([trace for trace in log if len(trace) > 3]), len(log_imported_after_export))
+
 
 if __name__ == "__main__":
     unittest.main()